@@ -0,0 +1,84 @@
+"""
+Threaded versus event loop driven output of many network universes
+
+Runs the same number of Art-Net controllers sending every frame to a local socket, once with a thread per
+controller and once from a single asyncio event loop, and reports threads, frame rate, jitter and CPU usage.
+
+Usage: python -m benchmarks.async_output [--controllers 64] [--framerate 40] [--seconds 3]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import threading
+import time
+
+from pydmx.controller.artnet import ArtNetController
+from pydmx.controller.asynccontroller import AsyncDMXController
+
+
+def report(name: str, controllers, threads: int, cpu: float, seconds: float):
+    stats = [controller.stats for controller in controllers]
+    fps = sum(stat["frames"] for stat in stats) / len(stats) / seconds
+    missed = sum(stat["missedDeadlines"] for stat in stats)
+    maxJitter = max(stat["maxJitter"] for stat in stats)
+    meanJitter = sum(stat["meanJitter"] for stat in stats) / len(stats)
+    print(
+        f"{name:<8} {threads:>3} threads  {fps:5.1f} fps per universe  {missed:>4} missed deadlines  "
+        f"jitter mean {meanJitter * 1e3:.3f} ms max {maxJitter * 1e3:.3f} ms  CPU {cpu / seconds:.1%}"
+    )
+
+
+def threaded(count: int, port: int, framerate: float, seconds: float):
+    before = threading.active_count()
+    controllers = [ArtNetController("127.0.0.1", universe, port=port, framerate=framerate, keepAlive=0.0) for universe in range(count)]
+    cpu = os.times()
+    for controller in controllers:
+        controller.activate()
+    time.sleep(seconds)
+    threads = threading.active_count() - before
+    for controller in controllers:
+        controller.deactivate()
+    cpu = sum(os.times()[:2]) - sum(cpu[:2])
+    report("threaded", controllers, threads, cpu, seconds)
+    for controller in controllers:
+        controller.close()
+
+
+async def evented(count: int, port: int, framerate: float, seconds: float):
+    before = threading.active_count()
+    controllers = [AsyncDMXController(ArtNetController("127.0.0.1", universe, port=port, keepAlive=0.0), framerate) for universe in range(count)]
+    cpu = os.times()
+    for controller in controllers:
+        controller.activate()
+    await asyncio.sleep(seconds)
+    threads = threading.active_count() - before
+    for controller in controllers:
+        controller.deactivate()
+    cpu = sum(os.times()[:2]) - sum(cpu[:2])
+    report("asyncio", controllers, threads, cpu, seconds)
+    for controller in controllers:
+        await controller.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--controllers", type=int, default=64)
+    parser.add_argument("--framerate", type=float, default=40.0)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    # Receiving socket with a large buffer which is never read, the kernel drops what doesn't fit
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    receiver.bind(("127.0.0.1", 0))
+    port = receiver.getsockname()[1]
+
+    threaded(args.controllers, port, args.framerate, args.seconds)
+    asyncio.run(evented(args.controllers, port, args.framerate, args.seconds))
+    receiver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Attribute sets per second on a patched fixture
+
+Compares the compiled SlotMap with resolving the attribute through the mode's channel list and
+fineChannelAliases on every write, which is what setting an attribute needs without the compilation.
+
+Usage: python -m benchmarks.attribute_set [--fixture 5star-systems#spica-250m] [--sets 200000]
+"""
+
+import argparse
+import time
+
+from pydmx.fixture.fixture import Fixture
+from pydmx.frame import DMXFrame
+
+
+def resolveAndSet(fixture, mode, address: int, frame: DMXFrame, attribute: str, value: int):
+    """Setting an attribute without a compiled slot map"""
+    channel = fixture.availableChannels[attribute]
+    names = [attribute] + list(channel.fineChannelAliases or ())
+    slots = [address - 1 + mode.channels.index(name) for name in names if name in mode.channels]
+    for num, slot in enumerate(slots):
+        frame.back[slot] = (value >> (8 * (len(slots) - 1 - num))) & 0xFF
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fixture", default="5star-systems#spica-250m")
+    parser.add_argument("--sets", type=int, default=200000)
+    args = parser.parse_args()
+
+    fixture = Fixture(args.fixture, "benchmark")
+    frame = DMXFrame()
+    slotmap = fixture.compile(0, 1, frame)
+    attributes = {resolution: [name for name in slotmap.names if slotmap.resolution(name) == resolution] for resolution in (1, 2)}
+
+    for resolution, names in attributes.items():
+        if not names:
+            continue
+        attribute = names[0]
+        value = slotmap.maximum(attribute) // 2
+
+        start = time.perf_counter()
+        for _ in range(args.sets):
+            slotmap.set(attribute, value)
+        compiled = args.sets / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(args.sets):
+            resolveAndSet(fixture, slotmap.mode, 1, frame, attribute, value)
+        resolved = args.sets / (time.perf_counter() - start)
+
+        print(f"{8 * resolution:>2} bit {attribute!r:<20} compiled {compiled:>12,.0f} sets/s   resolved {resolved:>12,.0f} sets/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Import throughput of custom fixtures
+
+Compares validating every fixture with jsonschema.validate (schema parsed and validator built per call)
+with FixtureIndex.createCustomFixtures, which validates all fixtures in one pass with the cached validator.
+Fixtures from the bundled OFL library are used as custom fixtures.
+
+Usage: python -m benchmarks.customfixture_import [--fixtures 300] [--schemas path/to/ofl/schemas]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from jsonschema import validate
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT7
+
+import pydmx.fixtureIndex.fixtureIndex as fixtureIndex
+from pydmx.openfixturelibrary.oflindex import OflLibrary
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OFL = os.path.join(ROOT, "pydmx", "openfixturelibrary", "ofl.json")
+
+
+def uncached(fixtures: dict, schemadir: str) -> float:
+    """The previous approach: reading the schema and building the validator for every fixture"""
+    start = time.perf_counter()
+    for fixture in fixtures.values():
+        resources = []
+        for filename in os.listdir(schemadir):
+            if filename.endswith(".json"):
+                with open(os.path.join(schemadir, filename), encoding="utf-8") as schemafile:
+                    resources.append((filename, Resource.from_contents(json.load(schemafile), DRAFT7)))
+        registry = Registry().with_resources((resource.id() or name, resource) for name, resource in resources)
+        schema = dict(resources)["fixture.json"].contents
+        try:
+            validate(instance=fixture, schema=schema, registry=registry)
+        except Exception:
+            pass
+    return time.perf_counter() - start
+
+
+def cached(fixtures: dict) -> float:
+    index = fixtureIndex.FixtureIndex.getInstance()
+    start = time.perf_counter()
+    index.createCustomFixtures(fixtures)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fixtures", type=int, default=300)
+    parser.add_argument("--schemas", default=fixtureIndex.schemadir, help="directory with the OFL schemas")
+    args = parser.parse_args()
+
+    if not os.path.isfile(os.path.join(args.schemas, "fixture.json")):
+        raise SystemExit(f"No OFL schemas found in {args.schemas}, pass them with --schemas.")
+    fixtureIndex.schemadir = args.schemas
+
+    library = OflLibrary(OFL)
+    keys = [key for key in library if not key.startswith("_")][: args.fixtures]
+    fixtures = {key: library[key] for key in keys}
+
+    fixtureIndex.FixtureIndex(ofl=False)
+    for name, seconds in (("uncached", uncached(fixtures, args.schemas)), ("cached", cached(fixtures))):
+        print(f"{name:<9} {len(fixtures) / seconds:>10.1f} fixtures/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Tick time of the fade engine with many concurrent fades
+
+Fades a 16 bit attribute of every fixture patched into the universes, by default 10240 fades
+(20 universes of 512 single slot fixtures). At 44 Hz a frame leaves about 22 ms.
+
+Usage: python -m benchmarks.fade_tick [--universes 20] [--resolution 1] [--ticks 200]
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from pydmx.fade import FadeEngine
+from pydmx.fixture.slotmap import SlotMap
+from pydmx.frame import DMXFrame
+
+
+def patchDimmers(frame: DMXFrame, resolution: int):
+    """Slot maps of plain dimmers filling the frame, built without the fixture library"""
+    names = ["Intensity", "Intensity fine"][:resolution]
+    channel = SimpleNamespace(fineChannelAliases=names[1:], dmxValueResolution=None, defaultValue=None)
+    mode = SimpleNamespace(name="dimmer", shortName=None, channels=names)
+    dimmer = SimpleNamespace(name="Dimmer", modes=[mode], availableChannels={"Intensity": channel})
+    return [SlotMap(dimmer, 0, address, frame) for address in range(1, frame.slots + 1 - (resolution - 1), resolution)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--universes", type=int, default=20)
+    parser.add_argument("--resolution", type=int, default=1, choices=(1, 2))
+    parser.add_argument("--ticks", type=int, default=200)
+    args = parser.parse_args()
+
+    slotmaps = [slotmap for _ in range(args.universes) for slotmap in patchDimmers(DMXFrame(), args.resolution)]
+    engine = FadeEngine()
+    began = time.perf_counter()
+    for slotmap in slotmaps:
+        engine.fade(slotmap, "Intensity", slotmap.maximum("Intensity"), 3600.0, "easeInOut", began=began)
+    added = time.perf_counter()
+    engine.tick()
+    print(f"{len(engine)} fades added in {1000 * (added - began):.2f} ms, first tick (merging them) {1000 * (time.perf_counter() - added):.2f} ms")
+
+    durations = []
+    for _ in range(args.ticks):
+        start = time.perf_counter()
+        engine.tick()
+        durations.append(time.perf_counter() - start)
+    durations = np.array(durations) * 1000
+    print(f"tick: mean {durations.mean():.2f} ms   p99 {np.percentile(durations, 99):.2f} ms   (budget {1000 / 44:.1f} ms at 44 Hz)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Converting the whole fixture library into the schema dataclasses
+
+Compares the compiled deserializer with dacite (as used before, cast=[Enum] and type hooks for the named tuples):
+time for the whole library, fixtures which fit the schema, memory allocated by the converted fixtures and
+how many capabilities ended up in the dataclass matching their type.
+
+Usage: python -m benchmarks.fixture_deserialize [--repeat 3]
+"""
+
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+from enum import Enum
+
+from pydmx.openfixturelibrary.capabilitySchema import CAPABILITY_CLASSES
+from pydmx.openfixturelibrary.definitionsSchema import Dimensions, MinMax
+from pydmx.openfixturelibrary.fixtureSchema import FixtureSchema
+from pydmx.openfixturelibrary.ofldeserializer import fromDict
+
+OFL = os.path.join(os.path.dirname(__file__), "../pydmx/openfixturelibrary/ofl.json")
+
+
+def daciteConverter():
+    from dacite import Config, from_dict
+
+    config = Config(
+        cast=[Enum],
+        type_hooks={
+            Dimensions: lambda value: Dimensions(*value),
+            MinMax: lambda value: MinMax(*value),
+        },
+    )
+    return lambda fixture: from_dict(data_class=FixtureSchema, data=fixture, config=config)
+
+
+def convertAll(convert, fixtures: dict) -> dict:
+    converted = {}
+    for key, fixture in fixtures.items():
+        try:
+            converted[key] = convert(fixture)
+        except Exception:
+            pass
+    return converted
+
+
+def matchingCapabilities(converted: dict) -> tuple:
+    """Capabilities converted into the dataclass of their type and all capabilities"""
+    matching = total = 0
+    for fixture in converted.values():
+        for channel in list((fixture.availableChannels or {}).values()) + list((fixture.templateChannels or {}).values()):
+            for capability in channel.capabilities or ([channel.capability] if channel.capability else []):
+                total += 1
+                matching += type(capability) is CAPABILITY_CLASSES.get(capability.type)
+    return matching, total
+
+
+def measure(convert, fixtures: dict, repeat: int) -> dict:
+    convertAll(convert, fixtures)
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        convertAll(convert, fixtures)
+        durations.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    converted = convertAll(convert, fixtures)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    matching, total = matchingCapabilities(converted)
+    return {
+        "time": min(durations),
+        "fixtures": len(converted),
+        "memory": memory,
+        "matching": matching,
+        "capabilities": total,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(OFL, encoding="utf-8") as infile:
+        library = json.load(infile)
+    fixtures = {key: fixture for key, fixture in library.items() if not key.startswith("_")}
+
+    results = {"deserializer": measure(fromDict, fixtures, args.repeat)}
+    try:
+        results["dacite"] = measure(daciteConverter(), fixtures, args.repeat)
+    except ImportError:
+        print("dacite is not installed, skipping the comparison")
+
+    print(f"{len(fixtures)} fixtures")
+    for name, result in results.items():
+        print(
+            f"{name:>12}: {result['time'] * 1000:8.1f} ms, {result['fixtures']} fixtures converted, "
+            f"{result['memory'] / 1024 / 1024:6.1f} MiB, "
+            f"{result['matching']}/{result['capabilities']} capabilities of the matching type"
+        )
+    if "dacite" in results:
+        print(f"speedup: {results['dacite']['time'] / results['deserializer']['time']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Typeahead latency of the fixture search index
+
+Types a few fixture names key by key (every prefix is one query), with and without category and channel filters,
+and compares the index with scanning the names of all fixtures of the parsed library for every query.
+
+Usage: python -m benchmarks.fixture_search [--repeat 20]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+from pydmx.openfixturelibrary.oflsearch import FixtureSearch, words
+
+OFL = os.path.join(os.path.dirname(__file__), "../pydmx/openfixturelibrary/ofl.json")
+TYPED = ["robin 600e spot", "spica 250m", "stairville af", "moving head", "led par 64", "mvoing haed"]
+
+
+def scan(library: dict, query: str, limit: int = 20) -> list:
+    """Matching every fixture of the library without an index"""
+    queryWords = words(query)
+    results = []
+    for key, fixture in library.items():
+        if key == "_manufacturers":
+            continue
+        fixtureWords = words(" ".join(filter(None, (fixture.get("name"), fixture.get("shortName"), key))))
+        if all(any(word.startswith(queryWord) for word in fixtureWords) for queryWord in queryWords):
+            results.append(key)
+    return results[:limit]
+
+
+def measure(search, queries, repeat: int) -> list:
+    durations = []
+    for _ in range(repeat):
+        for query, filters in queries:
+            start = time.perf_counter()
+            search(query, **filters)
+            durations.append(time.perf_counter() - start)
+    return sorted(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = FixtureSearch.load(OFL)
+    print(f"index of {len(index)} fixtures loaded in {(time.perf_counter() - start) * 1e3:.1f} ms")
+    with open(OFL, encoding="utf-8") as infile:
+        library = json.load(infile)
+
+    prefixes = [name[:length] for name in TYPED for length in range(1, len(name) + 1)]
+    queries = [(prefix, {}) for prefix in prefixes] + [(prefix, {"category": "Moving Head", "channels": 16}) for prefix in prefixes]
+    for name, search, repeat in (("index", index.search, args.repeat), ("scan", lambda query, **filters: scan(library, query), 1)):
+        durations = measure(search, queries if name == "index" else queries[: len(prefixes)], repeat)
+        print(
+            f"{name:<6} {len(durations):>5} queries  mean {statistics.mean(durations) * 1e6:8.1f} us  "
+            f"p99 {durations[int(len(durations) * 0.99)] * 1e6:8.1f} us  max {durations[-1] * 1e6:8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Startup time and memory of the fixture library
+
+Compares the eager json.load of the whole ofl.json with the lazy, indexed OflLibrary.
+Every variant runs in a fresh interpreter and reports the peak RSS of that process.
+
+Usage: python -m benchmarks.fixtureindex_startup [--lookups 12] [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OFL = os.path.join(ROOT, "pydmx", "openfixturelibrary", "ofl.json")
+
+VARIANTS = {
+    "eager": """
+import json
+ofl = json.load(open(OFL, encoding="utf-8"))
+fixtures = [ofl[key] for key in list(ofl)[:LOOKUPS]]
+""",
+    "lazy": """
+from pydmx.openfixturelibrary.oflindex import OflLibrary
+ofl = OflLibrary(OFL)
+fixtures = [ofl[key] for key in list(ofl)[:LOOKUPS]]
+""",
+}
+
+HARNESS = """
+import json, sys, time
+start = time.perf_counter()
+try:
+    import resource
+except ImportError:
+    resource = None
+OFL = {ofl!r}
+LOOKUPS = {lookups}
+{body}
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else -1
+print(json.dumps({{"seconds": elapsed, "rssKiB": rss}}))
+"""
+
+
+def run(variant: str, lookups: int) -> dict:
+    code = HARNESS.format(ofl=OFL, lookups=lookups, body=VARIANTS[variant])
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT)
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lookups", type=int, default=12, help="fixtures looked up after startup")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'variant':<8} {'startup ms':>11} {'peak RSS KiB':>13}")
+    for variant in VARIANTS:
+        results = [run(variant, args.lookups) for _ in range(args.runs)]
+        seconds = statistics.median(result["seconds"] for result in results)
+        rss = statistics.median(result["rssKiB"] for result in results)
+        print(f"{variant:<8} {seconds * 1000:>11.2f} {rss:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
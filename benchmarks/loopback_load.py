@@ -0,0 +1,96 @@
+"""
+Load test of many simulated DMX512 lines
+
+Runs a number of LoopbackControllers (a simulated 250 kbaud line each, frames captured in memory), once every
+controller on its own frame clock and once all of them driven by one Multiverse, with every frame changing.
+Reports the frame rate captured on the lines, how far the frame intervals deviated from the period, frames
+skipped because the line was still busy, threads and CPU usage. No hardware or network is involved, so this
+measures the frame clocks and pydmx itself.
+
+Usage: python -m benchmarks.loopback_load [--universes 128] [--framerate 40] [--seconds 3]
+"""
+
+import argparse
+import os
+import threading
+import time
+
+from pydmx.controller.loopback import LoopbackController
+from pydmx.multiverse import Multiverse
+from pydmx.universe import Universe
+
+
+class Counter:
+    """Renderer changing the first slot of a frame on every frame"""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def __call__(self):
+        self.frame[0] = (self.frame[0] + 1) % 256
+
+
+def report(name: str, controllers, threads: int, cpu: float, seconds: float, period: float):
+    timings = [controller.timing(period) for controller in controllers]
+    captured = sum(timing["capturedFramerate"] for timing in timings) / len(timings)
+    mean = sum(timing["meanDeviation"] for timing in timings) / len(timings)
+    worst = max(timing["maxDeviation"] for timing in timings)
+    skipped = sum(controller.skippedFrames for controller in controllers)
+    written = sum(controller.framesWritten for controller in controllers)
+    print(
+        f"{name:<10} {threads:>4} threads  {captured:5.1f} fps per line  {written / seconds:8.0f} frames/s  "
+        f"{skipped:>5} skipped  deviation mean {mean * 1e3:.3f} ms max {worst * 1e3:.3f} ms  CPU {cpu / seconds:.1%}"
+    )
+
+
+def threaded(count: int, framerate: float, seconds: float):
+    before = threading.active_count()
+    controllers = [LoopbackController(framerate=framerate, capacity=int(framerate * seconds) + 8) for _ in range(count)]
+    for controller in controllers:
+        controller.renderers.append(Counter(controller.frame))
+    cpu = os.times()
+    for controller in controllers:
+        controller.activate()
+    time.sleep(seconds)
+    threads = threading.active_count() - before
+    for controller in controllers:
+        controller.deactivate()
+    cpu = sum(os.times()[:2]) - sum(cpu[:2])
+    report("threaded", controllers, threads, cpu, seconds, 1 / framerate)
+    for controller in controllers:
+        controller.close()
+
+
+def multiverse(count: int, framerate: float, seconds: float):
+    before = threading.active_count()
+    multiverse = Multiverse(framerate=framerate)
+    controllers = [LoopbackController(capacity=int(framerate * seconds) + 8) for _ in range(count)]
+    for universeId, controller in enumerate(controllers):
+        universe = multiverse.addUniverse(universeId, Universe(controller))
+        multiverse.renderers.append(Counter(universe.buffer))
+    cpu = os.times()
+    multiverse.activate()
+    time.sleep(seconds)
+    threads = threading.active_count() - before
+    multiverse.deactivate()
+    cpu = sum(os.times()[:2]) - sum(cpu[:2])
+    report("multiverse", controllers, threads, cpu, seconds, 1 / framerate)
+    multiverse.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--universes", type=int, default=128)
+    parser.add_argument("--framerate", type=float, default=40.0)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    line = LoopbackController()
+    print(f"{args.universes} lines at {args.framerate} Hz, a full frame takes {line.frameTime * 1e3:.2f} ms (max {line.maxFramerate:.1f} Hz)")
+    line.close()
+    threaded(args.universes, args.framerate, args.seconds)
+    multiverse(args.universes, args.framerate, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
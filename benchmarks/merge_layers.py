@@ -0,0 +1,49 @@
+"""
+HTP/LTP merge time of many layers over many universes
+
+Every layer changes a part of its slots between merges, half of the slots are HTP.
+The merge has to fit well inside the frame budget of 25 ms at 40 Hz.
+
+Usage: python -m benchmarks.merge_layers [--layers 16] [--universes 32] [--merges 200]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from pydmx.merge import MergeEngine
+from pydmx.universe import Universe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--layers", type=int, default=16)
+    parser.add_argument("--universes", type=int, default=32)
+    parser.add_argument("--merges", type=int, default=200)
+    parser.add_argument("--changes", type=float, default=0.1, help="share of the slots a layer changes per merge")
+    args = parser.parse_args()
+
+    engine = MergeEngine([Universe() for _ in range(args.universes)], layers=args.layers)
+    rng = np.random.default_rng(0)
+    engine.htp[:] = rng.random(engine.htp.shape) < 0.5
+    layers = [engine.addLayer(f"layer {num}") for num in range(args.layers)]
+
+    # Prepared changes, so the measurement only covers the merge
+    changes = [rng.random(layers[0].values.shape) < args.changes for _ in range(8)]
+    noise = [rng.integers(0, 256, layers[0].values.shape, dtype=np.uint8) for _ in range(3)]
+
+    durations = []
+    for num in range(args.merges):
+        for position, layer in enumerate(layers):
+            np.copyto(layer.values, noise[num % len(noise)], where=changes[(num + position) % len(changes)])
+        start = time.perf_counter()
+        engine.merge()
+        durations.append(time.perf_counter() - start)
+
+    durations = np.array(durations) * 1000
+    print(f"{args.layers} layers x {args.universes} universes: mean {durations.mean():.2f} ms   p99 {np.percentile(durations, 99):.2f} ms   max {durations.max():.2f} ms   (budget 25 ms)")
+
+
+if __name__ == "__main__":
+    main()
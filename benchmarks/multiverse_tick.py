@@ -0,0 +1,88 @@
+"""
+Frame cost of the Multiverse
+
+Measures the cost of one tick for a number of universes with every frame changed (worst case) and unchanged,
+then runs the Multiverse in real time and reports the achieved frame rate, missed deadlines and CPU usage.
+The controllers only copy the published frame into a preallocated packet, so the numbers show
+the cost of pydmx itself and not of any output hardware.
+
+Usage: python -m benchmarks.multiverse_tick [--universes 64] [--framerate 40] [--seconds 3] [--workers 0]
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from pydmx.controller.controller import DMXController
+from pydmx.multiverse import Multiverse
+
+
+class CopyController(DMXController):
+    """Controller which only encodes the frame into a preallocated packet"""
+
+    keepAlive = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.packet = bytearray(530)
+        self.sent = 0
+
+    def write(self):
+        with self.frame.read() as data:
+            self.packet[18:] = data[1:]
+        self.sent += 1
+
+
+def setup(universes: int, framerate: float, workers: int) -> Multiverse:
+    multiverse = Multiverse(framerate=framerate, workers=workers)
+    for universeId in range(universes):
+        multiverse.addUniverse(universeId).controller = CopyController()
+    return multiverse
+
+
+def tickCost(multiverse: Multiverse, changed: bool, ticks: int = 500) -> list:
+    durations = []
+    for tick in range(ticks):
+        if changed:
+            for universe in multiverse.universes.values():
+                universe.buffer[tick % 512] = tick % 256
+        start = time.perf_counter()
+        multiverse.tick()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--universes", type=int, default=64)
+    parser.add_argument("--framerate", type=float, default=40.0)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args()
+
+    multiverse = setup(args.universes, args.framerate, args.workers)
+    budget = 1 / args.framerate
+    for name, changed in (("changed", True), ("unchanged", False)):
+        durations = sorted(tickCost(multiverse, changed))
+        mean = statistics.mean(durations)
+        p99 = durations[int(len(durations) * 0.99)]
+        print(f"tick {name:<9} mean {mean * 1e3:7.3f} ms  p99 {p99 * 1e3:7.3f} ms  ({mean / budget:6.1%} of the frame budget)")
+
+    multiverse.scheduler.resetStats()
+    cpu = os.times()
+    multiverse.activate()
+    time.sleep(args.seconds)
+    multiverse.deactivate()
+    cpu = sum(os.times()[:2]) - sum(cpu[:2])
+    stats = multiverse.stats
+    print(
+        f"realtime {args.universes} universes: {stats['frames'] / args.seconds:.1f} fps, "
+        f"{stats['missedDeadlines']} missed deadlines, max jitter {stats['maxJitter'] * 1e3:.3f} ms, "
+        f"CPU {cpu / args.seconds:.1%}"
+    )
+    multiverse.close()
+
+
+if __name__ == "__main__":
+    main()
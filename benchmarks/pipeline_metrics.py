@@ -0,0 +1,85 @@
+"""
+Overhead of the frame pipeline metrics
+
+Drives a Multiverse of Art-Net universes (sent to a local port nobody listens on) with a MergeEngine merging
+a chase layer, so every universe changes every frame, and measures the tick cost with metrics disabled and
+enabled. Then runs it in real time with metrics enabled and prints the collected stage timings and the size
+of the Prometheus export.
+
+Usage: python -m benchmarks.pipeline_metrics [--universes 64] [--ticks 500] [--seconds 2]
+"""
+
+import argparse
+import statistics
+import time
+
+from pydmx.controller.artnet import ArtNetController
+from pydmx.merge import MergeEngine
+from pydmx.multiverse import Multiverse
+
+
+class Chase:
+    """Renderer moving a light through every universe of a layer, so every frame changes"""
+
+    def __init__(self, layer, universes: int):
+        self.frames = [layer.frame(universe) for universe in range(universes)]
+        self.step = 0
+
+    def __call__(self):
+        self.step += 1
+        for frame in self.frames:
+            frame[self.step % 512] = self.step % 255 + 1
+            frame[(self.step - 1) % 512] = 0
+
+
+def tickCost(multiverse: Multiverse, ticks: int) -> float:
+    durations = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        multiverse.tick()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--universes", type=int, default=64)
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    multiverse = Multiverse(framerate=44)
+    for universeId in range(args.universes):
+        multiverse.addUniverse(universeId).controller = ArtNetController("127.0.0.1", universeId, port=16454)
+    engine = MergeEngine(list(multiverse.universes.values()), layers=4)
+    layer = engine.addLayer("benchmark")
+    multiverse.renderers.append(Chase(layer, args.universes))
+    multiverse.renderers.append(engine.merge)
+
+    disabled = tickCost(multiverse, args.ticks)
+    metrics = multiverse.enableMetrics(engines=[engine])
+    enabled = tickCost(multiverse, args.ticks)
+    print(f"{args.universes} universes, median tick")
+    print(f"metrics disabled {disabled * 1e6:8.1f} us")
+    print(f"metrics enabled  {enabled * 1e6:8.1f} us (+{enabled / disabled - 1:.1%})")
+
+    metrics.reset()
+    multiverse.activate()
+    time.sleep(args.seconds)
+    multiverse.deactivate()
+    snapshot = metrics.snapshot()
+    print(
+        f"realtime: {snapshot['framesPerSecond']:.1f} fps, {snapshot['bytesPerSecond'] / 1e6:.2f} MB/s, "
+        f"{snapshot['droppedFrames']} dropped frames, max jitter {snapshot['maxJitter'] * 1e3:.3f} ms"
+    )
+    for stage, histogram in snapshot["stages"].items():
+        print(
+            f"  {stage:<6} {histogram['count']:7d} x  mean {histogram['mean'] * 1e6:7.1f} us  "
+            f"p99 <= {histogram['p99'] * 1e6:7.1f} us  max {histogram['max'] * 1e6:7.1f} us"
+        )
+    print(f"prometheus export {len(metrics.prometheus().splitlines())} lines")
+    multiverse.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Pixel mapping an image onto a wall of matrix fixtures
+
+Patches a wall of 8x8 RGBW panels (two per universe) and renders random RGB images into it.
+Compares the PixelMapper gathers with setting every pixel component through its SlotMap.
+
+Usage: python -m benchmarks.pixel_mapping [--fixture american-dj#revo-4-ir] [--mode "256 channel"] [--panels 8] [--frames 200]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from pydmx.fixture.fixture import Fixture
+from pydmx.fixture.pixelmap import PixelMapper
+from pydmx.frame import DMXFrame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fixture", default="american-dj#revo-4-ir")
+    parser.add_argument("--mode", default="256 channel")
+    parser.add_argument("--panels", type=int, default=8, help="panels per side of the square wall")
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    fixture = Fixture(args.fixture, "benchmark")
+    slotmaps = []
+    frames = []
+    for number in range(args.panels * args.panels):
+        footprint = fixture.compile(args.mode, 1).footprint
+        perUniverse = 512 // footprint
+        if number % perUniverse == 0:
+            frames.append(DMXFrame())
+        slotmaps.append(fixture.compile(args.mode, 1 + (number % perUniverse) * footprint, frames[-1]))
+
+    width, height = (int(max(axis)) for axis in list(zip(*slotmaps[0].matrix.pixels.values()))[:2])
+    mapper = PixelMapper(width * args.panels, height * args.panels)
+    start = time.perf_counter()
+    for number, slotmap in enumerate(slotmaps):
+        mapper.addFixture(slotmap, (number % args.panels) * width, (number // args.panels) * height)
+    mapper.render(np.zeros((mapper.height, mapper.width, 3), dtype=np.uint8))
+    compiled = time.perf_counter() - start
+
+    rng = np.random.default_rng(1)
+    images = [rng.integers(0, 256, (mapper.height, mapper.width, 3), dtype=np.uint8) for _ in range(8)]
+
+    start = time.perf_counter()
+    for frame in range(args.frames):
+        mapper.render(images[frame % len(images)])
+    mapped = (time.perf_counter() - start) / args.frames
+
+    components = mapper.components
+    start = time.perf_counter()
+    for frame in range(args.frames // 10 or 1):
+        image = images[frame % len(images)]
+        for number, slotmap in enumerate(slotmaps):
+            offsetX, offsetY = (number % args.panels) * width, (number // args.panels) * height
+            for key, attributes in slotmap.pixels.items():
+                x, y, _ = slotmap.matrix.pixels[key]
+                pixel = image[offsetY + y - 1, offsetX + x - 1]
+                for channel, component in enumerate(components):
+                    if component in attributes:
+                        slotmap.set(attributes[component], int(pixel[channel]))
+    looped = (time.perf_counter() - start) / (args.frames // 10 or 1)
+
+    print(f"{len(slotmaps)} panels in {len(frames)} universes, {mapper.pixelCount} pixels, image {mapper.width}x{mapper.height}")
+    print(f"compile {compiled * 1000:8.2f} ms")
+    print(f"render  {mapped * 1e6:8.1f} us per frame (PixelMapper)")
+    print(f"render  {looped * 1e6:8.1f} us per frame (SlotMap.set per component)")
+
+
+if __name__ == "__main__":
+    main()
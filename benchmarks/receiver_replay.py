@@ -0,0 +1,79 @@
+"""
+Packet rate of the Art-Net/sACN receiver
+
+Writes a capture of Art-Net and sACN traffic (every universe changing every frame, half of the sACN universes
+sent by two consoles which get merged HTP), then replays it from the file into a DMXReceiver and reports the
+parsing cost per packet and how many universes that would sustain at 44 frames per second.
+
+Usage: python -m benchmarks.receiver_replay [--universes 256] [--frames 44]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from pydmx.controller.artnet import ARTNET_PORT, ArtNetController
+from pydmx.controller.e131 import E131_PORT, E131Controller
+from pydmx.pcap import readCapture, writeCapture
+from pydmx.receiver import ARTNET, E131, DMXReceiver
+
+
+def capture(path: str, universes: int, frames: int) -> int:
+    """Writing the traffic of universes Art-Net and universes sACN universes, returns the number of packets"""
+    rng = np.random.default_rng(1)
+    noise = [rng.integers(0, 256, 512, dtype=np.uint8).tobytes() for _ in range(8)]
+    senders = [(ArtNetController("10.0.0.100", universe), ("10.0.0.1", ARTNET_PORT)) for universe in range(universes)]
+    for universe in range(1, universes + 1):
+        senders.append((E131Controller(universe), ("10.0.0.2", E131_PORT)))
+        if universe % 2:
+            senders.append((E131Controller(universe), ("10.0.0.3", E131_PORT)))
+
+    packets = []
+    for frame in range(frames):
+        for number, (controller, source) in enumerate(senders):
+            controller.frame.back[:] = noise[(frame + number) % len(noise)]
+            controller.frame.commit()
+            destination = controller.address
+            packets.append((frame / 44 + number * 1e-6, source, destination, bytes(controller.encode())))
+    writeCapture(path, packets)
+    return len(packets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--universes", type=int, default=256, help="universes per protocol")
+    parser.add_argument("--frames", type=int, default=44)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "traffic.pcap")
+        count = capture(path, args.universes, args.frames)
+        size = os.path.getsize(path)
+
+        receiver = DMXReceiver()
+        for universe in range(args.universes):
+            receiver.addUniverse(ARTNET, universe)
+            receiver.addUniverse(E131, universe + 1)
+
+        start = time.perf_counter()
+        packets = list(readCapture(path))
+        loaded = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for timestamp, address, payload in packets:
+            receiver.feed(payload, address, timestamp)
+        fed = time.perf_counter() - start
+
+    perPacket = fed / count
+    print(f"{count} packets ({size / 1024 / 1024:.1f} MiB capture), {args.universes} Art-Net + {args.universes} sACN universes")
+    print(f"reading the capture  {loaded * 1000:8.1f} ms")
+    print(f"parsing and merging  {perPacket * 1e6:8.2f} us per packet, {1 / perPacket:,.0f} packets/s")
+    print(f"sustainable at 44 Hz {1 / perPacket / 44:,.0f} universes")
+    print(receiver.stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Recording and playing back a show
+
+Records a show of many universes at 44 frames per second, in which a few fixtures of every universe fade each
+frame, with the clock simulated. Reports the recording cost per tick and the file size against raw frames, then
+opens the file with and without its keyframe index, seeks to random times and plays it back tick by tick,
+checking every played frame against the recorded output.
+
+Usage: python -m benchmarks.show_playback [--universes 64] [--seconds 60] [--keyframe 1.0]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from pydmx.frame import DMXFrame
+from pydmx.show import ShowPlayer, ShowRecorder
+
+FRAMERATE = 44
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--universes", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--keyframe", type=float, default=1.0, help="keyframe interval in seconds")
+    parser.add_argument("--seeks", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    frames = [DMXFrame() for _ in range(args.universes)]
+    # Slots of 8 fading RGBW fixtures per universe
+    fading = [rng.choice(512 - 4, 8, replace=False)[:, None] + np.arange(4) for _ in frames]
+    ticks = int(args.seconds * FRAMERATE)
+    # Recorded output of every universe at some ticks, to check the playback against
+    checked = set(rng.choice(ticks, min(ticks, 500), replace=False).tolist())
+    expected = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "show.pydmx")
+        recorder = ShowRecorder(path, args.keyframe)
+        for universeId, frame in enumerate(frames):
+            frame.back[:] = rng.integers(0, 256, 512, dtype=np.uint8).tobytes()
+            recorder.addUniverse(universeId, frame)
+
+        recording = 0.0
+        for tick in range(ticks):
+            for frame, slots in zip(frames, fading):
+                values = np.frombuffer(frame.back, dtype=np.uint8)
+                values[slots] += 1
+                frame.commit()
+            start = time.perf_counter()
+            recorder.capture(now=tick / FRAMERATE)
+            recording += time.perf_counter() - start
+            if tick in checked:
+                expected[tick] = [bytes(frame.payload) for frame in frames]
+        recorder.close()
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        player = ShowPlayer(path, dict(enumerate(DMXFrame() for _ in frames)))
+        indexed = time.perf_counter() - start
+        player.close()
+        with open(path, "r+b") as showFile:
+            # Dropping the index, as if the recording crashed
+            showFile.truncate(player._end)
+        start = time.perf_counter()
+        ShowPlayer(path).close()
+        scanned = time.perf_counter() - start
+
+        outputs = [DMXFrame() for _ in frames]
+        player = ShowPlayer(path, dict(enumerate(outputs)))
+        seekTicks = rng.choice(sorted(expected), args.seeks)
+        start = time.perf_counter()
+        for tick in seekTicks:
+            player.seek(tick / FRAMERATE)
+        seeking = (time.perf_counter() - start) / args.seeks
+        mismatches = 0
+        for tick in seekTicks[:20]:
+            player.seek(tick / FRAMERATE)
+            mismatches += sum(bytes(output.back) != payload for output, payload in zip(outputs, expected[tick]))
+
+        player.seek(0)
+        playing = 0.0
+        for tick in range(ticks):
+            start = time.perf_counter()
+            player.advance(tick / FRAMERATE)
+            playing += time.perf_counter() - start
+            if tick in expected:
+                mismatches += sum(bytes(output.back) != payload for output, payload in zip(outputs, expected[tick]))
+        player.close()
+
+    raw = ticks * args.universes * 513
+    print(f"{args.universes} universes, {args.seconds:.0f} s at {FRAMERATE} Hz, keyframes every {args.keyframe} s")
+    print(f"record    {recording / ticks * 1e6:8.1f} us per tick")
+    print(f"file      {size / 1024 / 1024:8.2f} MiB, {raw / size:.0f}x smaller than raw frames")
+    print(f"open      {indexed * 1000:8.2f} ms with the index, {scanned * 1000:.2f} ms rebuilding it")
+    print(f"seek      {seeking * 1e6:8.1f} us")
+    print(f"playback  {playing / ticks * 1e6:8.1f} us per tick")
+    print(f"mismatching frames {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Reproducible benchmark suite of the frame path and the fixture library
+
+Runs a fixed set of cases with fixed inputs and stores every measured value in a JSON file, named after
+the current commit by default, so the results of two commits can be compared with --compare. Every timing is
+repeated at least a minimum number of times and for a minimum time, it records the median and the best (fastest)
+repeat, its unit and whether lower or higher is better.
+
+    fixtureindex  startup of the FixtureIndex in a fresh interpreter, lookup latency of unparsed and cached fixtures
+    deserialize   FixtureSchema conversion throughput over the whole library
+    frame         render (a changing layer merged by a MergeEngine) and Multiverse tick for 1 to 128 universes
+    output        Art-Net and sACN encode, sending over loopback UDP, LoopbackController captures and serial
+                  frames written into a pty
+
+Comparing uses the best repeat, which only gets slower when the code does, while the median also follows the load of
+the machine. It prints the change of every value and exits with 1 if one got worse by more than --threshold
+(10 %, 15 % for --quick runs, which are repeated for a shorter time).
+
+Usage: python -m benchmarks.suite [--cases frame output] [--quick] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from threading import Event, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OFL = os.path.join(ROOT, "pydmx", "openfixturelibrary", "ofl.json")
+RESULTS = os.path.join(ROOT, "benchmarks", "results")
+UNIVERSES = (1, 2, 4, 8, 16, 32, 64, 128)
+
+STARTUP = """
+import json, time
+start = time.perf_counter()
+from pydmx.fixtureIndex.fixtureIndex import FixtureIndex
+FixtureIndex()
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+class Results:
+    """Measured values of a run: name: {"value", "best", "unit", "better"}"""
+
+    def __init__(self):
+        self.values: Dict[str, dict] = {}
+
+    def add(self, name: str, value: float, unit: str, better: str = "lower", best: Optional[float] = None):
+        best = value if best is None else best
+        self.values[name] = {"value": value, "best": best, "unit": unit, "better": better}
+        print(f"  {name:<36} {value:14.3f} {unit:<3} best {best:14.3f}")
+
+    def addTiming(self, name: str, durations: List[float], scale: float = 1e6, unit: str = "us"):
+        """Median and fastest of repeated timings in seconds"""
+        self.add(name, statistics.median(durations) * scale, unit, best=min(durations) * scale)
+
+    def addRate(self, name: str, count: int, durations: List[float], unit: str = "1/s"):
+        """count items per second, from repeated timings in seconds of all items"""
+        self.add(name, count / statistics.median(durations), unit, "higher", count / min(durations))
+
+
+def budget(quick: bool) -> Tuple[int, float]:
+    """Minimum number of repeats and minimum total time in seconds of a timing"""
+    # Short repeats over half a second at least: the load of other processes comes in bursts, some repeats miss them
+    return (5, 0.5) if quick else (7, 1.0)
+
+
+def measure(function: Callable[[], object], number: int, quick: bool) -> List[float]:
+    """Time of one call in seconds, per repeat of number calls, repeated for at least the budget"""
+    repeat, minTime = budget(quick)
+    durations = []
+    began = time.perf_counter()
+    while len(durations) < repeat or time.perf_counter() - began < minTime:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        durations.append((time.perf_counter() - start) / number)
+    return durations
+
+
+def fixtureIndex(results: Results, quick: bool):
+    runs = 3 if quick else 5
+    startups = [json.loads(subprocess.check_output([sys.executable, "-c", STARTUP], cwd=ROOT)) for _ in range(runs)]
+    results.addTiming("fixtureindex.startup", startups, 1e3, "ms")
+
+    from pydmx.fixtureIndex.fixtureIndex import FixtureIndex
+
+    index = FixtureIndex.getInstance()
+    keys = list(index.ofl)
+    # About 100 fixtures spread over the whole file, none of them parsed yet
+    sample = keys[:: max(len(keys) // (25 if quick else 100), 1)]
+    cold = []
+    for key in sample:
+        start = time.perf_counter()
+        index.lookupFixture(key)
+        cold.append(time.perf_counter() - start)
+    results.add("fixtureindex.lookup.cold", statistics.median(cold) * 1e6, "us")
+    cached = sample[-min(len(sample), index._cacheSize) :]
+    warm = measure(lambda: [index.lookupFixture(key) for key in cached], 1 if quick else 10, quick)
+    results.addTiming("fixtureindex.lookup.warm", warm, 1e6 / len(cached))
+
+
+def deserialize(results: Results, quick: bool):
+    from pydmx.openfixturelibrary.ofldeserializer import fromDict
+
+    with open(OFL, encoding="utf-8") as infile:
+        fixtures = list(json.load(infile).values())
+    if quick:
+        fixtures = fixtures[::10]
+
+    def convertAll():
+        for fixture in fixtures:
+            try:
+                fromDict(fixture)
+            except Exception:
+                pass
+
+    results.addRate("deserialize.fixtures_per_s", len(fixtures), measure(convertAll, 1, quick))
+
+
+class Chase:
+    """Renderer moving a light through every universe of a merge layer, so every frame changes"""
+
+    def __init__(self, layer, universes: int):
+        self.frames = [layer.frame(universe) for universe in range(universes)]
+        self.step = 0
+
+    def __call__(self):
+        self.step += 1
+        for frame in self.frames:
+            frame[self.step % 512] = self.step % 255 + 1
+            frame[(self.step - 1) % 512] = 0
+
+
+def frame(results: Results, quick: bool):
+    from benchmarks.multiverse_tick import CopyController
+    from pydmx.merge import MergeEngine
+    from pydmx.multiverse import Multiverse
+
+    for count in UNIVERSES:
+        multiverse = Multiverse(framerate=44)
+        for universeId in range(count):
+            multiverse.addUniverse(universeId).controller = CopyController()
+        engine = MergeEngine(list(multiverse.universes.values()), layers=4)
+        chase = Chase(engine.addLayer("suite"), count)
+        engine.addLayer("static").frame(0)[:] = bytes(range(256)) * 2
+
+        def render():
+            chase()
+            engine.merge()
+
+        ticks = 5 if quick else 10
+        results.addTiming(f"frame.render.{count}u", measure(render, ticks, quick))
+        multiverse.renderers += [chase, engine.merge]
+        results.addTiming(f"frame.tick.{count}u", measure(multiverse.tick, ticks, quick))
+        multiverse.close()
+
+
+def _drain(sock: socket.socket, stop: Event, received: List[int]):
+    buffer = bytearray(1024)
+    while not stop.is_set():
+        try:
+            sock.recv_into(buffer)
+            received[0] += 1
+        except socket.timeout:
+            pass
+
+
+def output(results: Results, quick: bool):
+    from pydmx.controller.artnet import ArtNetController
+    from pydmx.controller.e131 import E131Controller
+    from pydmx.controller.loopback import LoopbackController
+    from pydmx.controller.serial import SerialController
+
+    number = 200
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(0.1)
+    port = receiver.getsockname()[1]
+
+    for name, controller in (
+        ("artnet", ArtNetController("127.0.0.1", 1, port=port)),
+        ("e131", E131Controller(1, host="127.0.0.1", port=port)),
+    ):
+        controller.frame.back[:] = bytes(range(256)) * 2
+        controller.frame.commit()
+        results.addTiming(f"output.{name}.encode", measure(controller.encode, number, quick))
+
+        stop, received = Event(), [0]
+        drain = Thread(target=_drain, args=(receiver, stop, received), daemon=True)
+        drain.start()
+        sends = measure(controller.write, number, quick)
+        time.sleep(0.2)
+        stop.set()
+        drain.join()
+        results.addRate(f"output.{name}.send_per_s", 1, sends)
+        results.add(f"output.{name}.delivered", received[0] / (len(sends) * number) * 100, "%", "higher")
+        controller.close()
+    receiver.close()
+
+    controller = LoopbackController(simulateLine=False)
+    results.addTiming("output.loopback.write", measure(controller.write, number, quick))
+    controller.close()
+
+    # A pty stands in for the RS-485 adapter, the line is marked free before every frame
+    master, slave = os.openpty()
+    controller = SerialController(os.ttyname(slave))
+
+    def writeSerial():
+        controller._lineFree = 0.0
+        controller.write()
+        os.read(master, 1024)
+
+    results.addTiming("output.serial.write", measure(writeSerial, 5, quick))
+    controller.close()
+    os.close(master)
+    os.close(slave)
+
+
+CASES = {
+    "fixtureindex": fixtureIndex,
+    "deserialize": deserialize,
+    "frame": frame,
+    "output": output,
+}
+
+
+def commit() -> str:
+    try:
+        revision = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+        dirty = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return revision + ("-dirty" if dirty.strip() else "")
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> int:
+    """Printing the change of the best repeat of every value against a baseline, returns the number of regressions"""
+    print(f"\ncompared with {baseline['commit']} ({baseline['date']})")
+    regressions = 0
+    for name, entry in current["results"].items():
+        previous = baseline["results"].get(name)
+        # Results written before the best repeat was recorded only have the median
+        key = "best" if previous is not None and "best" in previous else "value"
+        if previous is None or not previous[key]:
+            continue
+        change = entry[key] / previous[key] - 1
+        worse = change if entry["better"] == "lower" else -change
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif worse < -threshold:
+            flag = "  improved"
+        print(f"  {name:<36} {previous[key]:14.3f} -> {entry[key]:14.3f} {entry['unit']:<3} {change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and smaller inputs, e.g. for CI")
+    parser.add_argument("--output", help="result file, benchmarks/results/<commit>.json by default")
+    parser.add_argument("--compare", help="result file of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, help="relative change counted as regression, 0.1 (0.15 with --quick) by default")
+    args = parser.parse_args()
+
+    results = Results()
+    for case in args.cases:
+        print(case)
+        CASES[case](results, args.quick)
+
+    run = {
+        "commit": commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "quick": args.quick,
+        "results": results.values,
+    }
+    path = args.output or os.path.join(RESULTS, f"{run['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as outfile:
+        json.dump(run, outfile, indent=2)
+    print(f"results written to {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as infile:
+            threshold = args.threshold if args.threshold is not None else (0.15 if args.quick else 0.1)
+            if compare(run, json.load(infile), threshold):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
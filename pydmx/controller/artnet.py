@@ -0,0 +1,93 @@
+from time import perf_counter
+from typing import List, Optional
+
+from pydmx.controller.network import UDPController
+from pydmx.metrics import ENCODE
+
+ARTNET_PORT = 6454
+ARTNET_ID = b"Art-Net\x00"
+OP_DMX = 0x5000
+OP_SYNC = 0x5200
+PROTOCOL_VERSION = 14
+HEADER_LENGTH = 18
+SYNC_PACKET = ARTNET_ID + OP_SYNC.to_bytes(2, "little") + PROTOCOL_VERSION.to_bytes(2, "big") + b"\x00\x00"
+
+
+class ArtNetController(UDPController):
+    """
+    Art-Net 4 output of a single universe
+    """
+
+    """
+    ArtDmx packet:
+      ID "Art-Net\\0" | OpCode 0x5000 (little endian) | ProtVer 14 (big endian) | Sequence | Physical |
+      SubUni | Net | Length (big endian) | Data
+
+    The packet is preallocated with its header, per frame only the sequence number and the data are updated.
+    writeMany sends the packets of many universes over the shared socket in one go and with sync enabled
+    finishes them with a single ArtSync, so the nodes output all universes at the same time.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        universe: int = 0,
+        *args,
+        port: int = ARTNET_PORT,
+        sync: bool = False,
+        syncHost: Optional[str] = None,
+        physical: int = 0,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        if not 0 <= universe < 0x8000:
+            raise ValueError("The Art-Net Port-Address has to be between 0 and 32767.")
+        self.address = (host, port)
+        self.universe = universe
+        # Sending an ArtSync after the data, so nodes latch the output of all synced universes together
+        self.sync = sync
+        self.syncAddress = (syncHost or host, port)
+
+        length = self.frame.slots + self.frame.slots % 2
+        self._packet = bytearray(HEADER_LENGTH + length)
+        self._packet[0:8] = ARTNET_ID
+        self._packet[8:10] = OP_DMX.to_bytes(2, "little")
+        self._packet[10:12] = PROTOCOL_VERSION.to_bytes(2, "big")
+        self._packet[13] = physical
+        # Port-Address: 4 bit sub-net and 4 bit universe in SubUni, 7 bit net in Net
+        self._packet[14] = universe & 0xFF
+        self._packet[15] = universe >> 8
+        self._packet[16:18] = length.to_bytes(2, "big")
+        self._payload = memoryview(self._packet)[HEADER_LENGTH : HEADER_LENGTH + self.frame.slots]
+        self._sequence = 0
+
+        self.scheduler.start()
+
+    def encode(self) -> bytearray:
+        """Updating the preallocated packet with the published frame"""
+        metrics = self.metrics
+        start = perf_counter() if metrics is not None else 0.0
+        # Sequence 0 disables reordering on the node, so it runs from 1 to 255
+        self._sequence = self._sequence % 255 + 1
+        self._packet[12] = self._sequence
+        with self.frame.read() as data:
+            self._payload[:] = data[1:]
+        if metrics is not None:
+            metrics.observe(ENCODE, perf_counter() - start)
+        return self._packet
+
+    def write(self):
+        self._send(self.encode(), self.address)
+        if self.sync:
+            self._send(SYNC_PACKET, self.syncAddress)
+
+    @classmethod
+    def writeMany(cls, controllers: List["ArtNetController"]):
+        """Sending the packets of all controllers back to back, followed by one ArtSync per sync address"""
+        syncs = {}
+        for controller in controllers:
+            controller._send(controller.encode(), controller.address)
+            if controller.sync:
+                syncs.setdefault((controller.socket, controller.syncAddress), controller)
+        for (_, address), controller in syncs.items():
+            controller._send(SYNC_PACKET, address)
@@ -0,0 +1,176 @@
+import asyncio
+import inspect
+from typing import Awaitable, Callable, List, Optional, Union
+
+from pydmx.controller.controller import DMXController
+from pydmx.controller.scheduler import FrameScheduler
+from pydmx.frame import DMXFrame
+
+
+class AsyncFrameClock(FrameScheduler):
+    """
+    Deadline based frame clock running as a task of an asyncio event loop
+    """
+
+    """
+    Same deadlines and statistics as the FrameScheduler, but the frames are awaited in the event loop instead of
+    a thread. The loop can't wake up more precisely than its selector allows (about a millisecond),
+    so the jitter is higher than with the spinning thread, which DMX receivers don't notice.
+    The callback may be a coroutine function.
+    """
+
+    def __init__(self, callback: Callable[[], Union[Awaitable[None], None]], framerate: float = 40.0, name: Optional[str] = None):
+        super().__init__(callback, framerate, spin=0.0, name=name)
+        self._running = asyncio.Event()
+        self._stopped = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def _spawn(self):
+        # Has to be called from within the running event loop
+        if self.task is None and not self._stopped.is_set():
+            self.task = asyncio.get_running_loop().create_task(self._run(), name=self.name)
+
+    def stop(self):
+        """Ending the task, it can't be started again"""
+        self._stopped.set()
+        self._running.set()
+        if self.task is not None:
+            self.task.cancel()
+
+    async def wait(self):
+        """Waiting until the task ended after stop()"""
+        if self.task is not None:
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while not self._stopped.is_set():
+            await self._running.wait()
+            deadline = loop.time()
+            while self._running.is_set() and not self._stopped.is_set():
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                jitter = loop.time() - deadline
+                self.lastJitter = jitter
+                self._jitterSum += jitter
+                if jitter > self.maxJitter:
+                    self.maxJitter = jitter
+
+                try:
+                    result = self.callback()
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as error:
+                    self._failed(error)
+                self.frames += 1
+
+                deadline += self.period
+                now = loop.time()
+                if now - deadline >= self.period:
+                    missed = int((now - deadline) / self.period)
+                    self.missedDeadlines += missed
+                    deadline += missed * self.period
+
+
+class AsyncDMXController:
+    """
+    Driving a DMX controller from an asyncio event loop instead of its own thread
+    """
+
+    """
+    The wrapped controller keeps rendering, encoding and keep-alive handling, only its frame clock is replaced
+    by an AsyncFrameClock and the frames are sent with writeAsync. Network controllers send directly from the
+    loop, others (e.g. serial) write in the default executor. Many controllers can run on one loop,
+    none of them creates a thread as long as the controller itself is never activated.
+
+    It can be assigned to a Universe like any controller, universe.updateAsync() then returns once the
+    grouped writes were sent.
+    """
+
+    def __init__(self, controller: DMXController, framerate: Optional[float] = None):
+        self.controller = controller
+        self.clock = AsyncFrameClock(self._frame, framerate or controller.framerate, name=type(controller).__name__)
+        # Futures of coroutines waiting for the next frame
+        self._waiters: List[asyncio.Future] = []
+        self.clock.start()
+
+    @property
+    def frame(self) -> DMXFrame:
+        return self.controller.frame
+
+    @frame.setter
+    def frame(self, frame: DMXFrame):
+        self.controller.frame = frame
+
+    @property
+    def active(self) -> bool:
+        return self.clock.active
+
+    @property
+    def framerate(self) -> float:
+        return self.clock.framerate
+
+    @framerate.setter
+    def framerate(self, value: float):
+        self.clock.framerate = value
+
+    @property
+    def stats(self) -> dict:
+        """Statistics of the wrapped controller with the frames and jitter of the event loop clock"""
+        stats = self.controller.stats
+        stats.update(self.clock.stats())
+        return stats
+
+    def activate(self):
+        """Starting the output, has to be called from within the running event loop"""
+        self.clock.resume()
+
+    def deactivate(self):
+        """Pausing the output, coroutines waiting for a frame are cancelled as none will be sent"""
+        self.clock.pause()
+        self._cancelWaiters()
+
+    async def close(self):
+        self.clock.stop()
+        await self.clock.wait()
+        self._cancelWaiters()
+        self.controller.close()
+
+    def _cancelWaiters(self):
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            waiter.cancel()
+
+    async def __aenter__(self) -> "AsyncDMXController":
+        self.activate()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _frame(self):
+        if self.controller.metrics is not None:
+            self.controller.metrics.begin(self.clock.period, clock=self.clock)
+        # Waiters added while this frame is written made their writes after it was published
+        waiters, self._waiters = self._waiters, []
+        try:
+            await self.controller._frameAsync()
+        finally:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def send(self):
+        """Publishing and writing the current frame right away, outside of the frame clock"""
+        await self.controller._frameAsync()
+
+    def sent(self) -> Awaitable[None]:
+        """Future which is done once the next frame was published and written"""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        return waiter
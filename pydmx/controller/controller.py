@@ -1,8 +1,13 @@
+import asyncio
 from abc import ABC, abstractmethod
 from enum import Enum
 from platform import system
-from threading import Thread
-from time import sleep
+from time import perf_counter
+from typing import Callable, List, Optional
+
+from pydmx.controller.scheduler import FrameScheduler
+from pydmx.frame import DMXFrame
+from pydmx.metrics import FrameMetrics
 
 
 class OS(Enum):
@@ -16,6 +21,16 @@ if system() == "Linux":
 elif system() == "Windows":
     operatingsystem = OS.WINDOWS
 
+# DMX512 timing in seconds: 250 kbaud with 11 bits (start, 8 data, 2 stop) per slot
+BREAK_TIME = 88e-6
+MAB_TIME = 8e-6
+SLOT_TIME = 44e-6
+
+
+def maxFramerate(slots: int = 512) -> float:
+    """Highest possible refresh rate of a DMX512 line for the given number of slots (plus start code)"""
+    return 1 / (BREAK_TIME + MAB_TIME + (slots + 1) * SLOT_TIME)
+
 
 class DMXController(ABC):
     """
@@ -32,42 +47,146 @@ class DMXController(ABC):
       in a DMX network and communicates at 250 kbps baud rate. Each bit in the frame is generated every 4us.
     
     2.2 Data Protocol:
-
+      A frame starts with a break of at least 88us, followed by the mark after break (MAB) of at least 8us,
+      the start code and up to 512 slots of 44us each. With all 512 slots this allows about 44 frames per second.
 
   """
 
+    # Maximum time in seconds an unchanged frame may go unsent, 0 sends every frame.
+    # None leaves the decision to whatever drives the controller (e.g. the Multiverse).
+    keepAlive = None
+
     @abstractmethod
-    def __init__(self, *args, **kwargs):
-        """Initialising the DMX Controller"""
-        self._dmxdata: bytes = bytes((0,) * 512)
-        self.active = False
-        self._writer_delay = 0.3
-        self.thread = Thread(target=self.writer_thread, daemon=True)
+    def __init__(self, *args, framerate: float = 40.0, keepAlive: Optional[float] = None, **kwargs):
+        """Initialising the DMX Controller, keepAlive overrides the keep-alive time of the class"""
+        if keepAlive is not None:
+            self.keepAlive = keepAlive
+        # The frame is replaced by the one of the Universe the controller gets assigned to
+        self.frame = DMXFrame()
+        # The scheduler renders one frame per period, it only runs while the controller is active
+        self.scheduler = FrameScheduler(self._frame, framerate, name=type(self).__name__)
+        # Generation and time of the last frame which was written
+        self._sentGeneration = -1
+        self._sentTime = 0.0
+        # Frames handed to write() and unchanged frames which weren't sent
+        self.framesSent = 0
+        self.framesUnchanged = 0
+        # Called before every frame is published, e.g. to advance fades
+        self.renderers: List[Callable[[], object]] = []
+        # Called after every frame was published and before it is written, e.g. to record the output
+        self.monitors: List[Callable[[], object]] = []
+        # Pipeline metrics, only collected once enabled
+        self.metrics: Optional[FrameMetrics] = None
+        # Universe the counters of this controller are kept under
+        self.metricsLabel: Optional[str] = None
 
     @property
-    def dmxdata(self):
-        """"""
-        return self._dmxdata
+    def dmxdata(self) -> bytes:
+        """Copy of the currently published 512 Bytes"""
+        with self.frame.read() as data:
+            return bytes(data[1:])
 
     @dmxdata.setter
     def dmxdata(self, value: bytes):
-        self._dmxdata = value
+        self.frame[: len(value)] = value
+        self.frame.commit()
+
+    def enableMetrics(self, metrics: Optional[FrameMetrics] = None, label: Optional[str] = None) -> FrameMetrics:
+        """Collecting the pipeline metrics of this controller, into a shared FrameMetrics if given"""
+        self.metrics = metrics or FrameMetrics()
+        # The universe number of network controllers, the class name otherwise
+        self.metricsLabel = label or self.metricsLabel or str(getattr(self, "universe", type(self).__name__))
+        return self.metrics
+
+    def disableMetrics(self):
+        self.metrics = None
+
+    def _prepare(self) -> bool:
+        """Rendering and publishing the next frame, returns if it has to be written"""
+        metrics = self.metrics
+        if metrics is None:
+            for render in self.renderers:
+                render()
+        else:
+            start = perf_counter()
+            for render in self.renderers:
+                render()
+            metrics.rendered(perf_counter() - start)
+        # Publishing everything written since the last frame before sending it
+        self.frame.commit()
+        for monitor in self.monitors:
+            monitor()
+        now = perf_counter()
+        if self.keepAlive and self.frame.generation == self._sentGeneration and now - self._sentTime < self.keepAlive:
+            # Unchanged frames are only repeated once the keep-alive time passed
+            self.framesUnchanged += 1
+            if metrics is not None:
+                metrics.unchanged(self.metricsLabel)
+            return False
+        self._sentGeneration = self.frame.generation
+        self._sentTime = now
+        self.framesSent += 1
+        return True
+
+    def _frame(self):
+        """Called by the scheduler once per frame"""
+        if self.metrics is not None:
+            self.metrics.begin(self.scheduler.period, clock=self.scheduler)
+        if self._prepare():
+            self.write()
+
+    async def _frameAsync(self):
+        """Called by an AsyncFrameClock once per frame"""
+        if self._prepare():
+            await self.writeAsync()
 
     @abstractmethod
     def write(self):
-        """Writing 512 Bytes of DMX Data"""
+        """Writing 512 Bytes of DMX Data, the published frame is available through self.frame.read()"""
         raise NotImplementedError("Must override write Method!")
 
+    async def writeAsync(self):
+        """
+        Writing the frame from an asyncio event loop.
+        By default write() runs in the default executor, so the loop isn't blocked by the output.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.write)
+
+    @classmethod
+    def writeMany(cls, controllers):
+        """
+        Writing the frames of several controllers of this class at once.
+        Subclasses can override this to batch the output, e.g. over a shared socket.
+        """
+        for controller in controllers:
+            controller.write()
+
+    @property
+    def active(self) -> bool:
+        return self.scheduler.active
+
+    @property
+    def framerate(self) -> float:
+        """Target frames per second, for a full universe DMX512 allows about 44"""
+        return self.scheduler.framerate
+
+    @framerate.setter
+    def framerate(self, value: float):
+        self.scheduler.framerate = value
+
+    @property
+    def stats(self) -> dict:
+        """Frame counter, missed deadlines and jitter of the output, sent and unchanged (skipped) frames"""
+        stats = self.scheduler.stats()
+        stats.update(framesSent=self.framesSent, framesUnchanged=self.framesUnchanged)
+        return stats
+
     def activate(self):
-        self.active = True
+        self.scheduler.resume()
 
     def deactivate(self):
-        self.active = False
+        self.scheduler.pause()
 
-    def writer_thread(self):
-        while True:
-            if not self.active:
-                continue
-            self.write()
-            # The Sleep intervall has to be a max 0.3
-            sleep(self._writer_delay)
+    def close(self):
+        """Stopping the output thread for good"""
+        self.scheduler.stop()
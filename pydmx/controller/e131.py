@@ -0,0 +1,150 @@
+import socket
+import uuid
+from time import perf_counter
+from typing import Optional
+
+from pydmx.controller.network import UDPController
+from pydmx.metrics import ENCODE
+
+E131_PORT = 5568
+ACN_PACKET_IDENTIFIER = b"ASC-E1.17\x00\x00\x00"
+VECTOR_ROOT_E131_DATA = 0x00000004
+VECTOR_E131_DATA_PACKET = 0x00000002
+VECTOR_DMP_SET_PROPERTY = 0x02
+DMP_HEADER_LENGTH = 126
+
+# Framing layer option bits
+OPTION_PREVIEW_DATA = 0x80
+OPTION_STREAM_TERMINATED = 0x40
+
+
+def multicastAddress(universe: int) -> str:
+    """Multicast group of a universe: 239.255.<universe high byte>.<universe low byte>"""
+    return f"239.255.{universe >> 8}.{universe & 0xFF}"
+
+
+class E131Controller(UDPController):
+    """
+    Streaming ACN (ANSI E1.31) output of a single universe
+    """
+
+    """
+    E1.31 data packet (126 bytes of headers + slots):
+      Root layer     0-37:   preamble, ACN packet identifier, flags & length, vector, CID
+      Framing layer  38-114: flags & length, vector, source name, priority, sync address,
+                             sequence number (111), options (112), universe
+      DMP layer      115-..: flags & length, vector, address & data type, first address, increment,
+                             property value count, start code (125) and the slots
+
+    The whole packet is built once per universe, per frame only the sequence number and the slots change.
+    Without a host the packet is sent to the multicast group of the universe, with a host as unicast.
+    """
+
+    def __init__(
+        self,
+        universe: int = 1,
+        *args,
+        host: Optional[str] = None,
+        port: int = E131_PORT,
+        sourceName: str = "pydmx",
+        cid: Optional[uuid.UUID] = None,
+        priority: int = 100,
+        preview: bool = False,
+        syncUniverse: int = 0,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        if not 1 <= universe <= 63999:
+            raise ValueError("The sACN universe has to be between 1 and 63999.")
+        if not 0 <= priority <= 200:
+            raise ValueError("The sACN priority has to be between 0 and 200.")
+        self.universe = universe
+        self.multicast = host is None
+        self.address = (multicastAddress(universe) if host is None else host, port)
+        # The CID identifies the source, controllers of the same application should share it
+        self.cid = cid or uuid.uuid4()
+
+        slots = self.frame.slots
+        length = DMP_HEADER_LENGTH + slots
+        packet = bytearray(length)
+        # Root layer
+        packet[0:2] = (0x0010).to_bytes(2, "big")
+        packet[4:16] = ACN_PACKET_IDENTIFIER
+        packet[16:18] = (0x7000 | (length - 16)).to_bytes(2, "big")
+        packet[18:22] = VECTOR_ROOT_E131_DATA.to_bytes(4, "big")
+        packet[22:38] = self.cid.bytes
+        # Framing layer
+        packet[38:40] = (0x7000 | (length - 38)).to_bytes(2, "big")
+        packet[40:44] = VECTOR_E131_DATA_PACKET.to_bytes(4, "big")
+        packet[44:108] = sourceName.encode("utf-8")[:63].ljust(64, b"\x00")
+        packet[108] = priority
+        packet[109:111] = syncUniverse.to_bytes(2, "big")
+        packet[113:115] = universe.to_bytes(2, "big")
+        # DMP layer
+        packet[115:117] = (0x7000 | (length - 115)).to_bytes(2, "big")
+        packet[117] = VECTOR_DMP_SET_PROPERTY
+        packet[118] = 0xA1
+        packet[121:123] = (0x0001).to_bytes(2, "big")
+        packet[123:125] = (slots + 1).to_bytes(2, "big")
+        self._packet = packet
+        # Start code and slots
+        self._data = memoryview(packet)[DMP_HEADER_LENGTH - 1 :]
+        self._sequence = 0
+        self.preview = preview
+
+        self.scheduler.start()
+
+    @classmethod
+    def _configureSocket(cls, sock: socket.socket):
+        # Keeping multicast inside the local network segment by default
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+
+    @property
+    def priority(self) -> int:
+        return self._packet[108]
+
+    @priority.setter
+    def priority(self, value: int):
+        if not 0 <= value <= 200:
+            raise ValueError("The sACN priority has to be between 0 and 200.")
+        self._packet[108] = value
+
+    @property
+    def preview(self) -> bool:
+        """Preview data is meant for visualizers and must not be output by receivers"""
+        return bool(self._packet[112] & OPTION_PREVIEW_DATA)
+
+    @preview.setter
+    def preview(self, value: bool):
+        if value:
+            self._packet[112] |= OPTION_PREVIEW_DATA
+        else:
+            self._packet[112] &= ~OPTION_PREVIEW_DATA & 0xFF
+
+    def encode(self) -> bytearray:
+        """Updating the prebuilt packet with the published frame"""
+        metrics = self.metrics
+        start = perf_counter() if metrics is not None else 0.0
+        self._sequence = (self._sequence + 1) & 0xFF
+        self._packet[111] = self._sequence
+        with self.frame.read() as data:
+            self._data[:] = data
+        if metrics is not None:
+            metrics.observe(ENCODE, perf_counter() - start)
+        return self._packet
+
+    def write(self):
+        self._send(self.encode(), self.address)
+
+    def terminate(self):
+        """Telling the receivers that this source stops, the standard asks for three packets"""
+        self._packet[112] |= OPTION_STREAM_TERMINATED
+        try:
+            for _ in range(3):
+                self.write()
+        finally:
+            self._packet[112] &= ~OPTION_STREAM_TERMINATED & 0xFF
+
+    def close(self):
+        super().close()
+        self.terminate()
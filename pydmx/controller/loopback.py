@@ -0,0 +1,143 @@
+from time import perf_counter
+from typing import Optional, Tuple
+
+import numpy as np
+
+from pydmx.controller.controller import BREAK_TIME, MAB_TIME, SLOT_TIME, DMXController, maxFramerate
+from pydmx.metrics import ENCODE
+
+
+class LoopbackController(DMXController):
+    """
+    DMX512 output into memory, for tests and load tests without hardware
+    """
+
+    """
+    write() behaves like a SerialController on a real line: a frame occupies the simulated line for break, mark
+    after break and start code + slots at 250 kbaud (about 22.7 ms for a full universe, so at most 44 frames
+    per second), a frame which is due while the previous one is still on the line is skipped and counted.
+    The line time is only accounted and never waited for, so hundreds of simulated universes run in one
+    process, each on its own frame clock or driven by a Multiverse.
+
+    Every written frame is copied into a ring buffer holding the last capacity frames (start code + slots)
+    together with the time its break started and its frame generation, so tests can check what was output
+    and when, and load tests can measure the accuracy of the frame clock from the captured timestamps.
+    """
+
+    # DMX512 receivers expect a continuous refresh, unchanged frames are sent as well
+    keepAlive = 0.0
+
+    def __init__(
+        self,
+        *args,
+        capacity: int = 256,
+        breakTime: float = BREAK_TIME,
+        markTime: float = MAB_TIME,
+        simulateLine: bool = True,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.breakTime = breakTime
+        self.markTime = markTime
+        # Without the line simulation every frame is captured, however fast they come
+        self.simulateLine = simulateLine
+        self.capacity = capacity
+        self._width = self.frame.slots + 1
+        # Ring buffer of the captured frames, the oldest one gets overwritten
+        self._buffer = bytearray(capacity * self._width)
+        self._view = memoryview(self._buffer)
+        self.frames = np.frombuffer(self._buffer, dtype=np.uint8).reshape(capacity, self._width)
+        self.timestamps = np.zeros(capacity)
+        self.generations = np.zeros(capacity, dtype=np.int64)
+        # Point in time the last frame is completely transmitted
+        self._lineFree = 0.0
+        # Time the simulated line was busy
+        self.lineTime = 0.0
+        # Frames which were due while the line was still busy
+        self.skippedFrames = 0
+        self.framesWritten = 0
+        self.scheduler.start()
+
+    @property
+    def frameTime(self) -> float:
+        """Time a frame occupies the line: break, mark after break, start code and slots"""
+        return self.breakTime + self.markTime + self._width * SLOT_TIME
+
+    @property
+    def maxFramerate(self) -> float:
+        return maxFramerate(self.frame.slots)
+
+    @property
+    def stats(self) -> dict:
+        stats = super().stats
+        stats.update(
+            framesWritten=self.framesWritten,
+            skippedFrames=self.skippedFrames,
+            lineTime=self.lineTime,
+        )
+        stats.update(self.timing())
+        return stats
+
+    def write(self):
+        metrics = self.metrics
+        now = perf_counter()
+        if self.simulateLine and now < self._lineFree:
+            # The previous frame is still being transmitted
+            self.skippedFrames += 1
+            if metrics is not None:
+                metrics.dropped(self.metricsLabel)
+            return
+
+        index = self.framesWritten % self.capacity
+        start = index * self._width
+        with self.frame.read() as data:
+            self._view[start : start + len(data)] = data
+            self.generations[index] = self.frame.generation
+        self.timestamps[index] = now
+        self.framesWritten += 1
+        frameTime = self.frameTime
+        self._lineFree = now + frameTime
+        self.lineTime += frameTime
+        if metrics is not None:
+            metrics.observe(ENCODE, perf_counter() - now)
+            metrics.sent(self.metricsLabel, len(data))
+
+    def captured(self, count: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps and frames (start code + slots) of the last count captured frames as copies, oldest first"""
+        available = min(self.framesWritten, self.capacity)
+        count = available if count is None else min(count, available)
+        order = (np.arange(self.framesWritten - count, self.framesWritten)) % self.capacity
+        return self.timestamps[order], self.frames[order]
+
+    @property
+    def lastFrame(self) -> Optional[bytes]:
+        """Slots of the last captured frame"""
+        if not self.framesWritten:
+            return None
+        return self.frames[(self.framesWritten - 1) % self.capacity, 1:].tobytes()
+
+    def clearCapture(self):
+        """Forgetting the captured frames, the simulated line is free again"""
+        self.framesWritten = 0
+        self._lineFree = 0.0
+        self.skippedFrames = 0
+        self.lineTime = 0.0
+
+    def timing(self, period: Optional[float] = None) -> dict:
+        """
+        Output timing measured from the captured frames: frames per second, the mean and largest deviation
+        of the intervals between two frames from the frame period (the one of the controller's own clock by
+        default, give the one of a Multiverse driving it) and the share of time the line was busy
+        """
+        period = self.scheduler.period if period is None else period
+        timestamps, _ = self.captured()
+        if len(timestamps) < 2:
+            return {"capturedFramerate": 0.0, "meanDeviation": 0.0, "maxDeviation": 0.0, "lineUsage": 0.0}
+        intervals = np.diff(timestamps)
+        deviations = np.abs(intervals - period)
+        return {
+            "capturedFramerate": float(len(intervals) / (timestamps[-1] - timestamps[0])),
+            "meanDeviation": float(deviations.mean()),
+            "maxDeviation": float(deviations.max()),
+            "lineUsage": float(len(intervals) * self.frameTime / (timestamps[-1] - timestamps[0])),
+        }
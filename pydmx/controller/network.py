@@ -0,0 +1,104 @@
+import asyncio
+import socket
+from select import select
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+from pydmx.controller.controller import DMXController
+from pydmx.metrics import SEND
+
+
+class UDPController(DMXController):
+    """
+    Base Class for controllers sending their frames over UDP
+    """
+
+    """
+    All controllers of a class share one non-blocking socket, so many universes can be sent back to back
+    from a single thread. If the socket buffer is full, a packet waits a moment for it to drain and is
+    dropped (and counted) if that doesn't help, so a slow network never stalls the frame clock.
+    From an event loop (writeAsync) the packets are sent directly as well, only the wait for a full
+    socket buffer is awaited instead of blocking the loop.
+    """
+
+    # Receivers fall back to their failsafe state without data, so unchanged frames are repeated every second
+    keepAlive = 1.0
+
+    def __init__(self, *args, sock: Optional[socket.socket] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.socket = sock or type(self).sharedSocket()
+        # Packets which couldn't be sent because the socket buffer stayed full
+        self.droppedPackets = 0
+        # Packets which hit a full socket buffer during writeAsync, retried after the loop waited
+        self._deferred: Optional[List[Tuple[bytes, Tuple[str, int]]]] = None
+
+    @property
+    def stats(self) -> dict:
+        stats = super().stats
+        stats.update(droppedPackets=self.droppedPackets)
+        return stats
+
+    @classmethod
+    def sharedSocket(cls) -> socket.socket:
+        # Looking only at the class itself, every subclass gets its own socket
+        sock = cls.__dict__.get("_socket")
+        if sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            cls._configureSocket(sock)
+            sock.setblocking(False)
+            cls._socket = sock
+        return sock
+
+    @classmethod
+    def _configureSocket(cls, sock: socket.socket):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+
+    def _send(self, packet, address: Tuple[str, int]) -> bool:
+        metrics = self.metrics
+        if metrics is None:
+            return self._sendPacket(packet, address)
+        start = perf_counter()
+        sent = self._sendPacket(packet, address)
+        metrics.observe(SEND, perf_counter() - start)
+        if sent:
+            metrics.sent(self.metricsLabel, len(packet))
+        elif self._deferred is None:
+            metrics.dropped(self.metricsLabel)
+        return sent
+
+    def _sendPacket(self, packet, address: Tuple[str, int]) -> bool:
+        try:
+            self.socket.sendto(packet, address)
+            return True
+        except BlockingIOError:
+            if self._deferred is not None:
+                # The prebuilt packet changes with the next frame, so the deferred one is a copy
+                self._deferred.append((bytes(packet), address))
+                return False
+            select((), (self.socket,), (), 0.005)
+        try:
+            self.socket.sendto(packet, address)
+            return True
+        except BlockingIOError:
+            self.droppedPackets += 1
+            return False
+
+    async def writeAsync(self):
+        self._deferred = []
+        try:
+            self.write()
+        finally:
+            deferred, self._deferred = self._deferred, None
+        if not deferred:
+            return
+        await asyncio.sleep(0.005)
+        for packet, address in deferred:
+            try:
+                self.socket.sendto(packet, address)
+            except BlockingIOError:
+                self.droppedPackets += 1
+                if self.metrics is not None:
+                    self.metrics.dropped(self.metricsLabel)
+            else:
+                if self.metrics is not None:
+                    self.metrics.sent(self.metricsLabel, len(packet))
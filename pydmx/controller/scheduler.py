@@ -0,0 +1,148 @@
+from threading import Event, Thread
+from time import perf_counter
+from typing import Callable, Optional
+
+
+class FrameScheduler:
+    """
+    Deadline based frame clock calling a callback at a fixed frame rate
+    """
+
+    """
+    Every frame has an absolute deadline (start + n * period), so a late frame doesn't shift the following ones
+    and the output rate doesn't drift. If a callback overruns so much that the slot of whole frames passed,
+    these deadlines are counted as missed and skipped.
+
+    The thread sleeps until shortly before a deadline and spins for the rest, because sleep alone
+    can wake up a few hundred microseconds late. While paused the thread blocks on an event and uses no CPU.
+    Exceptions of the callback are counted and printed (repeats of the same one only once), the clock keeps
+    running, so a temporary failure of the output (e.g. an unplugged adapter) doesn't end it for good.
+    The thread is only created once a started scheduler gets resumed, so schedulers which never run
+    (e.g. of controllers driven by a Multiverse or an event loop) don't cost a thread.
+    """
+
+    def __init__(self, callback: Callable[[], None], framerate: float = 40.0, spin: float = 0.0005, name: Optional[str] = None):
+        self.callback = callback
+        self.framerate = framerate
+        # Time in seconds before a deadline in which the thread spins instead of sleeping
+        self.spin = spin
+        self._running = Event()
+        self._stopped = Event()
+        self.name = name
+        self.thread: Optional[Thread] = None
+        self._started = False
+        self.resetStats()
+
+    @property
+    def framerate(self) -> float:
+        return self._framerate
+
+    @framerate.setter
+    def framerate(self, value: float):
+        if value <= 0:
+            raise ValueError("The frame rate has to be positive.")
+        self._framerate = value
+        self.period = 1 / value
+
+    @property
+    def active(self) -> bool:
+        return self._running.is_set()
+
+    def start(self):
+        self._started = True
+        if self._running.is_set():
+            self._spawn()
+
+    def _spawn(self):
+        if self.thread is None and not self._stopped.is_set():
+            self.thread = Thread(target=self._run, name=self.name, daemon=True)
+            self.thread.start()
+
+    def resume(self):
+        self._running.set()
+        if self._started:
+            self._spawn()
+
+    def pause(self):
+        self._running.clear()
+
+    def stop(self):
+        """Ending the thread, it can't be started again"""
+        self._stopped.set()
+        self._running.set()
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join()
+
+    def resetStats(self):
+        # Frames the callback was called for
+        self.frames = 0
+        # Deadlines which passed without a frame
+        self.missedDeadlines = 0
+        # Lateness of the frame start compared to its deadline in seconds
+        self.lastJitter = 0.0
+        self.maxJitter = 0.0
+        self._jitterSum = 0.0
+        # Frames whose callback raised an exception and the last exception
+        self.errors = 0
+        self.lastError: Optional[Exception] = None
+
+    @property
+    def meanJitter(self) -> float:
+        return self._jitterSum / self.frames if self.frames else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "framerate": self._framerate,
+            "frames": self.frames,
+            "missedDeadlines": self.missedDeadlines,
+            "lastJitter": self.lastJitter,
+            "meanJitter": self.meanJitter,
+            "maxJitter": self.maxJitter,
+            "errors": self.errors,
+        }
+
+    def _failed(self, error: Exception):
+        """Counting an exception of the callback, printed unless it repeats the previous one"""
+        if self.lastError is None or repr(error) != repr(self.lastError):
+            print(f"The frame callback of {self.name or 'a FrameScheduler'} failed: {error!r}")
+        self.errors += 1
+        self.lastError = error
+
+    def _sleepUntil(self, deadline: float):
+        remaining = deadline - perf_counter() - self.spin
+        if remaining > 0:
+            # Waiting on the stop event, so stop() doesn't have to wait for the frame
+            self._stopped.wait(remaining)
+        while perf_counter() < deadline and not self._stopped.is_set():
+            pass
+
+    def _run(self):
+        while not self._stopped.is_set():
+            # Blocking without CPU usage until the scheduler gets resumed
+            self._running.wait()
+            deadline = perf_counter()
+            while self._running.is_set() and not self._stopped.is_set():
+                self._sleepUntil(deadline)
+                if self._stopped.is_set():
+                    break
+
+                jitter = perf_counter() - deadline
+                self.lastJitter = jitter
+                self._jitterSum += jitter
+                if jitter > self.maxJitter:
+                    self.maxJitter = jitter
+
+                try:
+                    self.callback()
+                except Exception as error:
+                    self._failed(error)
+                self.frames += 1
+
+                deadline += self.period
+                now = perf_counter()
+                if now - deadline >= self.period:
+                    # Skipping every frame whose slot passed completely instead of rushing to catch up,
+                    # a frame which is just a bit late is sent immediately and shows up as jitter
+                    missed = int((now - deadline) / self.period)
+                    self.missedDeadlines += missed
+                    deadline += missed * self.period
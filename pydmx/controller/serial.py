@@ -1,16 +1,38 @@
-from platform import system
-from time import sleep
+import os
+from time import perf_counter
 
 from serial import STOPBITS_TWO, Serial
 
-from pydmx.controller.controller import OS, DMXController, operatingsystem
+from pydmx.controller.controller import BREAK_TIME, MAB_TIME, OS, SLOT_TIME, DMXController, operatingsystem
+from pydmx.metrics import ENCODE, SEND
 
-if operatingsystem == OS.LINUX:
-    import fcntl
+
+def _spin(duration: float):
+    """Busy waiting, sleep can't resolve the few microseconds of a break"""
+    end = perf_counter() + duration
+    while perf_counter() < end:
+        pass
 
 
 class SerialController(DMXController):
-    def __init__(self, port: str, *args, **kwargs):
+    """
+    DMX512 output over a serial port (e.g. RS-485 adapters)
+    """
+
+    """
+    A frame is sent as break, mark after break and a single write of start code + slots.
+    The break is produced by holding the line in the break condition for breakTime, followed by markTime
+    of idle line. Both are timed with a busy wait, as they are far below the resolution of sleep.
+
+    The port is opened non-blocking (write_timeout=0), so the scheduler thread never waits for the
+    transmission. If the previous frame is still on the line when the next one is due, the frame is skipped
+    and counted instead of blocking on flush.
+    """
+
+    # DMX512 receivers expect a continuous refresh, unchanged frames are sent as well
+    keepAlive = 0.0
+
+    def __init__(self, port: str, *args, breakTime: float = 2 * BREAK_TIME, markTime: float = 1.5 * MAB_TIME, **kwargs):
         super().__init__(*args, **kwargs)
         # The port name and index differs from OS to OS
         self.port = self._check_port(port)
@@ -19,20 +41,90 @@ class SerialController(DMXController):
         # Bytesize: EIGHTBITS
         # Parity: PARITY_NONE
         # StopBits: STOPBITS_TWO (standard: STOPBITS_ONE)
-        self.serial = Serial(port, baudrate=250000, stopbits=STOPBITS_TWO)
-        self.thread.start()
+        self.serial = Serial(self.port, baudrate=250000, stopbits=STOPBITS_TWO, write_timeout=0)
+        self.breakTime = breakTime
+        self.markTime = markTime
+        # Preallocated start code + slots, the frame is copied in so the frame lock isn't held during the write
+        self._packet = bytearray(self.frame.slots + 1)
+        # Point in time the last frame is completely transmitted
+        self._lineFree = 0.0
+        # Frames which were due while the line was still busy or didn't fit into the driver buffer
+        self.skippedFrames = 0
+        self.framesWritten = 0
+        # Frames per second actually written, measured over windows of one second
+        self.achievedFramerate = 0.0
+        self._windowStart = perf_counter()
+        self._windowFrames = 0
+        self.scheduler.start()
 
     def _check_port(self, port: str) -> str:
-        # TODO: Portchecking
-        return "COM3"
+        if not port:
+            raise ValueError("A serial port has to be given, e.g. COM3 or /dev/ttyUSB0.")
+        return port
+
+    @property
+    def stats(self) -> dict:
+        stats = super().stats
+        stats.update(
+            framesWritten=self.framesWritten,
+            skippedFrames=self.skippedFrames,
+            achievedFramerate=self.achievedFramerate,
+        )
+        return stats
 
     def write(self):
+        metrics = self.metrics
+        now = perf_counter()
+        if now < self._lineFree or self.serial.out_waiting:
+            # The previous frame is still being transmitted
+            self.skippedFrames += 1
+            if metrics is not None:
+                metrics.dropped(self.metricsLabel)
+            return
+
+        with self.frame.read() as data:
+            self._packet[:] = data
+        if metrics is not None:
+            start = perf_counter()
+            metrics.observe(ENCODE, start - now)
+
+        self.serial.break_condition = True
+        _spin(self.breakTime)
+        self.serial.break_condition = False
+        _spin(self.markTime)
         if operatingsystem == OS.LINUX:
-            fcntl.ioctl(self.desc, 0x5427)
-            sleep(0.0001)
-            fcntl.ioctl(self.desc, 0x5428)
+            # pySerial retries a non-blocking write in a loop while the buffer is full,
+            # writing to the non-blocking descriptor directly fails instead and saves the copy into bytes
+            try:
+                written = os.write(self.serial.fd, self._packet)
+            except BlockingIOError:
+                self.skippedFrames += 1
+                if metrics is not None:
+                    metrics.dropped(self.metricsLabel)
+                return
         else:
-            self.serial.send_break(0.0001)
-        self.serial.write(b"\x00")
-        self.serial.write(self._dmxdata)
-        self.serial.flush()
+            written = self.serial.write(self._packet)
+
+        now = perf_counter()
+        written = written or 0
+        # The bytes taken by the driver are transmitted either way and occupy the line
+        self._lineFree = now + written * SLOT_TIME
+        if written < len(self._packet):
+            # The driver buffer was full, the rest of the frame is lost and receivers see a shortened frame
+            self.skippedFrames += 1
+            if metrics is not None:
+                metrics.dropped(self.metricsLabel)
+            return
+        if metrics is not None:
+            metrics.observe(SEND, now - start)
+            metrics.sent(self.metricsLabel, written)
+        self.framesWritten += 1
+        self._windowFrames += 1
+        if now - self._windowStart >= 1.0:
+            self.achievedFramerate = self._windowFrames / (now - self._windowStart)
+            self._windowStart = now
+            self._windowFrames = 0
+
+    def close(self):
+        super().close()
+        self.serial.close()
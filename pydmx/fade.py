@@ -0,0 +1,261 @@
+"""
+Fades and chases advanced once per frame
+
+All running fades are kept in NumPy arrays (struct of arrays): start and end value, start time, duration and
+easing curve per fade. Every tick computes the values of all fades at once, splits them into coarse/fine/finer
+bytes and scatters them into the frames with one assignment per frame.
+Easing curves are precomputed lookup tables, evaluating a curve is a gather and a linear interpolation.
+"""
+
+from threading import Lock
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pydmx.fixture.slotmap import SlotMap
+
+# Resolution of the easing lookup tables
+CURVE_STEPS = 4096
+
+_progress = np.linspace(0.0, 1.0, CURVE_STEPS)
+# name: eased progress, indexed by the row in _curves
+CURVES: Dict[str, np.ndarray] = {
+    "linear": _progress,
+    "easeIn": _progress**2,
+    "easeOut": 1 - (1 - _progress) ** 2,
+    "easeInOut": (1 - np.cos(np.pi * _progress)) / 2,
+    "snap": (_progress >= 1.0).astype(np.float64),
+}
+_curveIndex = {name: index for index, name in enumerate(CURVES)}
+_curves = np.stack(list(CURVES.values()))
+
+_fields = ("frame", "key", "start", "end", "began", "duration", "curve", "resolution")
+
+
+class FadeEngine:
+    """
+    Running many fades of slot map attributes together
+    """
+
+    """
+    New fades are collected in lists and merged into the arrays on the next tick. A fade replaces a running fade
+    of the same attribute. Finished fades write their end value once more and are removed, chases which don't loop
+    are removed once their last step started.
+    The arrays are kept sorted by frame, every tick writes the bytes of a frame with a single scatter.
+
+    The engine is attached to whatever renders the frames:
+      controller.renderers.append(engine.tick) or multiverse.renderers.append(engine.tick)
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._pending: Dict[str, list] = {field: [] for field in _fields}
+        self._pendingSlots: List[Tuple[int, int, int]] = []
+        self._fades: Dict[str, np.ndarray] = {}
+        self._slots = np.empty((0, 3), dtype=np.intp)
+        # id of a frame: small serial number used in the arrays
+        self._serials: Dict[int, int] = {}
+        self._nextSerial = 0
+        # serial: (frame, writable view on its back buffer)
+        self._frames: Dict[int, tuple] = {}
+        # Per byte write: source fade, shift and slot, plus the boundaries of each frame
+        self._writeFade = self._writeShift = self._writeSlot = np.empty(0, dtype=np.intp)
+        self._writeFrames: List[Tuple[np.ndarray, int, int]] = []
+        self.chases: List["Chase"] = []
+        self._clear()
+
+    def _clear(self):
+        self._fades = {field: np.empty(0, dtype=np.float64 if field in ("began", "duration") else np.int64) for field in _fields}
+        self._slots = np.empty((0, 3), dtype=np.intp)
+        self._writeFrames = []
+
+    def __len__(self) -> int:
+        return len(self._fades["key"]) + len(self._pending["key"])
+
+    def fade(
+        self,
+        slotmap: SlotMap,
+        attribute: str,
+        target: int,
+        duration: float,
+        curve: str = "linear",
+        start: Optional[int] = None,
+        began: Optional[float] = None,
+    ):
+        """
+        Fading an attribute from its current value (or start) to target in its patched resolution.
+        16 and 24 bit attributes are faded over their full resolution.
+        """
+        if curve not in _curveIndex:
+            raise KeyError(f"Unknown curve {curve}, available are {', '.join(CURVES)}.")
+        slots = slotmap.slots(attribute)
+        frame = slotmap.frame
+        with self._lock:
+            serial = self._serials.get(id(frame))
+            if serial is None:
+                serial = self._serials[id(frame)] = self._nextSerial
+                self._nextSerial += 1
+                self._frames[serial] = (frame, np.frombuffer(frame.back, dtype=np.uint8))
+            pending = self._pending
+            pending["frame"].append(serial)
+            # The coarse slot identifies the attribute within the frame
+            pending["key"].append(slots[0])
+            pending["start"].append(slotmap.get(attribute) if start is None else start)
+            pending["end"].append(min(max(target, 0), slotmap.maximum(attribute)))
+            pending["began"].append(perf_counter() if began is None else began)
+            pending["duration"].append(duration)
+            pending["curve"].append(_curveIndex[curve])
+            pending["resolution"].append(len(slots))
+            self._pendingSlots.append(tuple(slots + [-1] * (3 - len(slots))))
+
+    def fadeNormalized(self, slotmap: SlotMap, attribute: str, target: float, duration: float, curve: str = "linear"):
+        """Same as fade, with a target between 0.0 and 1.0"""
+        self.fade(slotmap, attribute, round(target * slotmap.maximum(attribute)), duration, curve)
+
+    def fadeAll(self, slotmaps: Iterable[SlotMap], attribute: str, target: int, duration: float, curve: str = "linear"):
+        """Fading the attribute of every slot map which has it"""
+        began = perf_counter()
+        for slotmap in slotmaps:
+            if attribute in slotmap:
+                self.fade(slotmap, attribute, target, duration, curve, began=began)
+
+    def cancel(self):
+        """Stopping all fades and chases, the slots keep their current values"""
+        with self._lock:
+            for values in self._pending.values():
+                values.clear()
+            self._pendingSlots.clear()
+            self._serials.clear()
+            self._frames.clear()
+            self._clear()
+            self.chases.clear()
+
+    def addChase(self, chase: "Chase") -> "Chase":
+        chase.began = None
+        self.chases.append(chase)
+        return chase
+
+    def removeChase(self, chase: "Chase"):
+        self.chases.remove(chase)
+
+    def _merge(self):
+        """Moving the pending fades into the arrays, dropping replaced fades and sorting by frame"""
+        fades = self._fades
+        for field, values in self._pending.items():
+            fades[field] = np.concatenate((fades[field], np.array(values, dtype=fades[field].dtype)))
+            values.clear()
+        self._slots = np.concatenate((self._slots, np.array(self._pendingSlots, dtype=np.intp).reshape(-1, 3)))
+        self._pendingSlots.clear()
+
+        # Only the latest fade per (frame, attribute) survives
+        identity = (fades["frame"] << 16 | fades["key"])[::-1]
+        _, latest = np.unique(identity, return_index=True)
+        keep = np.sort(len(identity) - 1 - latest)
+        self._select(keep[np.argsort(fades["frame"][keep], kind="stable")])
+
+    def _select(self, keep: np.ndarray):
+        """Keeping only the given fades (in the given order) and recomputing the byte writes"""
+        fades = self._fades
+        for field in _fields:
+            fades[field] = fades[field][keep]
+        self._slots = self._slots[keep]
+
+        resolution = fades["resolution"]
+        valid = self._slots >= 0
+        fade, level = np.nonzero(valid)
+        self._writeFade = fade
+        self._writeSlot = self._slots[fade, level]
+        self._writeShift = 8 * (resolution[fade] - 1 - level)
+
+        frameIds = fades["frame"][fade]
+        bounds = np.flatnonzero(np.diff(frameIds)) + 1
+        starts = np.concatenate(([0], bounds)) if len(frameIds) else np.empty(0, dtype=np.intp)
+        ends = np.concatenate((bounds, [len(frameIds)])) if len(frameIds) else np.empty(0, dtype=np.intp)
+        self._writeFrames = [(self._frames[frameIds[a]][1], a, b) for a, b in zip(starts, ends)]
+        # Frames without fades are forgotten
+        used = set(np.unique(fades["frame"]).tolist())
+        self._frames = {serial: value for serial, value in self._frames.items() if serial in used}
+        self._serials = {id(frame): serial for serial, (frame, _) in self._frames.items()}
+
+    def tick(self, now: Optional[float] = None):
+        """Advancing all chases and fades to now and writing them into the frames"""
+        if now is None:
+            now = perf_counter()
+        for chase in self.chases:
+            chase.advance(self, now)
+        if any(chase.finished for chase in self.chases):
+            self.chases = [chase for chase in self.chases if not chase.finished]
+
+        with self._lock:
+            if self._pending["key"]:
+                self._merge()
+            fades = self._fades
+            if not len(fades["key"]):
+                return
+
+            duration = fades["duration"]
+            progress = np.divide(now - fades["began"], duration, out=np.ones_like(duration), where=duration > 0)
+            np.clip(progress, 0.0, 1.0, out=progress)
+            # Interpolating between the table entries, 16 and 24 bit fades would step visibly otherwise
+            position = progress * (CURVE_STEPS - 1)
+            index = np.minimum(position.astype(np.intp), CURVE_STEPS - 2)
+            curve = fades["curve"]
+            low = _curves[curve, index]
+            eased = low + (_curves[curve, index + 1] - low) * (position - index)
+            start = fades["start"]
+            values = np.rint(start + (fades["end"] - start) * eased).astype(np.int64)
+
+            data = ((values[self._writeFade] >> self._writeShift) & 0xFF).astype(np.uint8)
+            slots = self._writeSlot
+            for buffer, a, b in self._writeFrames:
+                buffer[slots[a:b]] = data[a:b]
+
+            finished = progress >= 1.0
+            if finished.any():
+                self._select(np.flatnonzero(~finished))
+
+
+class Chase:
+    """
+    Timed sequence of steps, each step fades a set of attributes to their values
+    """
+
+    def __init__(
+        self,
+        steps: Sequence[Sequence[Tuple[SlotMap, str, int]]],
+        stepTime: float,
+        fadeTime: float = 0.0,
+        curve: str = "linear",
+        loop: bool = True,
+    ):
+        if stepTime <= 0:
+            raise ValueError("The step time of a chase has to be greater than 0.")
+        self.steps = [list(step) for step in steps]
+        self.stepTime = stepTime
+        self.fadeTime = fadeTime
+        self.curve = curve
+        self.loop = loop
+        # Time the chase was started, set on its first tick
+        self.began: Optional[float] = None
+        self.step = -1
+
+    @property
+    def finished(self) -> bool:
+        return not self.loop and self.step >= len(self.steps) - 1
+
+    def advance(self, engine: FadeEngine, now: float):
+        """Starting the fades of the step which is due at now, steps missed in between are skipped"""
+        if not self.steps:
+            return
+        if self.began is None:
+            self.began = now
+        step = int((now - self.began) // self.stepTime)
+        if not self.loop:
+            step = min(step, len(self.steps) - 1)
+        if step == self.step:
+            return
+        self.step = step
+        began = self.began + step * self.stepTime
+        for slotmap, attribute, value in self.steps[step % len(self.steps)]:
+            engine.fade(slotmap, attribute, value, self.fadeTime, self.curve, began=began)
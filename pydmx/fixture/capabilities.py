@@ -0,0 +1,210 @@
+"""
+Lookup tables between DMX values and the capabilities of a channel
+
+A channel lists its capabilities with the dmxRange they apply to. Instead of scanning that list for every value,
+a CapabilityResolver compiles it once per patched resolution: 8 bit channels get a 256 entry table with the
+capability and the position within its range for every value, 16 and 24 bit channels bisect the sorted ranges.
+The other direction, from a semantic request like ShutterStrobe / shutterEffect=Strobe / speed=fast to a DMX value,
+is resolved once and then cached per request.
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from pydmx.openfixturelibrary.channelSchema import ChannelSchema
+
+_resolutions = {"8bit": 1, "16bit": 2, "24bit": 3}
+
+# Marks values without a capability in the lookup tables
+NOCAPABILITY = 0xFFFF
+
+# Entity values of the OFL like "10Hz", "-50%", "530deg", "3200K" or "1.5s"
+_entity = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*([a-zA-Z%]*)\s*$")
+
+
+def _channelResolution(channel: ChannelSchema) -> int:
+    """Resolution in bytes the values of a channel (defaultValue, dmxRange, ...) are given in"""
+    if channel.dmxValueResolution is not None:
+        resolution = channel.dmxValueResolution
+        return _resolutions[getattr(resolution, "value", resolution)]
+    return 1 + len(channel.fineChannelAliases or ())
+
+
+def _scale(value: int, channel: ChannelSchema, resolution: int) -> int:
+    """
+    Scaling a value given in the channel's dmxValueResolution to the resolution it is patched with.
+    Widening only shifts, so the added fine bytes are 0 (0x7F becomes 0x7F00, not 0x7F7F).
+    """
+    shift = 8 * (_channelResolution(channel) - resolution)
+    return value >> shift if shift >= 0 else value << -shift
+
+
+def _text(value) -> str:
+    """Comparable text of a capability property (enums by their value)"""
+    return str(getattr(value, "value", value)).lower()
+
+
+def _number(value) -> Optional[Tuple[float, str]]:
+    match = _entity.match(str(value)) if value is not None else None
+    return (float(match.group(1)), match.group(2).lower()) if match else None
+
+
+def capabilities(channel: ChannelSchema) -> list:
+    return list(channel.capabilities or ([channel.capability] if channel.capability else []))
+
+
+class CapabilityResolver:
+    """
+    Compiled capabilities of a channel patched with a resolution (1, 2 or 3 bytes)
+    """
+
+    def __init__(self, channel: ChannelSchema, resolution: int = 1):
+        self.channel = channel
+        self.resolution = resolution
+        self.maximum = (1 << (8 * resolution)) - 1
+        self.capabilities = capabilities(channel)
+
+        # (low, high, capability number) in the patched resolution, sorted by low
+        ranges = []
+        for number, capability in enumerate(self.capabilities):
+            dmxRange = getattr(capability, "dmxRange", None)
+            if dmxRange is None:
+                # A single capability without a range covers the whole channel
+                low, high = 0, self.maximum
+            else:
+                low = _scale(dmxRange[0], channel, resolution)
+                high = _scale(dmxRange[1], channel, resolution)
+                if resolution > _channelResolution(channel):
+                    high |= (1 << (8 * (resolution - _channelResolution(channel)))) - 1
+            ranges.append((low, min(high, self.maximum), number))
+        ranges.sort()
+        self._lows = [low for low, _, _ in ranges]
+        self._highs = [high for _, high, _ in ranges]
+        self._numbers = [number for _, _, number in ranges]
+        # request: DMX value
+        self._requests: Dict[tuple, Optional[int]] = {}
+
+        self._table = None
+        if resolution == 1:
+            self._table = array("H", [NOCAPABILITY] * 256)
+            self._fractions = array("d", [0.0] * 256)
+            for low, high, number in ranges:
+                span = high - low
+                for value in range(low, high + 1):
+                    self._table[value] = number
+                    self._fractions[value] = (value - low) / span if span else 0.0
+
+    @property
+    def dmxRange(self) -> Tuple[int, int]:
+        """Lowest and highest value covered by any capability"""
+        return self._lows[0], max(self._highs)
+
+    def index(self, value: int) -> int:
+        """Number of the capability a value falls into, -1 if none"""
+        if self._table is not None:
+            number = self._table[value]
+            return -1 if number == NOCAPABILITY else number
+        position = bisect_right(self._lows, value) - 1
+        if position < 0 or value > self._highs[position]:
+            return -1
+        return self._numbers[position]
+
+    def resolve(self, value: int) -> Optional[Tuple[object, float]]:
+        """
+        Capability a value falls into and the position of the value within its range (0.0 at the start, 1.0 at the end),
+        None if no capability covers the value.
+        """
+        if self._table is not None:
+            number = self._table[value]
+            if number == NOCAPABILITY:
+                return None
+            return self.capabilities[number], self._fractions[value]
+        position = bisect_right(self._lows, value) - 1
+        if position < 0 or value > self._highs[position]:
+            return None
+        low, high = self._lows[position], self._highs[position]
+        return self.capabilities[self._numbers[position]], (value - low) / (high - low) if high > low else 0.0
+
+    def range(self, number: int) -> Tuple[int, int]:
+        """DMX range of a capability in the patched resolution"""
+        position = self._numbers.index(number)
+        return self._lows[position], self._highs[position]
+
+    def parameter(self, capability, name: str, fraction: float):
+        """
+        Value of a ranged property (e.g. speed from speedStart to speedEnd) at a position within the range.
+        Numbers with the same unit are interpolated, keywords are returned from the nearer end.
+        """
+        fixed = getattr(capability, name, None)
+        if fixed is not None:
+            return fixed
+        start, end = getattr(capability, name + "Start", None), getattr(capability, name + "End", None)
+        startNumber, endNumber = _number(start), _number(end)
+        if startNumber and endNumber and startNumber[1] == endNumber[1]:
+            value = startNumber[0] + (endNumber[0] - startNumber[0]) * fraction
+            return f"{value:g}{startNumber[1]}"
+        return start if fraction < 0.5 else end
+
+    def _match(self, capability, criteria: Dict[str, object]) -> Optional[float]:
+        """Position within the range of a capability matching all criteria, None if it doesn't match"""
+        fraction = None
+        for name, wanted in criteria.items():
+            text = _text(wanted)
+            fixed = getattr(capability, name, None)
+            if fixed is not None:
+                if _text(fixed) != text:
+                    return None
+                continue
+            start, end = getattr(capability, name + "Start", None), getattr(capability, name + "End", None)
+            if start is None and end is None:
+                return None
+            if start is not None and _text(start) == text:
+                fraction = 0.0
+            elif end is not None and _text(end) == text:
+                fraction = 1.0
+            else:
+                number, startNumber, endNumber = _number(wanted), _number(start), _number(end)
+                if not (number and startNumber and endNumber and number[1] == startNumber[1] == endNumber[1]):
+                    return None
+                span = endNumber[0] - startNumber[0]
+                fraction = (number[0] - startNumber[0]) / span if span else 0.0
+                if not 0.0 <= fraction <= 1.0:
+                    return None
+        return 0.5 if fraction is None else fraction
+
+    def value(self, type: Optional[str] = None, fraction: Optional[float] = None, **criteria) -> Optional[int]:
+        """
+        DMX value of the first capability of a type matching the criteria, None if there is none.
+        Criteria are capability properties, ranged ones (speed, angle, ...) match their start, end
+        or a number in between:
+          resolver.value("ShutterStrobe", shutterEffect="Strobe", speed="fast")
+        The value lies at fraction within the capability's range, by default where the criteria matched or the middle.
+        """
+        request = (type, fraction, tuple(sorted((name, _text(wanted)) for name, wanted in criteria.items())))
+        if request in self._requests:
+            return self._requests[request]
+
+        result = None
+        for position, number in enumerate(self._numbers):
+            capability = self.capabilities[number]
+            if type is not None and _text(getattr(capability, "type", None)) != type.lower():
+                continue
+            matched = self._match(capability, criteria)
+            if matched is None:
+                continue
+            low, high = self._lows[position], self._highs[position]
+            result = low + round((matched if fraction is None else fraction) * (high - low))
+            break
+        self._requests[request] = result
+        return result
+
+    def find(self, type: Optional[str] = None, **criteria) -> List[object]:
+        """All capabilities of a type matching the criteria, in DMX order"""
+        return [
+            self.capabilities[number]
+            for number in self._numbers
+            if (type is None or _text(getattr(self.capabilities[number], "type", None)) == type.lower())
+            and self._match(self.capabilities[number], criteria) is not None
+        ]
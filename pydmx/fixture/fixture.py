@@ -3,9 +3,12 @@ A partial Implementation of the Fixture Schema from: https://github.com/OpenLigh
 Schema Version: 12.2.1
 """
 
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
-from pydmx.fixture.fixtureIndex.fixtureindex import FixtureIndex
+from pydmx.fixture.slotmap import SlotMap
+from pydmx.fixtureIndex.fixtureIndex import FixtureIndex
+from pydmx.frame import DMXFrame
+from pydmx.openfixturelibrary.fixtureSchema import FixtureCategories
 
 
 class Fixture:
@@ -15,23 +18,40 @@ class Fixture:
         # TODO enable path import
         # Linking to Fixture Index
         self.__fixtureIndex = FixtureIndex.getInstance()
-        # Importing fixture data from Index
-        fixtDict = self.__fixtureIndex.lookupFixture(fixtureName)
+        # Importing the fixture from the Index, already converted into the schema dataclasses
+        fixtDict = self.__fixtureIndex.lookupFixtureSchema(fixtureName, Fixture.__fixtureSchemaVersion)
+        if fixtDict is None:
+            raise KeyError(f"The fixture {fixtureName} doesn't exist.")
+        self.alias = alias
 
         # ~~~~~~~~~~~~~~~~~
         # Schema Attributes
         # ~~~~~~~~~~~~~~~~~
-        # IGNORED ATTRIBUTES: meta, comment, links, helpWanted, rdm, physical, matrix, wheels
+        # IGNORED ATTRIBUTES: meta, comment, links, helpWanted, rdm, physical, wheels
         # name: unique in manufacturer
         self.name: str = fixtDict.name
         # shortName: unique in OpenFixtureLibrary
         self.shortName: str = fixtDict.shortName
         # categories:
         self.categories: List[FixtureCategories] = fixtDict.categories
-        # matrix
+        # Pixel layout of matrix fixtures
+        self.matrix = fixtDict.matrix
         # wheels
         # List of all the available Channels with their settings for the fixture
-        self.availableChannels
+        self.availableChannels = fixtDict.availableChannels
+        # Channels which are repeated for every pixel of a matrix
+        self.templateChannels = fixtDict.templateChannels
+        # Selectable modes with their channel order
+        self.modes = fixtDict.modes
+
+    def compile(self, mode: Union[str, int], address: int, frame: DMXFrame = None) -> SlotMap:
+        """Compiling the fixture patched in a mode at a start address into a flat slot map"""
+        return SlotMap(self, mode, address, frame)
+
+    @classmethod
+    def getSchemaVersion(cls) -> str:
+        """The OFL schema version the Fixture is implemented for"""
+        return cls.__fixtureSchemaVersion
 
     def lookupFixtureName(self, fixtureName: str, *args, **kwargs) -> Tuple[str, str]:
         return ("", "")
@@ -0,0 +1,102 @@
+"""
+Vectorized attribute setting for groups of fixtures
+
+Setting the same attribute on hundreds of fixtures one SlotMap.set call at a time costs one Python call per fixture.
+A FixtureGroup precomputes, per attribute, NumPy arrays with the slots of all members and scatters a whole
+array of values into the universe buffers with one vectorized assignment per universe.
+"""
+
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+
+from pydmx.fixture.slotmap import SlotMap
+
+
+class Scatter:
+    """
+    Slots of one frame and the positions of their bytes in a flattened array, written with one assignment.
+    Used for the members of a FixtureGroup in the frame and by the PixelMapper.
+    """
+
+    def __init__(self, frame, slots: List[int], sources: List[int]):
+        # Writable view on the back buffer of the frame
+        self.buffer = np.frombuffer(frame.back, dtype=np.uint8)
+        # Every slot and the position of its byte in the flattened byte planes
+        self.slots = np.array(slots, dtype=np.intp)
+        self.sources = np.array(sources, dtype=np.intp)
+
+    def scatter(self, planes: np.ndarray):
+        self.buffer[self.slots] = planes[self.sources]
+
+
+class _Attribute:
+    """Precomputed slots and DMX ranges of one attribute over the whole group"""
+
+    def __init__(self, members: List[SlotMap], attribute: str):
+        count = len(members)
+        resolutions = [slotmap.resolution(attribute) for slotmap in members if attribute in slotmap]
+        self.resolution = max(resolutions, default=1)
+        # Byte planes are computed for the highest resolution, coarse plane first
+        self.shifts = np.array([[8 * level] for level in reversed(range(self.resolution))], dtype=np.int64)
+        self.low = np.zeros(count, dtype=np.int64)
+        self.high = np.zeros(count, dtype=np.int64)
+        self.maximum = np.zeros(count, dtype=np.int64)
+
+        # frame id: (frame, slots, sources)
+        frames = {}
+        for position, slotmap in enumerate(members):
+            if attribute not in slotmap:
+                continue
+            resolution = slotmap.resolution(attribute)
+            self.low[position], self.high[position] = slotmap.dmxRange(attribute)
+            self.maximum[position] = slotmap.maximum(attribute)
+            _, slots, sources = frames.setdefault(id(slotmap.frame), (slotmap.frame, [], []))
+            # A member with a lower resolution uses the lowest planes of its value
+            for level, slot in enumerate(slotmap.slots(attribute)):
+                slots.append(slot)
+                sources.append((self.resolution - resolution + level) * count + position)
+        self.scatters = [Scatter(frame, slots, sources) for frame, slots, sources in frames.values()]
+
+    def scatter(self, values: np.ndarray):
+        # Clamping all members at once, members without the attribute are never scattered
+        values = np.clip(np.broadcast_to(values, self.low.shape), self.low, self.high)
+        planes = ((values >> self.shifts) & 0xFF).astype(np.uint8).ravel()
+        for scatter in self.scatters:
+            scatter.scatter(planes)
+
+
+class FixtureGroup:
+    """
+    Group of patched fixtures whose attributes are set with one vectorized operation
+    """
+
+    def __init__(self, slotmaps: Iterable[SlotMap]):
+        self.members: List[SlotMap] = list(slotmaps)
+        # attribute: precomputed slots and ranges
+        self._attributes: Dict[str, _Attribute] = {}
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def _compile(self, attribute: str) -> _Attribute:
+        compiled = self._attributes[attribute] = _Attribute(self.members, attribute)
+        return compiled
+
+    def set(self, attribute: str, values: Union[int, np.ndarray]):
+        """
+        Setting an attribute on all members which have it.
+        values is a single value for all members or an array with one value per member (in group order),
+        given in the patched resolution and clamped to the DMX range of the capabilities.
+        """
+        compiled = self._attributes.get(attribute) or self._compile(attribute)
+        compiled.scatter(np.asarray(values, dtype=np.int64))
+
+    def setNormalized(self, attribute: str, values: Union[float, np.ndarray]):
+        """Same as set, with values between 0.0 and 1.0 scaled to the resolution of each member"""
+        compiled = self._attributes.get(attribute) or self._compile(attribute)
+        compiled.scatter(np.rint(np.asarray(values, dtype=np.float64) * compiled.maximum).astype(np.int64))
+
+    def invalidate(self):
+        """Dropping the precomputed slots, e.g. after members were repatched"""
+        self._attributes.clear()
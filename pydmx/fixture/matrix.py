@@ -0,0 +1,190 @@
+"""
+Pixels of matrix fixtures and the expansion of their template channels
+
+Matrix fixtures (pixel bars, LED panels, ...) define the channels of a pixel once as template channels
+("Red $pixelKey") and insert them into a mode with a MatrixChannels entry, repeated for pixels or pixel groups
+in the order given by repeatFor and channelOrder. Modes may also reference a template channel of a single pixel
+or group directly ("Red Master"). expandMode resolves all of this once at patch time into concrete channel
+names and definitions, so a SlotMap compiles a matrix mode like any other mode.
+"""
+
+import re
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple, Union
+
+from pydmx.openfixturelibrary.channelSchema import ChannelSchema
+from pydmx.openfixturelibrary.fixtureSchema import ChannelOrder, MatrixSchema, RepeatFor
+
+# Placeholder for the pixel or group key in the names of template channels
+PIXELKEY = "$pixelKey"
+
+# Position constraints of pixel groups: "<=8", ">=9", "=1", "even", "odd", "3n", "3n+1"
+_constraint = re.compile(r"^(?:(<=|>=|=)(\d+)|(even|odd)|(\d+)n(?:\+(\d+))?)$")
+_digits = re.compile(r"(\d+)")
+
+
+def _naturalKey(key: str) -> list:
+    """Sort key ordering numbers in pixel keys by their value ("2" before "10")"""
+    return [int(part) if part.isdigit() else part.lower() for part in _digits.split(key)]
+
+
+def _defaultKey(position: Tuple[int, int, int], counts: Tuple[int, int, int]) -> str:
+    """Pixel key the OFL generates for a position of a pixelCount matrix: "3" in one, "(3, 1)" in more dimensions"""
+    used = [coordinate for coordinate, count in zip(position, counts) if count > 1]
+    if len(used) <= 1:
+        return str(used[0] if used else 1)
+    return "(" + ", ".join(map(str, used)) + ")"
+
+
+def _fulfills(coordinate: int, constraint: str) -> bool:
+    match = _constraint.match(constraint.replace(" ", ""))
+    if match is None:
+        raise ValueError(f"Unknown pixel group constraint {constraint!r}.")
+    operator, number, parity, modulus, offset = match.groups()
+    if operator == "<=":
+        return coordinate <= int(number)
+    if operator == ">=":
+        return coordinate >= int(number)
+    if operator == "=":
+        return coordinate == int(number)
+    if parity is not None:
+        return coordinate % 2 == (0 if parity == "even" else 1)
+    return coordinate % int(modulus) == int(offset or 0) % int(modulus)
+
+
+def _component(template: str) -> str:
+    """Name of a template channel without the pixel key, e.g. "Red" for "Red $pixelKey" """
+    return " ".join(template.replace(PIXELKEY, " ").split())
+
+
+class Matrix:
+    """
+    Pixels and pixel groups of a matrix fixture
+    """
+
+    def __init__(self, schema: MatrixSchema):
+        # pixel key: (x, y, z) position, 1 based
+        self.pixels: Dict[str, Tuple[int, int, int]] = {}
+        if schema.pixelCount:
+            counts = tuple((list(schema.pixelCount) + [1, 1, 1])[:3])
+            for z in range(1, counts[2] + 1):
+                for y in range(1, counts[1] + 1):
+                    for x in range(1, counts[0] + 1):
+                        self.pixels[_defaultKey((x, y, z), counts)] = (x, y, z)
+        else:
+            for z, plane in enumerate(schema.pixelKeys or (), start=1):
+                for y, row in enumerate(plane, start=1):
+                    for x, key in enumerate(row, start=1):
+                        if key is not None:
+                            self.pixels[key] = (x, y, z)
+        # group key: pixel keys
+        self.groups: Dict[str, List[str]] = {
+            name: self._group(definition) for name, definition in (schema.pixelGroups or {}).items()
+        }
+
+    def _group(self, definition: Union[str, List[str], Dict[str, List[str]]]) -> List[str]:
+        if definition == "all":
+            return list(self.pixels)
+        if isinstance(definition, list):
+            return list(definition)
+        keys = []
+        for key, position in self.pixels.items():
+            if all(
+                _fulfills(coordinate, constraint)
+                for axis, coordinate in zip("xyz", position)
+                for constraint in definition.get(axis, ())
+            ) and all(re.search(pattern, key) for pattern in definition.get("name", ())):
+                keys.append(key)
+        return keys
+
+    def keys(self, repeatFor: Union[RepeatFor, str, List[str]]) -> List[str]:
+        """Pixel or group keys a matrix channel insertion is repeated for, in DMX order"""
+        if isinstance(repeatFor, list):
+            return list(repeatFor)
+        order = getattr(repeatFor, "value", repeatFor)
+        if order == RepeatFor.EACHPIXELGROUP.value:
+            return list(self.groups)
+        if order == RepeatFor.EACHPIXELABC.value:
+            return sorted(self.pixels, key=_naturalKey)
+        # eachPixelXYZ: X changes fastest, then Y, then Z
+        significance = ["xyz".index(axis) for axis in reversed(order[len("eachPixel") :].lower())]
+        return sorted(self.pixels, key=lambda key: [self.pixels[key][axis] for axis in significance])
+
+    def position(self, key: str) -> Tuple[float, float, float]:
+        """Position of a pixel, the centre of its pixels for a pixel group"""
+        if key in self.pixels:
+            return self.pixels[key]
+        members = [self.pixels[member] for member in self.groups[key] if member in self.pixels]
+        if not members:
+            raise KeyError(f"The pixel group {key} has no pixels.")
+        return tuple(sum(axis) / len(members) for axis in zip(*members))
+
+
+def expandMode(
+    fixture, mode, matrix: Optional[Matrix] = None
+) -> Tuple[Dict[str, ChannelSchema], List[Optional[str]], Dict[str, Tuple[str, str]]]:
+    """
+    Resolving the template channels used by a mode.
+    Returns the channel definitions including the expanded template channels, the flat channel list of the mode
+    and the expanded channels belonging to a pixel or group: channel name: (pixel key, component).
+    """
+    channels: Dict[str, ChannelSchema] = dict(fixture.availableChannels or {})
+    templates: Dict[str, ChannelSchema] = dict(getattr(fixture, "templateChannels", None) or {})
+    if not templates:
+        if any(entry is not None and not isinstance(entry, str) for entry in mode.channels):
+            raise ValueError(f"The mode {mode.name} inserts matrix channels, but the fixture has no template channels.")
+        return channels, list(mode.channels), {}
+
+    # fine alias template: coarse template
+    coarseTemplates = {
+        alias: name for name, template in templates.items() for alias in template.fineChannelAliases or ()
+    }
+    pixelChannels: Dict[str, Tuple[str, str]] = {}
+
+    def expand(template: str, key: str) -> str:
+        name = template.replace(PIXELKEY, key)
+        coarse = coarseTemplates.get(template, template)
+        coarseName = coarse.replace(PIXELKEY, key)
+        # Switching channels aren't defined as templates, they stay attributes without a definition
+        if coarseName not in channels and coarse in templates:
+            channel = templates[coarse]
+            channels[coarseName] = replace(
+                channel,
+                name=channel.name.replace(PIXELKEY, key) if channel.name else None,
+                fineChannelAliases=[alias.replace(PIXELKEY, key) for alias in channel.fineChannelAliases]
+                if channel.fineChannelAliases
+                else None,
+            )
+            pixelChannels[coarseName] = (key, _component(coarse))
+        return name
+
+    # expanded name: (template, key) of the direct references, built on first use
+    references: Optional[Dict[str, Tuple[str, str]]] = None
+
+    def resolve(name: str) -> str:
+        nonlocal references
+        if references is None:
+            keys = list(matrix.pixels) + list(matrix.groups) if matrix else []
+            references = {
+                template.replace(PIXELKEY, key): (template, key)
+                for template in list(templates) + list(coarseTemplates)
+                for key in keys
+            }
+        if name not in references:
+            return name
+        return expand(*references[name])
+
+    flat: List[Optional[str]] = []
+    for entry in mode.channels:
+        if entry is None or isinstance(entry, str):
+            flat.append(entry if entry is None or entry in channels else resolve(entry))
+            continue
+        if matrix is None:
+            raise ValueError(f"The mode {mode.name} inserts matrix channels, but the fixture has no matrix.")
+        keys = matrix.keys(entry.repeatFor)
+        if getattr(entry.channelOrder, "value", entry.channelOrder) == ChannelOrder.PERPIXEL.value:
+            order = [(template, key) for key in keys for template in entry.templateChannels]
+        else:
+            order = [(template, key) for template in entry.templateChannels for key in keys]
+        flat.extend(None if template is None else expand(template, key) for template, key in order)
+    return channels, flat, pixelChannels
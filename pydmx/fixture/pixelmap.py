@@ -0,0 +1,103 @@
+"""
+Pixel mapping of images onto patched matrix fixtures
+
+Every mapped pixel of a fixture gets a position in the image. The slots of all pixel components (Red, Green, Blue, ...)
+and the positions of their values in the flattened image are compiled into one gather per universe frame,
+so rendering an image is one vectorized assignment per universe, independent of the number of pixels.
+The channel order of the fixture mode (perPixel or perChannel) is already resolved in the slots of its SlotMap.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pydmx.fixture.group import Scatter
+from pydmx.fixture.slotmap import SlotMap
+
+
+class PixelMapper:
+    """
+    Writing images into the pixels of matrix fixtures patched in any number of universes
+    """
+
+    """
+    The image channels are mapped to the pixel components in the order of components, components a fixture
+    doesn't have are skipped. Components patched with 16 or 24 bit get the 8 bit value in all their slots
+    (0xAB -> 0xABAB), which scales it exactly to their full range.
+    """
+
+    def __init__(self, width: int, height: int, components: Sequence[str] = ("Red", "Green", "Blue")):
+        self.width = width
+        self.height = height
+        # Pixel component of every image channel
+        self.components: List[str] = list(components)
+        self.pixelCount = 0
+        # frame id: (frame, slots, image pixels, image channels)
+        self._frames: Dict[int, Tuple[object, List[int], List[int], List[int]]] = {}
+        # Gathers compiled for the number of channels of the rendered images
+        self._scatters: Optional[List[Scatter]] = None
+        self._stride = 0
+
+    def addFixture(self, slotmap: SlotMap, x: int = 0, y: int = 0, positions: Optional[Dict[str, Tuple[int, int]]] = None) -> int:
+        """
+        Mapping the pixels of a patched matrix fixture into the image, its pixel (1, 1) at the image position (x, y).
+        Pixels are placed by their matrix position, pixel groups at the centre of their pixels.
+        positions maps pixel keys to image positions relative to (x, y) instead, e.g. for bars mounted vertically,
+        pixels missing in positions aren't mapped.
+        Returns the number of mapped pixels.
+        """
+        if not slotmap.pixels:
+            raise ValueError(f"The fixture {slotmap.fixture.name} has no pixels in the mode {slotmap.mode.name}.")
+        _, slots, pixels, channels = self._frames.setdefault(id(slotmap.frame), (slotmap.frame, [], [], []))
+        mapped = 0
+        for key, components in slotmap.pixels.items():
+            if positions is not None:
+                if key not in positions:
+                    continue
+                pixelX, pixelY = positions[key]
+            else:
+                position = slotmap.matrix.position(key)
+                pixelX, pixelY = round(position[0]) - 1, round(position[1]) - 1
+            pixelX += x
+            pixelY += y
+            if not (0 <= pixelX < self.width and 0 <= pixelY < self.height):
+                raise ValueError(f"The pixel {key} of {slotmap.fixture.name} lies outside of the image at {(pixelX, pixelY)}.")
+            for channel, component in enumerate(self.components):
+                attribute = components.get(component)
+                if attribute is None:
+                    continue
+                for slot in slotmap.slots(attribute):
+                    slots.append(slot)
+                    pixels.append(pixelY * self.width + pixelX)
+                    channels.append(channel)
+            mapped += 1
+        self.pixelCount += mapped
+        self._scatters = None
+        return mapped
+
+    def _compile(self, stride: int):
+        self._scatters = [
+            Scatter(frame, slots, np.array(pixels, dtype=np.intp) * stride + np.array(channels, dtype=np.intp))
+            for frame, slots, pixels, channels in self._frames.values()
+        ]
+        self._stride = stride
+
+    def render(self, image):
+        """
+        Writing an image into the mapped pixels. The image is an array-like of shape (height, width, channels),
+        e.g. a NumPy array or an RGB PIL image, with uint8 values or floats from 0.0 to 1.0.
+        """
+        image = np.asarray(image)
+        if image.ndim == 2:
+            image = image[:, :, None]
+        if image.shape[:2] != (self.height, self.width) or image.shape[2] < len(self.components):
+            raise ValueError(
+                f"Expected an image of {self.width}x{self.height} pixels with {len(self.components)} channels, got the shape {image.shape}."
+            )
+        if image.dtype != np.uint8:
+            image = np.clip(np.rint(image * 255.0), 0, 255).astype(np.uint8)
+        if self._scatters is None or image.shape[2] != self._stride:
+            self._compile(image.shape[2])
+        planes = np.ascontiguousarray(image).reshape(-1)
+        for scatter in self._scatters:
+            scatter.scatter(planes)
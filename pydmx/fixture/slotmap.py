@@ -0,0 +1,210 @@
+"""
+Flat slot maps of patched fixtures
+
+A fixture mode lists its channels by name, fine channels of 16 and 24 bit attributes are separate entries
+referenced through fineChannelAliases. Resolving this on every write is slow, so a (fixture, mode, start address)
+is compiled once into arrays holding the absolute slots of every attribute. Setting an attribute is then a dict
+lookup and one to three byte writes into the universe buffer.
+Template channels of matrix fixtures are expanded into one attribute per pixel ("Red 1", "Red 2", ...) at compile time.
+"""
+
+from array import array
+from typing import Dict, List, Optional, Tuple, Union
+
+from pydmx.fixture.capabilities import CapabilityResolver, _scale
+from pydmx.fixture.matrix import Matrix, expandMode
+from pydmx.frame import DMXFrame
+from pydmx.openfixturelibrary.channelSchema import ChannelSchema, Precedence
+
+# Marks a missing fine slot in the slot arrays
+NOSLOT = 0xFFFF
+
+
+def findMode(fixture, mode: Union[str, int]):
+    """Resolving a mode by its name, short name or index"""
+    if isinstance(mode, int):
+        return fixture.modes[mode]
+    for candidate in fixture.modes:
+        if mode in (candidate.name, candidate.shortName):
+            return candidate
+    raise KeyError(f"The fixture {fixture.name} has no mode {mode}.")
+
+
+def _defaultValue(channel: Optional[ChannelSchema], resolution: int) -> int:
+    """Default value of a channel scaled to the resolution the channel is patched with"""
+    if channel is None or channel.defaultValue is None:
+        return 0
+    value = channel.defaultValue
+    if isinstance(value, str):
+        # Percentage of the full range, e.g. "50%"
+        return round(float(value.rstrip("%")) / 100 * ((1 << (8 * resolution)) - 1))
+    return _scale(value, channel, resolution)
+
+
+class SlotMap:
+    """
+    Compiled slot layout of a fixture patched in a specific mode at a start address (1 based)
+    """
+
+    def __init__(self, fixture, mode: Union[str, int], address: int, frame: Optional[DMXFrame] = None):
+        self.fixture = fixture
+        self.mode = findMode(fixture, mode)
+        self.address = address
+        self.frame = frame
+        # Write mask of a merge layer frame (see MergeEngine), slots set through the map are marked in it
+        self.written = None
+        matrix = getattr(fixture, "matrix", None)
+        # Pixels of matrix fixtures, None for other fixtures
+        self.matrix: Optional[Matrix] = Matrix(matrix) if matrix else None
+        channels, modeChannels, pixelChannels = expandMode(fixture, self.mode, self.matrix)
+
+        # fine alias: (coarse channel, fine level)
+        aliases = {}
+        for name, channel in channels.items():
+            for level, alias in enumerate(channel.fineChannelAliases or (), start=1):
+                aliases[alias] = (name, level)
+
+        # attribute: slot per level (coarse, fine, finer)
+        layout: Dict[str, List[int]] = {}
+        for position, key in enumerate(modeChannels):
+            if key is None:
+                continue
+            name, level = aliases.get(key, (key, 0))
+            slots = layout.setdefault(name, [NOSLOT, NOSLOT, NOSLOT])
+            slots[level] = address - 1 + position
+
+        self.footprint = len(modeChannels)
+        if address < 1 or address - 1 + self.footprint > 512:
+            raise ValueError(f"The fixture doesn't fit into the universe at address {address}.")
+
+        self.names: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._coarse = array("H")
+        self._fine = array("H")
+        self._finer = array("H")
+        self._resolution = array("B")
+        self._defaults = array("L")
+        self.channels: List[Optional[ChannelSchema]] = []
+        # Capability lookup tables, compiled on first use
+        self._resolvers: List[Optional[CapabilityResolver]] = []
+        for name, (coarse, fine, finer) in layout.items():
+            if coarse == NOSLOT:
+                # A fine channel without its coarse channel in this mode is driven on its own
+                for level, slot in enumerate((fine, finer), start=1):
+                    if slot != NOSLOT:
+                        self._add(channels[name].fineChannelAliases[level - 1], slot, NOSLOT, NOSLOT, None)
+                continue
+            resolution = 1 if fine == NOSLOT else (2 if finer == NOSLOT else 3)
+            self._add(name, coarse, fine if resolution > 1 else NOSLOT, finer if resolution > 2 else NOSLOT, channels.get(name))
+
+        # pixel or group key: component (e.g. "Red"): attribute
+        self.pixels: Dict[str, Dict[str, str]] = {}
+        for name in self.names:
+            if name in pixelChannels:
+                key, component = pixelChannels[name]
+                self.pixels.setdefault(key, {})[component] = name
+
+    def _add(self, name: str, coarse: int, fine: int, finer: int, channel: Optional[ChannelSchema]):
+        resolution = 1 + (fine != NOSLOT) + (finer != NOSLOT)
+        self._index[name] = len(self.names)
+        self.names.append(name)
+        self.channels.append(channel)
+        self._coarse.append(coarse)
+        self._fine.append(fine)
+        self._finer.append(finer)
+        self._resolution.append(resolution)
+        self._defaults.append(_defaultValue(channel, resolution))
+        self._resolvers.append(None)
+
+    def __contains__(self, attribute: str) -> bool:
+        return attribute in self._index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def slots(self, attribute: str) -> List[int]:
+        """Absolute slots (0 based) of an attribute, coarse first"""
+        i = self._index[attribute]
+        return [slot for slot in (self._coarse[i], self._fine[i], self._finer[i]) if slot != NOSLOT]
+
+    def resolution(self, attribute: str) -> int:
+        """Number of slots (bytes) an attribute is patched with"""
+        return self._resolution[self._index[attribute]]
+
+    def maximum(self, attribute: str) -> int:
+        return (1 << (8 * self._resolution[self._index[attribute]])) - 1
+
+    def dmxRange(self, attribute: str) -> Tuple[int, int]:
+        """Lowest and highest value covered by the capabilities of an attribute, in its patched resolution"""
+        resolver = self.resolver(attribute)
+        if resolver is None or not resolver.capabilities:
+            return (0, self.maximum(attribute))
+        return resolver.dmxRange
+
+    def resolver(self, attribute: str) -> Optional[CapabilityResolver]:
+        """Capability lookup tables of an attribute, None for fine channels patched on their own"""
+        i = self._index[attribute]
+        resolver = self._resolvers[i]
+        if resolver is None and self.channels[i] is not None:
+            resolver = self._resolvers[i] = CapabilityResolver(self.channels[i], self._resolution[i])
+        return resolver
+
+    def capability(self, attribute: str) -> Optional[Tuple[object, float]]:
+        """Capability the current value of an attribute falls into and the position within its range"""
+        resolver = self.resolver(attribute)
+        return resolver.resolve(self.get(attribute)) if resolver else None
+
+    def setCapability(self, attribute: str, type: Optional[str] = None, fraction: Optional[float] = None, **criteria) -> bool:
+        """
+        Setting an attribute to the value of a capability, e.g.
+        slotmap.setCapability("Shutter / Strobe", "ShutterStrobe", shutterEffect="Strobe", speed="fast").
+        Returns False if the attribute has no matching capability.
+        """
+        resolver = self.resolver(attribute)
+        value = resolver.value(type, fraction, **criteria) if resolver else None
+        if value is None:
+            return False
+        self.set(attribute, value)
+        return True
+
+    def precedence(self, attribute: str) -> Precedence:
+        """Merge precedence of an attribute, LTP if the fixture doesn't define one"""
+        channel = self.channels[self._index[attribute]]
+        if channel is None or channel.precedence is None:
+            return Precedence.LTP
+        return Precedence(channel.precedence)
+
+    def set(self, attribute: str, value: int):
+        """Setting an attribute to a value in its patched resolution (0-255, 0-65535 or 0-16777215)"""
+        i = self._index[attribute]
+        buffer = self.frame.back
+        resolution = self._resolution[i]
+        if resolution == 1:
+            buffer[self._coarse[i]] = value
+        elif resolution == 2:
+            buffer[self._coarse[i]] = value >> 8
+            buffer[self._fine[i]] = value & 0xFF
+        else:
+            buffer[self._coarse[i]] = value >> 16
+            buffer[self._fine[i]] = (value >> 8) & 0xFF
+            buffer[self._finer[i]] = value & 0xFF
+        if self.written is not None:
+            self.written[self.slots(attribute)] = True
+
+    def setNormalized(self, attribute: str, value: float):
+        """Setting an attribute to a value between 0.0 and 1.0"""
+        i = self._index[attribute]
+        self.set(attribute, round(value * ((1 << (8 * self._resolution[i])) - 1)))
+
+    def get(self, attribute: str) -> int:
+        i = self._index[attribute]
+        buffer = self.frame.back
+        value = 0
+        for slot in (self._coarse[i], self._fine[i], self._finer[i])[: self._resolution[i]]:
+            value = (value << 8) | buffer[slot]
+        return value
+
+    def reset(self):
+        """Setting all attributes to their default values"""
+        for attribute, value in zip(self.names, self._defaults):
+            self.set(attribute, value)
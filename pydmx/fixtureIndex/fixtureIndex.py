@@ -3,10 +3,20 @@
 
 import json
 import os
+from typing import Dict, List, Optional
 
-from jsonschema import validate
+from jsonschema.validators import validator_for
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT7
+
+from pydmx.openfixturelibrary.oflcache import FixtureCache, fromDict
+from pydmx.openfixturelibrary.oflindex import OflLibrary
+from pydmx.openfixturelibrary.oflsearch import FixtureSearch, words
 
 dirname = os.path.dirname(__file__)
+# The OFL schemas aren't bundled, the schemas directory of the open-fixture-library goes here (or point this to it)
+schemadir = os.path.join(dirname, "../openfixturelibrary/schemas")
+OFL_SCHEMAS = "https://github.com/OpenLightingProject/open-fixture-library/tree/master/schemas"
 
 
 class FixtureIndex:
@@ -15,6 +25,8 @@ class FixtureIndex:
     """
 
     __instance = None
+    # Compiled validators of the OFL fixture schema per schema version
+    __validators = {}
 
     @staticmethod
     def getInstance():
@@ -22,51 +34,100 @@ class FixtureIndex:
             FixtureIndex()
         return FixtureIndex.__instance
 
-    def __init__(self, ofl=True):
+    def __init__(self, ofl=True, cacheSize=64):
         if FixtureIndex.__instance != None:
             raise Exception("Please do not create this Class mulitple times.")
         else:
             FixtureIndex.__instance = self
 
             self.customfixtures = {}
+            # Version of the loaded OFL fixture schema, known after the first validation
+            self._schemaVersion = None
 
             self.ofl = None
+            self._cacheSize = cacheSize
+            # Binary caches of the converted fixtures per schema version
+            self._fixtureCaches = {}
+            # Search index of the OFL, loaded on the first search
+            self._search = None
             if ofl:
-                self.ofl = self._loadOfl()
+                self.ofl = self._loadOfl(cacheSize)
 
-    def _loadOfl(self):
-        return json.load(
-            open(
-                os.path.join(dirname, "./openfixturelibrary/ofl.json"), encoding="utf-8"
-            )
+    def _loadOfl(self, cacheSize):
+        # Only the offset index is loaded here, fixtures get parsed on their first lookup
+        return OflLibrary(
+            os.path.join(dirname, "../openfixturelibrary/ofl.json"), cacheSize=cacheSize
         )
 
-    def createCustomFixture(self, fixtureId, fixture):
-        # Accepting multiple Filetypes: Json String, Dictionary, and List of the ones before
-        instance = None
+    def _getValidator(self):
+        """The validator is compiled once and then cached per schema version"""
+        if self._schemaVersion not in FixtureIndex.__validators:
+            if not os.path.isfile(os.path.join(schemadir, "fixture.json")):
+                raise FileNotFoundError(
+                    f"Custom fixtures are validated with the OFL schemas, which aren't found in {os.path.normpath(schemadir)}. "
+                    f"Copy the schemas directory from {OFL_SCHEMAS} there or set pydmx.fixtureIndex.fixtureIndex.schemadir."
+                )
+            # The fixture schema references the other OFL schemas (definitions.json, capability.json, ...)
+            # so all of them are registered to resolve the references offline
+            resources = {}
+            for filename in os.listdir(schemadir):
+                if not filename.endswith(".json"):
+                    continue
+                with open(os.path.join(schemadir, filename), encoding="utf-8") as schemafile:
+                    resource = Resource.from_contents(json.load(schemafile), default_specification=DRAFT7)
+                resources[filename] = resource
+            schema = resources["fixture.json"].contents
+            registry = Registry().with_resources(
+                (resource.id() or filename, resource) for filename, resource in resources.items()
+            )
+            validatorClass = validator_for(schema)
+            validatorClass.check_schema(schema)
+            self._schemaVersion = schema.get("version")
+            FixtureIndex.__validators[self._schemaVersion] = validatorClass(schema, registry=registry)
+        return FixtureIndex.__validators[self._schemaVersion]
+
+    def _parseCustomFixture(self, fixture):
+        # Accepting multiple Filetypes: Json String and Dictionary
         if isinstance(fixture, str):
-            instance = json.loads(fixture)
-        elif isinstance(fixture, dict):
-            instance = fixture
-        elif isinstance(fixture, list):
-            for fixt in fixture:
-                self.createCustomFixture(fixt)
-
-        if not self._schema:
-            self._schema = open(
-                os.path.join(dirname, "./openfixturelibrary/schemas/fixture.json")
-            ).read()
-
-        # Validating the Instance with the OFL schema
-        try:
-            validate(instance=instance, schema=self._schema)
-        except:
-            return print("The fixture didn't fit the Schema.")
-
-        if fixtureId in self.customfixtures:
-            return print("This ID already exists")
+            return json.loads(fixture)
+        if isinstance(fixture, dict):
+            return fixture
+        raise TypeError("A fixture has to be a JSON string or a dictionary.")
 
-        self.customfixtures[fixtureId] = instance
+    def createCustomFixture(self, fixtureId, fixture):
+        # Multiple fixtures at once can be created with createCustomFixtures
+        errors = self.createCustomFixtures({fixtureId: fixture})
+        if errors:
+            return print(f"The fixture {fixtureId} couldn't be created: {errors[fixtureId][0]}")
+
+    def createCustomFixtures(self, fixtures: Dict[str, object]) -> Dict[str, List[str]]:
+        """
+        Validating and creating multiple custom fixtures in one pass.
+        All valid fixtures are created, the errors of the others are collected and returned by fixture ID.
+        """
+        validator = self._getValidator()
+        errors = {}
+        for fixtureId, fixture in fixtures.items():
+            if fixtureId in self.customfixtures:
+                errors[fixtureId] = ["This ID already exists"]
+                continue
+            try:
+                instance = self._parseCustomFixture(fixture)
+            except (TypeError, ValueError) as error:
+                errors[fixtureId] = [str(error)]
+                continue
+
+            # Validating the Instance with the OFL schema
+            fixtureErrors = [
+                f"{'/'.join(map(str, error.absolute_path)) or '<root>'}: {error.message}"
+                for error in validator.iter_errors(instance)
+            ]
+            if fixtureErrors:
+                errors[fixtureId] = fixtureErrors
+                continue
+
+            self.customfixtures[fixtureId] = instance
+        return errors
 
     def removeCustomFixture(self, fixtureId):
         try:
@@ -77,17 +138,55 @@ class FixtureIndex:
     def exportCustomFixtures(self, path, fixtureId=None):
         pass
 
-    def importCustomFixtures(self, path):
+    def importCustomFixtures(self, path) -> Dict[str, List[str]]:
         try:
-            fixtures = open(path, encoding="utf-8")
-        except:
+            with open(path, encoding="utf-8") as fixturefile:
+                fixtures = json.load(fixturefile)
+        except OSError:
             return print("File doesn't exist")
+        except json.JSONDecodeError as error:
+            return print(f"The file {path} isn't valid JSON: {error}")
 
-        for fixtureId, fixture in fixtures.items():
-            self.createCustomFixture(fixtureId, fixture)
+        return self.createCustomFixtures(fixtures)
 
     def lookupFixture(self, fixtureId: str):
         if self.customfixtures and (fixtureId in self.customfixtures):
             return self.customfixtures[fixtureId]
         if self.ofl and (fixtureId in self.ofl):
             return self.ofl[fixtureId]
+
+    def searchFixtures(self, query: str = "", category=None, channels: Optional[int] = None, limit: int = 20) -> List[str]:
+        """
+        Fixture IDs matching a typeahead query on name, shortName and manufacturer,
+        optionally filtered by category (FixtureCategories) and the channel count of a mode.
+        Custom fixtures are listed first.
+        """
+        results = []
+        queryWords = words(query)
+        for fixtureId, fixture in self.customfixtures.items():
+            text = " ".join(filter(None, (fixture.get("name"), fixture.get("shortName"), fixtureId)))
+            fixtureWords = words(text)
+            if not all(any(word.startswith(queryWord) for word in fixtureWords) for queryWord in queryWords):
+                continue
+            if category is not None and getattr(category, "value", category) not in fixture.get("categories", ()):
+                continue
+            if channels is not None and all(len(mode.get("channels", ())) != channels for mode in fixture.get("modes", ())):
+                continue
+            results.append(fixtureId)
+
+        if self.ofl and len(results) < limit:
+            if self._search is None:
+                self._search = FixtureSearch.load(self.ofl.path, self.ofl)
+            results += self._search.search(query, category, channels, limit - len(results))
+        return results[:limit]
+
+    def lookupFixtureSchema(self, fixtureId: str, schemaVersion: str):
+        """Looking up a fixture already converted into the FixtureSchema dataclasses"""
+        if self.customfixtures and (fixtureId in self.customfixtures):
+            return fromDict(self.customfixtures[fixtureId])
+        if self.ofl and (fixtureId in self.ofl):
+            if schemaVersion not in self._fixtureCaches:
+                self._fixtureCaches[schemaVersion] = FixtureCache(
+                    self.ofl.path, schemaVersion, cacheSize=self._cacheSize
+                )
+            return self._fixtureCaches[schemaVersion][fixtureId]
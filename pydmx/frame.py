@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+from threading import Lock
+
+
+class DMXFrame:
+    """
+    Double buffered DMX frame shared by a Universe and its controller
+    """
+
+    """
+    Both buffers are preallocated bytearrays holding the start code followed by the slots, so a controller can send
+    a frame with a single write. All writes go into the back buffer without allocating anything.
+    commit() publishes the back buffer to the front buffer at a frame boundary, controllers only ever read the
+    front buffer through read(), so they never see a half updated frame.
+    Writes which have to appear together in the same frame are grouped with hold().
+    Every commit which changes the frame increases the generation.
+    """
+
+    def __init__(self, slots: int = 512, startCode: int = 0):
+        self.slots = slots
+        # Start code + slots
+        self._back = bytearray(slots + 1)
+        self._front = bytearray(slots + 1)
+        self._back[0] = self._front[0] = startCode
+        # Views on the slots without the start code
+        self.back = memoryview(self._back)[1:]
+        self._frontView = memoryview(self._front)
+        self.payload = self._frontView[1:]
+        # Guards the front buffer while it is published or read
+        self._lock = Lock()
+        # Held while a group of writes is in progress, commits are skipped meanwhile
+        self._holdLock = Lock()
+        # Increased on every commit which changed the front buffer
+        self.generation = 0
+        self._blank = bytes(slots)
+
+    def __len__(self) -> int:
+        return self.slots
+
+    def __getitem__(self, key):
+        return self.back[key]
+
+    def __setitem__(self, key, value):
+        self.back[key] = value
+
+    def set(self, slot: int, value: int):
+        """Setting a single slot (0 based)"""
+        self._back[slot + 1] = value
+
+    def setRange(self, start: int, values):
+        """Setting consecutive slots from a bytes-like object, starting at the slot start (0 based)"""
+        self._back[start + 1 : start + 1 + len(values)] = values
+
+    def clear(self):
+        self.back[:] = self._blank
+
+    @contextmanager
+    def hold(self):
+        """All writes inside the with block are published in the same frame"""
+        with self._holdLock:
+            yield self
+
+    def commit(self) -> bool:
+        """
+        Publishing the back buffer, returns if the frame changed.
+        If a hold() is in progress the previous frame stays published.
+        """
+        if not self._holdLock.acquire(blocking=False):
+            return False
+        try:
+            if self._back == self._front:
+                return False
+            with self._lock:
+                self._front[:] = self._back
+                self.generation += 1
+            return True
+        finally:
+            self._holdLock.release()
+
+    @contextmanager
+    def read(self):
+        """Start code and slots of the published frame, the view is only valid inside the with block"""
+        with self._lock:
+            yield self._frontView
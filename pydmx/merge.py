@@ -0,0 +1,190 @@
+"""
+HTP/LTP merging of several source layers into the output universes
+
+Every layer (cue stack, playback, ...) renders into its own copy of the slots of all merged universes.
+Per frame the layers are combined slot by slot with the precedence of the patched fixture channel:
+HTP slots take the highest value of all layers, LTP slots the value of the layer which wrote or changed the slot last.
+All layers live in one (layers, universes, slots) array, so a merge is a handful of vectorized operations
+independent of the number of patched fixtures.
+"""
+
+import copy
+from threading import Lock
+from time import perf_counter
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from pydmx.fixture.slotmap import SlotMap
+from pydmx.metrics import MERGE, FrameMetrics
+from pydmx.openfixturelibrary.channelSchema import Precedence
+from pydmx.universe import Universe
+
+# Change stamp of slots a layer never set or released, loses against every change
+RELEASED = -1
+
+
+class LayerFrame:
+    """Slots of one universe in a layer, can be used as the frame of a SlotMap"""
+
+    def __init__(self, values: np.ndarray, written: np.ndarray):
+        self.slots = len(values)
+        # SlotMap writes into frame.back
+        self.back = memoryview(values)
+        # Slots written since the last merge, even with the value they already had
+        self.written = written
+
+    def __getitem__(self, slot):
+        return self.back[slot]
+
+    def __setitem__(self, slot, value):
+        self.back[slot] = value
+        self.written[slot] = True
+
+
+class Layer:
+    """
+    Source layer of a MergeEngine
+    """
+
+    def __init__(self, engine: "MergeEngine", index: int, name: str):
+        self.engine = engine
+        self.index = index
+        self.name = name
+        # (universes, slots) view into the values of the engine
+        self.values: np.ndarray = engine._values[index]
+        self.frames = [LayerFrame(values, written) for values, written in zip(self.values, engine._written[index])]
+
+    def frame(self, universe: int) -> LayerFrame:
+        return self.frames[universe]
+
+    def fixture(self, universe: int, alias: str) -> SlotMap:
+        """Slot map of a patched fixture writing into this layer instead of the universe"""
+        slotmap = copy.copy(self.engine.universes[universe].fixtureRegistry[alias])
+        slotmap.frame = self.frames[universe]
+        slotmap.written = self.frames[universe].written
+        return slotmap
+
+    def clear(self):
+        """Releasing all slots, LTP slots fall back to the layer which changed them before"""
+        self.engine._release(self.index)
+
+
+class MergeEngine:
+    """
+    Combining N source layers into the buffers of the merged universes
+    """
+
+    """
+    Slots written through a LayerFrame or a slot map of the layer are marked, so writing a value the slot
+    already had (e.g. 0 on a fresh layer) takes LTP control as well. Writes straight into the values or the back
+    buffer (faders, groups, a DMXReceiver) are detected by comparing each layer with its values of the previous
+    merge. Every written or changed slot gets the number of the merge as its change stamp. LTP takes the slot
+    of the layer with the highest stamp, on equal stamps the later added layer wins.
+    The number of layers is fixed at construction, so the layer arrays are never reallocated and the
+    views handed out by the layers stay valid.
+    """
+
+    def __init__(self, universes: Sequence[Universe], layers: int = 16, slots: int = 512):
+        self.universes: List[Universe] = list(universes)
+        shape = (layers, len(self.universes), slots)
+        self._values = np.zeros(shape, dtype=np.uint8)
+        self._previous = np.zeros(shape, dtype=np.uint8)
+        self._written = np.zeros(shape, dtype=bool)
+        self._stamps = np.full(shape, RELEASED, dtype=np.int64)
+        self._changed = np.zeros(shape, dtype=bool)
+        # True for HTP slots, LTP otherwise
+        self.htp = np.zeros(shape[1:], dtype=bool)
+        self._merged = np.zeros(shape[1:], dtype=np.uint8)
+        self._outputs = [np.frombuffer(universe.buffer.back, dtype=np.uint8) for universe in self.universes]
+        self.layers: List[Optional[Layer]] = [None] * layers
+        self.merges = 0
+        # Merges which found no changed layer and left the universes untouched
+        self.skippedMerges = 0
+        # Set when layers or the precedence changed without a change of the layer values
+        self._invalidated = True
+        self._lock = Lock()
+        # Pipeline metrics the merge time is observed in, e.g. the ones of the Multiverse
+        self.metrics: Optional[FrameMetrics] = None
+        self.updatePrecedence()
+
+    def addLayer(self, name: str) -> Layer:
+        with self._lock:
+            try:
+                index = self.layers.index(None)
+            except ValueError:
+                raise ValueError(f"All {len(self.layers)} layers of the merge engine are in use.") from None
+            layer = self.layers[index] = Layer(self, index, name)
+            self._invalidated = True
+            return layer
+
+    def removeLayer(self, layer: Layer):
+        self._release(layer.index)
+        with self._lock:
+            self.layers[layer.index] = None
+            self._invalidated = True
+
+    def _release(self, index: int):
+        with self._lock:
+            self._values[index] = 0
+            self._previous[index] = 0
+            self._written[index] = False
+            self._stamps[index] = RELEASED
+            self._invalidated = True
+
+    def updatePrecedence(self):
+        """Building the HTP mask from the fixtures patched in the universes, needed after (re)patching"""
+        self.htp[:] = False
+        for position, universe in enumerate(self.universes):
+            for slotmap in universe.fixtureRegistry.values():
+                for attribute in slotmap.names:
+                    if slotmap.precedence(attribute) == Precedence.HTP:
+                        self.htp[position, slotmap.slots(attribute)] = True
+        self._invalidated = True
+
+    def merge(self) -> np.ndarray:
+        """
+        Merging all layers and writing the result into the back buffers of the universes.
+        Only universes with changed layer slots are rewritten, nothing is merged if no layer changed.
+        """
+        metrics = self.metrics
+        if metrics is None:
+            return self._merge()
+        start = perf_counter()
+        merged = self._merge()
+        metrics.observe(MERGE, perf_counter() - start)
+        return merged
+
+    def _merge(self) -> np.ndarray:
+        with self._lock:
+            self.merges += 1
+            count = max((layer.index + 1 for layer in self.layers if layer is not None), default=0)
+            merged = self._merged
+            universes = range(len(self._outputs))
+            if count == 0:
+                merged[:] = 0
+            else:
+                values = self._values[:count]
+                stamps = self._stamps[:count]
+                changed = self._changed[:count]
+                np.not_equal(values, self._previous[:count], out=changed)
+                written = self._written[:count]
+                changed |= written
+                written[:] = False
+                if not self._invalidated:
+                    universes = np.flatnonzero(changed.any(axis=(0, 2)))
+                    if not len(universes):
+                        self.skippedMerges += 1
+                        return merged
+                np.putmask(stamps, changed, self.merges)
+                self._previous[:count] = values
+
+                # Latest change, searched from the last layer so equal stamps go to the later layer
+                latest = count - 1 - np.argmax(stamps[::-1], axis=0)
+                np.copyto(merged, np.take_along_axis(values, latest[None], axis=0)[0])
+                np.copyto(merged, values.max(axis=0), where=self.htp)
+
+            self._invalidated = False
+            for universe in universes:
+                self._outputs[universe][:] = merged[universe]
+            return merged
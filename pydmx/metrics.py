@@ -0,0 +1,305 @@
+"""
+Timing and throughput metrics of the frame pipeline
+
+A FrameMetrics collects where the time of a frame goes and what gets out of the output:
+    render  renderers called before the frame is published (fades, players, pixel mappers), without merge
+    merge   MergeEngine.merge combining the layers
+    encode  updating the prebuilt packet (or serial buffer) with the published frame
+    send    handing the packet to the socket or serial port
+per stage as a histogram with fixed buckets, the interval between frame starts (as a histogram and its jitter
+against the frame period), frames dropped because their slot passed, frames and bytes per second and per universe
+the frames, bytes, unchanged (not sent) and dropped frames.
+
+Metrics are off by default: controllers, Multiverse and MergeEngine hold metrics = None and only check it,
+so the disabled pipeline costs an attribute lookup per stage. enableMetrics() on a controller or Multiverse
+shares one FrameMetrics between it, its controllers and MergeEngines which are added to it.
+
+Once per window (1 s by default) the rates are updated and the callback is called with the metrics,
+e.g. to push them somewhere. prometheus() renders everything in the Prometheus text format, serve() exposes
+it over HTTP for scraping.
+"""
+
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Callable, Dict, Optional, Sequence
+
+RENDER = "render"
+MERGE = "merge"
+ENCODE = "encode"
+SEND = "send"
+STAGES = (RENDER, MERGE, ENCODE, SEND)
+
+# Upper bucket bounds in seconds, from the microseconds of an encode to a whole frame period and beyond
+STAGE_BOUNDS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 0.1)
+INTERVAL_BOUNDS = (0.005, 0.01, 0.015, 0.02, 0.0225, 0.025, 0.0275, 0.03, 0.035, 0.04, 0.05, 0.075, 0.1, 0.25, 1.0)
+
+
+class Histogram:
+    """
+    Counting observations in buckets with fixed upper bounds, plus their sum and maximum
+    """
+
+    def __init__(self, bounds: Sequence[float] = STAGE_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.reset()
+
+    def reset(self):
+        # One count per bound and one for everything above the last bound, not cumulative
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q quantile, the maximum if it lies above the last bound"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class UniverseCounters:
+    """Output counters of a single universe"""
+
+    __slots__ = ("frames", "bytes", "unchanged", "dropped")
+
+    def __init__(self):
+        # Frames and bytes handed to the socket or port
+        self.frames = 0
+        self.bytes = 0
+        # Unchanged frames which weren't sent because of the keep-alive
+        self.unchanged = 0
+        # Frames the output had to drop, e.g. on a full socket buffer or a busy serial line
+        self.dropped = 0
+
+    def snapshot(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class FrameMetrics:
+    """
+    Timing histograms, frame interval jitter, drops and throughput of the frame pipeline
+
+    Updated from the frame thread and the output workers of a Multiverse, so every update takes a lock,
+    which costs about as much as the perf_counter calls around the stage. Frame intervals are measured per
+    clock, controllers with their own frame threads sharing the metrics don't count each other's frames.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[["FrameMetrics"], object]] = None,
+        window: float = 1.0,
+        stageBounds: Sequence[float] = STAGE_BOUNDS,
+        intervalBounds: Sequence[float] = INTERVAL_BOUNDS,
+    ):
+        # Called with the metrics at the end of every window
+        self.callback = callback
+        self.window = window
+        self.stages: Dict[str, Histogram] = {stage: Histogram(stageBounds) for stage in STAGES}
+        self.interval = Histogram(intervalBounds)
+        # universe label: counters
+        self.universes: Dict[str, UniverseCounters] = {}
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            for histogram in self.stages.values():
+                histogram.reset()
+            self.interval.reset()
+            self.universes.clear()
+            self.frames = 0
+            # Frame slots which passed without a frame
+            self.droppedFrames = 0
+            self.bytes = 0
+            # Deviation of the frame interval from the period in seconds
+            self.lastJitter = 0.0
+            self.maxJitter = 0.0
+            self._jitterSum = 0.0
+            self.framesPerSecond = 0.0
+            self.bytesPerSecond = 0.0
+            # clock: start of its last frame
+            self._lastStarts: Dict[object, float] = {}
+            # Merge time observed since the frame started, it is part of the render time
+            self._merged = 0.0
+            self._windowStart = perf_counter()
+            self._windowFrames = 0
+            self._windowBytes = 0
+
+    def _universe(self, label: str) -> UniverseCounters:
+        counters = self.universes.get(label)
+        if counters is None:
+            counters = self.universes[label] = UniverseCounters()
+        return counters
+
+    def begin(self, period: float, now: Optional[float] = None, clock: object = None):
+        """Start of a frame on a clock with the given period, the interval is taken from the last frame of that clock"""
+        now = perf_counter() if now is None else now
+        due = None
+        with self._lock:
+            self.frames += 1
+            self._windowFrames += 1
+            self._merged = 0.0
+            lastStart = self._lastStarts.get(clock)
+            if lastStart is not None:
+                interval = now - lastStart
+                self.interval.observe(interval)
+                jitter = interval - period
+                self.lastJitter = jitter
+                self._jitterSum += abs(jitter)
+                if abs(jitter) > self.maxJitter:
+                    self.maxJitter = abs(jitter)
+                # An interval of three periods means two frames were left out
+                self.droppedFrames += max(int(interval / period + 0.5) - 1, 0)
+            self._lastStarts[clock] = now
+            elapsed = now - self._windowStart
+            if elapsed >= self.window:
+                self.framesPerSecond = self._windowFrames / elapsed
+                self.bytesPerSecond = self._windowBytes / elapsed
+                self._windowStart = now
+                self._windowFrames = 0
+                self._windowBytes = 0
+                due = self.callback
+        if due is not None:
+            due(self)
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage].observe(seconds)
+            if stage == MERGE:
+                self._merged += seconds
+
+    def rendered(self, seconds: float):
+        """Time of all renderers of a frame, the merges observed meanwhile are taken out"""
+        with self._lock:
+            self.stages[RENDER].observe(max(seconds - self._merged, 0.0))
+            self._merged = 0.0
+
+    def sent(self, label: str, size: int):
+        with self._lock:
+            counters = self._universe(label)
+            counters.frames += 1
+            counters.bytes += size
+            self.bytes += size
+            self._windowBytes += size
+
+    def unchanged(self, label: str):
+        with self._lock:
+            self._universe(label).unchanged += 1
+
+    def dropped(self, label: str):
+        with self._lock:
+            self._universe(label).dropped += 1
+
+    @property
+    def meanJitter(self) -> float:
+        return self._jitterSum / self.interval.count if self.interval.count else 0.0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "frames": self.frames,
+                "droppedFrames": self.droppedFrames,
+                "framesPerSecond": self.framesPerSecond,
+                "bytesPerSecond": self.bytesPerSecond,
+                "bytes": self.bytes,
+                "lastJitter": self.lastJitter,
+                "meanJitter": self.meanJitter,
+                "maxJitter": self.maxJitter,
+                "interval": self.interval.snapshot(),
+                "stages": {stage: histogram.snapshot() for stage, histogram in self.stages.items()},
+                "universes": {label: counters.snapshot() for label, counters in self.universes.items()},
+            }
+
+    def prometheus(self, prefix: str = "pydmx") -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def metric(name: str, kind: str, help: str):
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def histogram(name: str, histogram: Histogram, labels: str = ""):
+            cumulative = 0
+            for bound, count in zip(histogram.bounds + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{prefix}_{name}_bucket{{{labels}le="{le}"}} {cumulative}')
+            labels = "{" + labels.rstrip(",") + "}" if labels else ""
+            lines.append(f"{prefix}_{name}_sum{labels} {histogram.sum!r}")
+            lines.append(f"{prefix}_{name}_count{labels} {histogram.count}")
+
+        with self._lock:
+            metric("stage_seconds", "histogram", "Time spent per frame in a stage of the frame pipeline.")
+            for stage, stageHistogram in self.stages.items():
+                histogram("stage_seconds", stageHistogram, f'stage="{stage}",')
+            metric("frame_interval_seconds", "histogram", "Time between the starts of consecutive frames.")
+            histogram("frame_interval_seconds", self.interval)
+            for name, kind, help, value in (
+                ("frames_total", "counter", "Frames started.", self.frames),
+                ("dropped_frames_total", "counter", "Frame slots which passed without a frame.", self.droppedFrames),
+                ("sent_bytes_total", "counter", "Bytes handed to the outputs.", self.bytes),
+                ("frames_per_second", "gauge", "Frames started per second in the last window.", self.framesPerSecond),
+                ("bytes_per_second", "gauge", "Bytes sent per second in the last window.", self.bytesPerSecond),
+                ("frame_jitter_seconds", "gauge", "Deviation of the last frame interval from the period.", self.lastJitter),
+                ("frame_jitter_max_seconds", "gauge", "Largest deviation of a frame interval from the period.", self.maxJitter),
+            ):
+                metric(name, kind, help)
+                lines.append(f"{prefix}_{name} {value!r}")
+            for name, help in (
+                ("frames", "Frames sent per universe."),
+                ("bytes", "Bytes sent per universe."),
+                ("unchanged", "Unchanged frames not sent per universe."),
+                ("dropped", "Frames dropped by the output per universe."),
+            ):
+                metric(f"universe_{name}_total", "counter", help)
+                for label, counters in self.universes.items():
+                    lines.append(f'{prefix}_universe_{name}_total{{universe="{label}"}} {getattr(counters, name)}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9465, host: str = "", prefix: str = "pydmx") -> ThreadingHTTPServer:
+        """Serving prometheus() over HTTP from a daemon thread, the returned server is stopped with shutdown()"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus(prefix).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        Thread(target=server.serve_forever, name="FrameMetrics", daemon=True).start()
+        return server
@@ -0,0 +1,174 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+from pydmx.controller.controller import DMXController
+from pydmx.controller.scheduler import FrameScheduler
+from pydmx.metrics import FrameMetrics
+from pydmx.universe import Universe
+
+
+class Multiverse:
+    """
+    Driving many Universes from a single frame scheduler
+    """
+
+    """
+    On every tick all universes are committed and the ones which have to be sent are handed to their controllers.
+    A universe is only sent if its frame changed or if its last transmission is older than the keep-alive time.
+    The controllers of a Multiverse are not activated themselves, their own threads stay idle.
+
+    Sending happens in a pool of output workers. Controllers of the same class are written together through
+    DMXController.writeMany, so network controllers can batch their packets.
+    With workers=0 everything is sent in the scheduler thread.
+
+    Renderers (e.g. MergeEngine.merge) are called at the start of every tick, before the universes are committed,
+    monitors (e.g. ShowRecorder.capture) once they were committed.
+    enableMetrics() collects the stage timings of the ticks and the output of all controllers in one FrameMetrics.
+    """
+
+    def __init__(self, framerate: float = 40.0, workers: int = 0, keepAlive: float = 1.0):
+        self.universes: Dict[int, Universe] = {}
+        # Resend unchanged universes at least every keepAlive seconds, unless their controller defines its own
+        self.keepAlive = keepAlive
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="Multiverse") if workers else None
+        # universeId: (generation of the last sent frame, time it was sent)
+        self._sent: Dict[int, tuple] = {}
+        # Universe frames handed to the controllers and unchanged ones which weren't sent
+        self.framesSent = 0
+        self.framesUnchanged = 0
+        # Called at the start of every tick to render into the universe buffers
+        self.renderers: List[Callable[[], object]] = []
+        # Called once all universes of a tick were committed, before they are sent
+        self.monitors: List[Callable[[], object]] = []
+        # Pipeline metrics shared with the controllers, only collected once enabled
+        self.metrics: Optional[FrameMetrics] = None
+        self.scheduler = FrameScheduler(self.tick, framerate, name="Multiverse")
+        self.scheduler.start()
+
+    def __getitem__(self, universeId: int) -> Universe:
+        return self.universes[universeId]
+
+    def __contains__(self, universeId: int) -> bool:
+        return universeId in self.universes
+
+    def __len__(self) -> int:
+        return len(self.universes)
+
+    def addUniverse(self, universeId: int, universe: Universe = None) -> Universe:
+        if universeId in self.universes:
+            raise KeyError(f"The universe {universeId} already exists.")
+        if universe is None:
+            universe = Universe()
+        self.universes[universeId] = universe
+        if self.metrics is not None and universe.controller is not None:
+            universe.controller.enableMetrics(self.metrics, str(universeId))
+        return universe
+
+    def removeUniverse(self, universeId: int) -> Universe:
+        self._sent.pop(universeId, None)
+        return self.universes.pop(universeId)
+
+    @property
+    def active(self) -> bool:
+        return self.scheduler.active
+
+    @property
+    def framerate(self) -> float:
+        return self.scheduler.framerate
+
+    @framerate.setter
+    def framerate(self, value: float):
+        self.scheduler.framerate = value
+
+    @property
+    def stats(self) -> dict:
+        stats = self.scheduler.stats()
+        stats.update(framesSent=self.framesSent, framesUnchanged=self.framesUnchanged)
+        return stats
+
+    def enableMetrics(self, metrics: Optional[FrameMetrics] = None, engines=()) -> FrameMetrics:
+        """
+        Collecting the pipeline metrics of the Multiverse and the controllers of its universes (counted by
+        universe id), the merge times of the MergeEngines given in engines as well
+        """
+        self.metrics = metrics or FrameMetrics()
+        for universeId, universe in self.universes.items():
+            if universe.controller is not None:
+                universe.controller.enableMetrics(self.metrics, str(universeId))
+        for engine in engines:
+            engine.metrics = self.metrics
+        return self.metrics
+
+    def disableMetrics(self):
+        for universe in self.universes.values():
+            if universe.controller is not None and universe.controller.metrics is self.metrics:
+                universe.controller.disableMetrics()
+        self.metrics = None
+
+    def activate(self):
+        self.scheduler.resume()
+
+    def deactivate(self):
+        self.scheduler.pause()
+
+    def close(self):
+        self.scheduler.stop()
+        if self._executor:
+            self._executor.shutdown()
+
+    def tick(self):
+        """Rendering and sending one frame of every universe"""
+        metrics = self.metrics
+        if metrics is None:
+            for render in self.renderers:
+                render()
+        else:
+            metrics.begin(self.scheduler.period, clock=self.scheduler)
+            start = perf_counter()
+            for render in self.renderers:
+                render()
+            metrics.rendered(perf_counter() - start)
+        now = perf_counter()
+        due = []
+        for universeId, universe in self.universes.items():
+            universe.commit()
+            controller = universe.controller
+            if controller is None:
+                continue
+            generation = universe.buffer.generation
+            keepAlive = self.keepAlive if controller.keepAlive is None else controller.keepAlive
+            last = self._sent.get(universeId)
+            if last is not None and last[0] == generation and now - last[1] < keepAlive:
+                self.framesUnchanged += 1
+                if metrics is not None:
+                    metrics.unchanged(str(universeId))
+                continue
+            self._sent[universeId] = (generation, now)
+            due.append(controller)
+        for monitor in self.monitors:
+            monitor()
+        if due:
+            self.framesSent += len(due)
+            self._send(due)
+
+    def _send(self, controllers: List[DMXController]):
+        groups: Dict[type, List[DMXController]] = {}
+        for controller in controllers:
+            groups.setdefault(type(controller), []).append(controller)
+
+        if self._executor is None:
+            for cls, group in groups.items():
+                cls.writeMany(group)
+            return
+
+        # Splitting every group into one chunk per worker and waiting for all of them,
+        # so the next tick never overlaps with the sending of this one
+        futures = []
+        for cls, group in groups.items():
+            chunk = -(-len(group) // self.workers)
+            for start in range(0, len(group), chunk):
+                futures.append(self._executor.submit(cls.writeMany, group[start : start + chunk]))
+        for future in wait(futures).done:
+            future.result()
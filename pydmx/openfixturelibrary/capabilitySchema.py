@@ -1,15 +1,28 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Union, NewType
+from typing import Dict, List, Optional, Union
 
 from pydmx.openfixturelibrary.definitionsSchema import (
     Angle,
     Brightness,
     Color,
     ColorTemperatureType,
+    Distance,
     Duration,
+    FogOutputType,
+    FrostIntensity,
+    HorizontalAngle,
+    Insertion,
     MinMax,
-    Speed,
+    OpenPercent,
+    Parameter,
+    ShakeAngle,
+    ShakeSpeed,
+    SlotNumber,
+    SoundSensitivityType,
+    SpeedType,
+    TimeType,
+    VerticalAngle,
 )
 
 
@@ -70,30 +83,30 @@ class MenuClick(Enum):
     HIDDEN = "hidden"
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class CapabilitySchema:
     """Parent Schema for all Capabilities"""
 
-    # Range of DMX values e.g. 0 to 255 (in most cases) the capability can be applied at
-    dmxRange: Optional[MinMax]
     # Capability from the list above
     type: str
+    # Range of DMX values e.g. 0 to 255 (in most cases) the capability can be applied at
+    dmxRange: Optional[MinMax] = None
     # Comment with further descriptions
-    comment: Optional[str]
+    comment: Optional[str] = None
     # If the fixture entry needs some love
-    helpWanted: Optional[str]
-    #
-    menuclick: Optional[MenuClick]
+    helpWanted: Optional[str] = None
+    # Where lighting programs put the capability in their click menus
+    menuClick: Optional[MenuClick] = None
     # A switching channel is a channel whose functionality depends on the value of another channel in the same mode.
-    switchChannels: Optional[Dict[str, str]]
+    switchChannels: Optional[Dict[str, str]] = None
 
 
 #
 # NoFunction
 #
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class NoFunction(CapabilitySchema):
-    type: CapabilityType.NOFUNCTION
+    pass
 
 
 #
@@ -111,103 +124,329 @@ class ShutterEffect(Enum):
     RAMPUPDOWN = "RampUpDown"
     LIGHTNING = "Lightning"
     SPIKES = "Spikes"
+    BURST = "Burst"
 
 
-@dataclass
-class ShutterStrobe(CapabilitySchema, Speed, Duration):
-    type = CapabilityType.SHUTTERSTROBE.value
+@dataclass(slots=True, kw_only=True)
+class ShutterStrobe(CapabilitySchema, SpeedType, Duration):
     shutterEffect: ShutterEffect
     # Sound COntroll Toggle
-    soundControlled: Optional[bool]
-    randomTiming: Optional[bool]
+    soundControlled: Optional[bool] = None
+    randomTiming: Optional[bool] = None
 
 
 #
 # StrobeSpeed
 #
-@dataclass
-class StrobeSpeed(CapabilitySchema, Speed):
-    type = "StrobeSpeed"
+@dataclass(slots=True, kw_only=True)
+class StrobeSpeed(CapabilitySchema, SpeedType):
+    pass
 
 
 #
 # StrobeDuration
 #
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class StrobeDuration(CapabilitySchema, Duration):
-    type = CapabilityType.STROBEDURATION.value
+    pass
 
 
 #
 # Intensity
 #
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class Intensity(CapabilitySchema, Brightness):
-    type = CapabilityType.INTENSITY.value
+    pass
 
 
 #
 # ColorIntensity
 #
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class ColorIntensity(CapabilitySchema, Brightness):
-    type = CapabilityType.COLORINTENSITY.value
     color: Color
 
 
 #
 # ColorPreset
 #
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class ColorPreset(CapabilitySchema, ColorTemperatureType):
-    type = CapabilityType.COLORTEMPERATURE.value
-    colors: Optional[List[str]]
-    colorsStart: Optional[List[str]]
-    colorsEnd: Optional[List[str]]
+    colors: Optional[List[str]] = None
+    colorsStart: Optional[List[str]] = None
+    colorsEnd: Optional[List[str]] = None
 
 
 #
 # ColorTemperature
 #
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class ColorTemperature(CapabilitySchema, ColorTemperatureType):
-    type = CapabilityType.COLORTEMPERATURE.value
+    pass
 
 
 #
 # Pan
 #
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class Pan(CapabilitySchema, Angle):
-    type = CapabilityType.PAN.value
+    pass
 
 
 #
 # PanContinuous
 #
-@dataclass
-class PanContinuous(CapabilitySchema, Speed):
-    type = CapabilityType.PANCONTINUOUS.value
+@dataclass(slots=True, kw_only=True)
+class PanContinuous(CapabilitySchema, SpeedType):
+    pass
 
 
 #
 # Tilt
 #
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class Tilt(CapabilitySchema, Angle):
-    type = "Tilt"
-
-
-Capabilities = Union[
-    NoFunction,
-    ShutterStrobe,
-    StrobeSpeed,
-    StrobeDuration,
-    Intensity,
-    ColorIntensity,
-    ColorPreset,
-    ColorTemperature,
-    Pan,
-    PanContinuous,
-    Tilt,
-]
+    pass
+
+
+#
+# TiltContinuous
+#
+@dataclass(slots=True, kw_only=True)
+class TiltContinuous(CapabilitySchema, SpeedType):
+    pass
+
+
+#
+# PanTiltSpeed
+#
+@dataclass(slots=True, kw_only=True)
+class PanTiltSpeed(CapabilitySchema, SpeedType, Duration):
+    pass
+
+
+#
+# Wheels
+#
+@dataclass(slots=True, kw_only=True)
+class WheelSlot(CapabilitySchema, SlotNumber):
+    # Name of the wheel, the channel name if not given. Several wheels can be moved together.
+    wheel: Optional[Union[str, List[str]]] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class WheelShake(CapabilitySchema, SlotNumber, ShakeSpeed, ShakeAngle):
+    wheel: Optional[Union[str, List[str]]] = None
+    # "wheel" or "slot"
+    isShaking: Optional[str] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class WheelSlotRotation(CapabilitySchema, SlotNumber, SpeedType, Angle):
+    wheel: Optional[Union[str, List[str]]] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class WheelRotation(CapabilitySchema, SpeedType, Angle):
+    wheel: Optional[Union[str, List[str]]] = None
+
+
+#
+# Effects
+#
+@dataclass(slots=True, kw_only=True)
+class Effect(CapabilitySchema, SpeedType, Duration, Parameter, SoundSensitivityType):
+    # Either a free text effect name or one of the predefined effect presets
+    effectName: Optional[str] = None
+    effectPreset: Optional[str] = None
+    soundControlled: Optional[bool] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class EffectSpeed(CapabilitySchema, SpeedType):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class EffectDuration(CapabilitySchema, Duration):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class EffectParameter(CapabilitySchema, Parameter):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class SoundSensitivity(CapabilitySchema, SoundSensitivityType):
+    pass
+
+
+#
+# Beam
+#
+@dataclass(slots=True, kw_only=True)
+class BeamAngle(CapabilitySchema, Angle):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class BeamPosition(CapabilitySchema, HorizontalAngle, VerticalAngle):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class Focus(CapabilitySchema, Distance):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class Zoom(CapabilitySchema, Angle):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class Iris(CapabilitySchema, OpenPercent):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class IrisEffect(CapabilitySchema, SpeedType):
+    effectName: Optional[str] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class Frost(CapabilitySchema, FrostIntensity):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class FrostEffect(CapabilitySchema, SpeedType):
+    effectName: Optional[str] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class Prism(CapabilitySchema, SpeedType, Angle):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class PrismRotation(CapabilitySchema, SpeedType, Angle):
+    pass
+
+
+#
+# Blades
+#
+@dataclass(slots=True, kw_only=True)
+class BladeInsertion(CapabilitySchema, Insertion):
+    # "Top", "Right", "Bottom", "Left" or the number of the blade
+    blade: Union[str, int]
+
+
+@dataclass(slots=True, kw_only=True)
+class BladeRotation(CapabilitySchema, Angle):
+    blade: Union[str, int]
+
+
+@dataclass(slots=True, kw_only=True)
+class BladeSystemRotation(CapabilitySchema, Angle):
+    pass
+
+
+#
+# Fog
+#
+@dataclass(slots=True, kw_only=True)
+class Fog(CapabilitySchema, FogOutputType):
+    # "Fog" or "Haze"
+    fogType: Optional[str] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class FogOutput(CapabilitySchema, FogOutputType):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class FogType(CapabilitySchema):
+    fogType: str
+
+
+#
+# Others
+#
+@dataclass(slots=True, kw_only=True)
+class Rotation(CapabilitySchema, SpeedType, Angle):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class Speed(CapabilitySchema, SpeedType):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class Time(CapabilitySchema, TimeType):
+    pass
+
+
+@dataclass(slots=True, kw_only=True)
+class Maintenance(CapabilitySchema, Parameter):
+    # The value has to be held for a time to trigger the action, e.g. "3s"
+    hold: Optional[str] = None
+
+
+@dataclass(slots=True, kw_only=True)
+class Generic(CapabilitySchema):
+    pass
+
+
+# CapabilityType value: dataclass, the type field of a capability selects its dataclass
+CAPABILITY_CLASSES = {
+    CapabilityType.NOFUNCTION.value: NoFunction,
+    CapabilityType.SHUTTERSTROBE.value: ShutterStrobe,
+    CapabilityType.STROBESPEED.value: StrobeSpeed,
+    CapabilityType.STROBEDURATION.value: StrobeDuration,
+    CapabilityType.INTENSITY.value: Intensity,
+    CapabilityType.COLORINTENSITY.value: ColorIntensity,
+    CapabilityType.COLORPRESET.value: ColorPreset,
+    CapabilityType.COLORTEMPERATURE.value: ColorTemperature,
+    CapabilityType.PAN.value: Pan,
+    CapabilityType.PANCONTINUOUS.value: PanContinuous,
+    CapabilityType.TILT.value: Tilt,
+    CapabilityType.TILTCONTINUOUS.value: TiltContinuous,
+    CapabilityType.PANTILTSPEED.value: PanTiltSpeed,
+    CapabilityType.WHEELSLOT.value: WheelSlot,
+    CapabilityType.WHEELSHAKE.value: WheelShake,
+    CapabilityType.WHEELSLOTROTATION.value: WheelSlotRotation,
+    CapabilityType.WHEELROTATION.value: WheelRotation,
+    CapabilityType.EFFECT.value: Effect,
+    CapabilityType.EFFECTSPEED.value: EffectSpeed,
+    CapabilityType.EFFECTDURATION.value: EffectDuration,
+    CapabilityType.EFFECTPARAMETER.value: EffectParameter,
+    CapabilityType.SOUNDSENSITIVITY.value: SoundSensitivity,
+    CapabilityType.BEAMANGLE.value: BeamAngle,
+    CapabilityType.BEAMPOSITION.value: BeamPosition,
+    CapabilityType.FOCUS.value: Focus,
+    CapabilityType.ZOOM.value: Zoom,
+    CapabilityType.IRIS.value: Iris,
+    CapabilityType.IRISEFFECT.value: IrisEffect,
+    CapabilityType.FROST.value: Frost,
+    CapabilityType.FROSTEFFECT.value: FrostEffect,
+    CapabilityType.PRISM.value: Prism,
+    CapabilityType.PRISMROTATION.value: PrismRotation,
+    CapabilityType.BLADEINSERTION.value: BladeInsertion,
+    CapabilityType.BLADEROTATION.value: BladeRotation,
+    CapabilityType.BLADESYSTEMROTATION.value: BladeSystemRotation,
+    CapabilityType.FOG.value: Fog,
+    CapabilityType.FOGOUTPUT.value: FogOutput,
+    CapabilityType.FOGTYPE.value: FogType,
+    CapabilityType.ROTATION.value: Rotation,
+    CapabilityType.SPEED.value: Speed,
+    CapabilityType.TIME.value: Time,
+    CapabilityType.MAINTENANCE.value: Maintenance,
+    CapabilityType.GENERIC.value: Generic,
+}
+
+Capabilities = Union[tuple(CAPABILITY_CLASSES.values())]
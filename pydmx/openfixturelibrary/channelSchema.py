@@ -22,26 +22,26 @@ class Precedence(Enum):
     HTP = "HTP"
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class ChannelSchema:
     """Definition of a specific Channel of a fixture"""
 
     # Channel name
-    name: Optional[str]
+    name: Optional[str] = None
     # fineChannelAliases
-    fineChannelAliases: Optional[List[str]]
+    fineChannelAliases: Optional[List[str]] = None
     # The DMX Resolution of the Channel
-    dmxValueResolution: Optional[DmxResolution]
+    dmxValueResolution: Optional[DmxResolution] = None
     # Default Value of the Channel either as a number or in percent
-    defaultValue: Optional[Union[int, str]]
+    defaultValue: Optional[Union[int, str]] = None
     # Highlight Value of the Channel either as a number or in percent
-    highlightValue: Optional[Union[int, str]]
+    highlightValue: Optional[Union[int, str]] = None
     # If constant is true, the channel should be set to a static value in the operating lighting program
-    constant: Optional[bool]
+    constant: Optional[bool] = None
     # precedence specifies to which value the channel should be set if there are two conflicting active cues containing this channel:
     # HTP (Highest takes precedence) or LTP (Latest (change) takes precedence).
-    precedence: Optional[Precedence]
+    precedence: Optional[Precedence] = None
     # The Capability of this Channel
-    capability: Optional[Capabilities]
+    capability: Optional[Capabilities] = None
     # Capabilities of the Channel if multiple are defined
-    capabilities: Optional[List[Capabilities]]
+    capabilities: Optional[List[Capabilities]] = None
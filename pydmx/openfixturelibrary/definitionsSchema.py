@@ -1,11 +1,15 @@
 """
 Standard non purpose related schemas.
+
+The entity mixins (Angle, Brightness, Speed, ...) only add their fields and have empty __slots__,
+so capabilities can combine several of them and still use slots.
 """
 from dataclasses import dataclass
-from typing import NamedTuple, Optional
+from typing import NamedTuple, Optional, Union
 from enum import Enum
 
-@dataclass
+
+@dataclass(kw_only=True)
 class Angle:
     """
     Degrees, Percent or Enum:
@@ -15,18 +19,22 @@ class Angle:
     swingAngle: ["closed", "narrow", "wide"]
     """
 
-    angle: str
-    angleStart: str
-    angleEnd: str
+    __slots__ = ()
 
+    angle: Optional[str] = None
+    angleStart: Optional[str] = None
+    angleEnd: Optional[str] = None
 
-@dataclass
+
+@dataclass(kw_only=True)
 class Brightness:
     """Brightness in lumens, percent, "enum":["off", "dark", "bright"]"""
 
-    brightness: Optional[str]
-    brightnessStart: Optional[str]
-    brightnessEnd: Optional[str]
+    __slots__ = ()
+
+    brightness: Optional[str] = None
+    brightnessStart: Optional[str] = None
+    brightnessEnd: Optional[str] = None
 
 
 class Color(Enum):
@@ -47,13 +55,15 @@ class Color(Enum):
     INDIGO = "Indigo"
 
 
-@dataclass
+@dataclass(kw_only=True)
 class ColorTemperatureType:
     """Color Temperature in kelvin, percent, "enum": ["warm", "CTO", "default", "cold", "CTB"]"""
 
-    colorTemperature: Optional[str]
-    colorTemperatureStart: Optional[str]
-    colorTemperatureEnd: Optional[str]
+    __slots__ = ()
+
+    colorTemperature: Optional[str] = None
+    colorTemperatureStart: Optional[str] = None
+    colorTemperatureEnd: Optional[str] = None
 
 
 class Dimensions(NamedTuple):
@@ -64,13 +74,70 @@ class Dimensions(NamedTuple):
     z: float
 
 
-@dataclass
+@dataclass(kw_only=True)
+class Distance:
+    """Distance in meters, percent, "enum": ["near", "far"]"""
+
+    __slots__ = ()
+
+    distance: Optional[str] = None
+    distanceStart: Optional[str] = None
+    distanceEnd: Optional[str] = None
+
+
+@dataclass(kw_only=True)
 class Duration:
     """Duration in seconds, milliseconds,percent, "enum": ["instant", "short", "long"]"""
 
-    duration: Optional[str]
-    durationStart: Optional[str]
-    durationEnd: Optional[str]
+    __slots__ = ()
+
+    duration: Optional[str] = None
+    durationStart: Optional[str] = None
+    durationEnd: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class FogOutputType:
+    """Fog output in cubic meters per minute, percent, "enum": ["off", "weak", "strong"]"""
+
+    __slots__ = ()
+
+    fogOutput: Optional[str] = None
+    fogOutputStart: Optional[str] = None
+    fogOutputEnd: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class FrostIntensity:
+    """Frost intensity in percent, "enum": ["off", "low", "high"]"""
+
+    __slots__ = ()
+
+    frostIntensity: Optional[str] = None
+    frostIntensityStart: Optional[str] = None
+    frostIntensityEnd: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class HorizontalAngle:
+    """Horizontal beam position in degrees or percent, "enum": ["left", "center", "right"]"""
+
+    __slots__ = ()
+
+    horizontalAngle: Optional[str] = None
+    horizontalAngleStart: Optional[str] = None
+    horizontalAngleEnd: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class Insertion:
+    """Insertion of a blade in percent, "enum": ["out", "in"]"""
+
+    __slots__ = ()
+
+    insertion: Optional[str] = None
+    insertionStart: Optional[str] = None
+    insertionEnd: Optional[str] = None
 
 
 class MinMax(NamedTuple):
@@ -80,10 +147,100 @@ class MinMax(NamedTuple):
     maximum: int
 
 
-@dataclass
-class Speed:
+@dataclass(kw_only=True)
+class OpenPercent:
+    """Iris opening in percent, "enum": ["closed", "open"]"""
+
+    __slots__ = ()
+
+    openPercent: Optional[str] = None
+    openPercentStart: Optional[str] = None
+    openPercentEnd: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class Parameter:
+    """Generic parameter as number or percent, "enum": ["off", "low", "high", "slow", "fast", "small", "big", "instant", "short", "long"]"""
+
+    __slots__ = ()
+
+    parameter: Optional[Union[str, float]] = None
+    parameterStart: Optional[Union[str, float]] = None
+    parameterEnd: Optional[Union[str, float]] = None
+
+
+@dataclass(kw_only=True)
+class ShakeAngle:
+    """Angle of a wheel shake in degrees or percent"""
+
+    __slots__ = ()
+
+    shakeAngle: Optional[str] = None
+    shakeAngleStart: Optional[str] = None
+    shakeAngleEnd: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class ShakeSpeed:
+    """Speed of a wheel shake in hertz, beatsPerMinute, percent, "enum": ["fast", "slow", "stop"]"""
+
+    __slots__ = ()
+
+    shakeSpeed: Optional[str] = None
+    shakeSpeedStart: Optional[str] = None
+    shakeSpeedEnd: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class SlotNumber:
+    """Wheel slot number, fractions are between two slots (e.g. 1.5 for a split color)"""
+
+    __slots__ = ()
+
+    slotNumber: Optional[float] = None
+    slotNumberStart: Optional[float] = None
+    slotNumberEnd: Optional[float] = None
+
+
+@dataclass(kw_only=True)
+class SoundSensitivityType:
+    """Sound sensitivity in percent, "enum": ["off", "low", "high"]"""
+
+    __slots__ = ()
+
+    soundSensitivity: Optional[str] = None
+    soundSensitivityStart: Optional[str] = None
+    soundSensitivityEnd: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class SpeedType:
     """Speed in hertz, beatsPerMinute, percent, "enum": ["fast", "slow", "stop", "slow reverse", "fast reverse"]"""
 
-    speed: Optional[str]
-    speedStart: Optional[str]
-    speedEnd: Optional[str]
+    __slots__ = ()
+
+    speed: Optional[str] = None
+    speedStart: Optional[str] = None
+    speedEnd: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class TimeType:
+    """Time in seconds, milliseconds, percent, "enum": ["instant", "short", "long"]"""
+
+    __slots__ = ()
+
+    time: Optional[str] = None
+    timeStart: Optional[str] = None
+    timeEnd: Optional[str] = None
+
+
+@dataclass(kw_only=True)
+class VerticalAngle:
+    """Vertical beam position in degrees or percent, "enum": ["top", "center", "bottom"]"""
+
+    __slots__ = ()
+
+    verticalAngle: Optional[str] = None
+    verticalAngleStart: Optional[str] = None
+    verticalAngleEnd: Optional[str] = None
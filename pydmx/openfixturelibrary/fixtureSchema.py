@@ -38,7 +38,7 @@ class FixtureCategories(Enum):
     OTHER = "Other"
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class ImportPluginSchema:
     """Metadata about how the fixture entry got imported."""
 
@@ -47,10 +47,10 @@ class ImportPluginSchema:
     # isoDateString
     date: str
     # Multiline Comment
-    comment: Optional[str]
+    comment: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class MetaSchema:
     """Metadata about the fixture entry."""
 
@@ -61,31 +61,31 @@ class MetaSchema:
     # isoDateString e.g. 2020-09-20
     lastModifyDate: str
     # if the Schema got imported from a specific software
-    importPlugin: Optional[ImportPluginSchema]
+    importPlugin: Optional[ImportPluginSchema] = None
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class LinksSchema:
     """Collection of Links to various Ressources"""
 
     # Link to the the Manual of the fixture as url
-    manual: Optional[List[str]]
+    manual: Optional[List[str]] = None
     # Link to the product Page of the manufacturer as url
-    productPage: Optional[List[str]]
+    productPage: Optional[List[str]] = None
     # Link to example Video as url
-    video: Optional[List[str]]
+    video: Optional[List[str]] = None
     # Link to additional Ressources as url
-    other: Optional[List[str]]
+    other: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class RDMSchema:
     """If the fixture supports RDM, the modelId is required: https://www.rdmprotocol.org/rdm/what-is-rdm/"""
 
     # The model id of the RDM supporting fixture: value between 0 and 65535
     modelId: int
     # The SoftwareVersion of RDM the fixture can support
-    softwareVersion: Optional[str]
+    softwareVersion: Optional[str] = None
 
 
 class DMXConnector(Enum):
@@ -100,54 +100,54 @@ class DMXConnector(Enum):
     STEREOJACK = "3.5mm stereo jack"
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class BulbSchema:
     """Information about the Bulbs in the fixture"""
 
     # e.g. LED
-    type: Optional[str]
+    type: Optional[str] = None
     # Temperature of the Color in Kelvin
-    colorTemperatur: Optional[int]
+    colorTemperature: Optional[float] = None
     # Lumens of the bulb
-    lumens: Optional[int]
+    lumens: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class LensSchema:
     """Specifics about the Lens in the fixture"""
 
     # e.g. 'PC', 'Fresnel
-    name: Optional[str]
+    name: Optional[str] = None
     # Maximum and Minimum degrees of Lens from 0 to 360
-    degreesMinMax: Optional[MinMax]
+    degreesMinMax: Optional[MinMax] = None
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class MatrixPixelsSchema:
     """Additional dimension data about a LED-matrix"""
 
-    dimensions: Optional[Dimensions]
-    spacing: Optional[Dimensions]
+    dimensions: Optional[Dimensions] = None
+    spacing: Optional[Dimensions] = None
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class PhysicalSchema:
     """Physical properties of a fixture"""
 
     # The Dimensions of the Fixture x,y,z
-    dimensions: Optional[Dimensions]
+    dimensions: Optional[Dimensions] = None
     # Weight in kg
-    weight: Optional[float]
+    weight: Optional[float] = None
     # power consumption in Watts
-    power: Optional[int]
+    power: Optional[float] = None
     # Physical DMX Connector Types: THREEPIN, FIVEPINXLR
-    dmxConnector: Optional[DMXConnector]
+    dmxConnector: Optional[DMXConnector] = None
     # Extra info about the built in bulb
-    bulb: Optional[BulbSchema]
+    bulb: Optional[BulbSchema] = None
     # Extra info about the built in lens
-    lens: Optional[LensSchema]
+    lens: Optional[LensSchema] = None
     # Extra dimension info about the Pixel matrix
-    matrixPixels: Optional[MatrixPixelsSchema]
+    matrixPixels: Optional[MatrixPixelsSchema] = None
 
 
 class RepeatFor(Enum):
@@ -170,7 +170,19 @@ class ChannelOrder(Enum):
     PERCHANNEL = "perChannel"
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
+class MatrixSchema:
+    """Pixel layout of a matrix fixture, defined either by pixelCount or by pixelKeys"""
+
+    # Number of pixels in x, y and z direction, the pixel keys are generated from the positions
+    pixelCount: Optional[List[int]] = None
+    # Pixel keys in a [z][y][x] structure, null for positions without a pixel
+    pixelKeys: Optional[List[List[List[Optional[str]]]]] = None
+    # Named groups of pixels: "all", a list of pixel keys or constraints on the x, y, z positions and the names
+    pixelGroups: Optional[Dict[str, Union[str, List[str], Dict[str, List[str]]]]] = None
+
+
+@dataclass(slots=True, kw_only=True)
 class MatrixChannels:
     """Custom channel setting extensions for matrix fixtures"""
 
@@ -180,46 +192,46 @@ class MatrixChannels:
     insert: str = "matrixChannels"
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class ModesSchema:
     """Defining the choosable modes for a fixture."""
 
     name: str
-    shortName: Optional[str]
-    rdmPersonalityIndex: Optional[int]
-    physical: Optional[PhysicalSchema]
+    shortName: Optional[str] = None
+    rdmPersonalityIndex: Optional[int] = None
+    physical: Optional[PhysicalSchema] = None
     channels: List[Union[None, str, MatrixChannels]]
 
 
-@dataclass
+@dataclass(slots=True, kw_only=True)
 class FixtureSchema:
     """Python Schema of a DMX fixture following the open-fixture-library schemas"""
 
     # unique in manufacturer
     name: str
     # unique in OpenFixtureLibrary
-    shortName: Optional[str]
+    shortName: Optional[str] = None
     # most important category first. All items are unique.
     categories: List[FixtureCategories]
     # information about the fixture entry
     meta: MetaSchema
     # Comment with additional Information about the fixture
-    comment: Optional[str]
+    comment: Optional[str] = None
     # Links to additional ressources about the fixture
-    links: Optional[LinksSchema]
+    links: Optional[LinksSchema] = None
     # If the fixture entry needs some love
-    helpWanted: Optional[str]
+    helpWanted: Optional[str] = None
     # If the fixture supports RDM
-    rdm: Optional[RDMSchema]
+    rdm: Optional[RDMSchema] = None
     # Physical descriptions of the fixture e.g. mass, size, bulb etc...
-    physical: Optional[PhysicalSchema]
-    # TODO: Matrix Schema
-    matrix: Optional[str]
-    # TODO: Wheel Schema
-    wheels: Optional[str]
+    physical: Optional[PhysicalSchema] = None
+    # Pixel layout of matrix fixtures, the template channels are repeated for its pixels
+    matrix: Optional[MatrixSchema] = None
+    # TODO: Wheel Schema, kept as the raw dict until then
+    wheels: Optional[dict] = None
     # List of all the available Channels with their settings for the fixture
-    availableChannels: Optional[Dict[str, ChannelSchema]]
+    availableChannels: Optional[Dict[str, ChannelSchema]] = None
     # Template Channels
-    templateChannels: Optional[Dict[str, ChannelSchema]]
+    templateChannels: Optional[Dict[str, ChannelSchema]] = None
     # Mode
     modes: List[ModesSchema]
@@ -1,32 +1,194 @@
+"""
+Bulking the fixtures of the open-fixture-library into a single ofl.json
+
+The fixtures are parsed and normalized in a process pool and streamed into the output file,
+so the library is never held in memory as a whole.
+A manifest of the last build (ofl.manifest.json) stores the mtime, size and hash of every source file.
+On an incremental build only changed files are parsed again, the others are copied from the previous ofl.json.
+
+Usage: python -m pydmx.openfixturelibrary.oflbulker path/to/open-fixture-library/fixtures [-o ofl.json] [-j 4] [--full]
+"""
+
+import argparse
+import hashlib
 import json
 import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
-directory = "./"
+from pydmx.openfixturelibrary.oflindex import OflLibrary, writeBulkRaw, writeIndex
+from pydmx.openfixturelibrary.oflsearch import buildSearchIndex, writeSearchIndex
 
-manufacturers = []
+MANIFEST_VERSION = 1
 
 # For export the following structure is created:
 # {
-#   manufacturerX$fixtureX: {}
+#   manufacturerX#fixtureX: {},
+#   _manufacturers: [manufacturerX, ...]
 # }
 #
-ofl = {}
-
-# Iterating over OFL
-for dirnum, (root, dirs, files) in enumerate(os.walk(directory, topdown=True)):
-    # First Directory is the Directory containing the different manufacturers
-    if dirnum == 0:
-        manufacturers = dirs
-        continue
-
-    for file in files:
-        content = open(os.path.join(root, file), encoding="utf-8")
-        parsed_content = json.load(content)
-        manufacturer = parsed_content["manufacturerKey"]
-        fixture = parsed_content["fixtureKey"]
-        ofl[manufacturer + "#" + fixture] = parsed_content
-
-ofl["_manufacturers"] = manufacturers
-
-with open("ofl.json", "w") as outfile:
-    json.dump(ofl, outfile)
+# Next to it an index with the byte offset of every fixture is written (see oflindex.py),
+# so the FixtureIndex can parse single fixtures on demand, and the search index (see oflsearch.py).
+
+
+def manifestPath(oflPath: str) -> str:
+    root, _ = os.path.splitext(oflPath)
+    return root + ".manifest.json"
+
+
+def collectFixtures(directory: str) -> Tuple[List[str], List[str]]:
+    """Returns the manufacturers and the relative paths of all fixture files"""
+    manufacturers = []
+    fixtures = []
+    # Iterating over OFL
+    for dirnum, (root, dirs, files) in enumerate(os.walk(directory, topdown=True)):
+        dirs.sort()
+        # First Directory is the Directory containing the different manufacturers
+        if dirnum == 0:
+            manufacturers = list(dirs)
+            continue
+
+        for file in sorted(files):
+            if file.endswith(".json"):
+                fixtures.append(os.path.relpath(os.path.join(root, file), directory))
+    return manufacturers, fixtures
+
+
+def normalizeFixture(directory: str, relpath: str) -> Tuple[str, bytes, str]:
+    """
+    Parsing and normalizing a single fixture file.
+    Returns the fixture key, the serialized fixture and the hash of the source file.
+    """
+    with open(os.path.join(directory, relpath), "rb") as infile:
+        raw = infile.read()
+    parsed_content = json.loads(raw)
+    # Fixture files of the OFL repository don't contain their keys, they are given by the path
+    manufacturer, filename = os.path.split(relpath)
+    parsed_content.setdefault("manufacturerKey", os.path.basename(manufacturer))
+    parsed_content.setdefault("fixtureKey", os.path.splitext(filename)[0])
+    key = parsed_content["manufacturerKey"] + "#" + parsed_content["fixtureKey"]
+    return key, json.dumps(parsed_content).encode("utf-8"), hashlib.sha1(raw).hexdigest()
+
+
+def _loadManifest(oflPath: str) -> Dict[str, dict]:
+    try:
+        with open(manifestPath(oflPath), encoding="utf-8") as infile:
+            manifest = json.load(infile)
+        stat = os.stat(oflPath)
+        if manifest["version"] == MANIFEST_VERSION and (stat.st_size, stat.st_mtime_ns) == (manifest["size"], manifest["mtime"]):
+            return manifest["files"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def _unchanged(directory: str, relpath: str, previous: Optional[dict]) -> bool:
+    """Comparing mtime and size with the last build, and only if they differ the hash of the file"""
+    if previous is None:
+        return False
+    stat = os.stat(os.path.join(directory, relpath))
+    if stat.st_mtime_ns == previous["mtime"] and stat.st_size == previous["size"]:
+        return True
+    if stat.st_size != previous["size"]:
+        return False
+    with open(os.path.join(directory, relpath), "rb") as infile:
+        return hashlib.sha1(infile.read()).hexdigest() == previous["sha1"]
+
+
+def _entries(
+    directory: str,
+    relpaths: List[str],
+    previous: Dict[str, dict],
+    oldOfl: Optional[str],
+    executor: Optional[Executor],
+    window: int,
+    stats: Dict[str, int],
+) -> Iterator[Tuple[str, str, bytes, Optional[str]]]:
+    """Yielding (relpath, key, serialized fixture, hash) in source order while at most `window` files are in flight"""
+    pending = deque()
+    oldFile = open(oldOfl, "rb") if oldOfl else None
+    try:
+        for relpath in relpaths:
+            entry = previous.get(relpath)
+            if oldFile and _unchanged(directory, relpath, entry):
+                oldFile.seek(entry["offset"])
+                pending.append((relpath, entry["key"], oldFile.read(entry["length"]), entry["sha1"]))
+                stats["reused"] += 1
+            elif executor is None:
+                pending.append((relpath, *normalizeFixture(directory, relpath)))
+                stats["parsed"] += 1
+            else:
+                pending.append((relpath, executor.submit(normalizeFixture, directory, relpath)))
+                stats["parsed"] += 1
+
+            while len(pending) > window or (pending and len(pending[0]) == 4):
+                yield _resolve(pending.popleft())
+        while pending:
+            yield _resolve(pending.popleft())
+    finally:
+        if oldFile:
+            oldFile.close()
+
+
+def _resolve(item):
+    if len(item) == 2:
+        relpath, future = item
+        return (relpath, *future.result())
+    return item
+
+
+def build(directory: str, output: str = "ofl.json", jobs: Optional[int] = None, incremental: bool = True) -> Dict[str, int]:
+    """
+    Building the bulked library, its offset and search index and the manifest of the build.
+    Returns how many fixtures were parsed and how many were reused from the previous build.
+    """
+    manufacturers, relpaths = collectFixtures(directory)
+    previous = _loadManifest(output) if incremental and os.path.isfile(output) else {}
+    oldOfl = output if previous else None
+    jobs = jobs or os.cpu_count() or 1
+    stats = {"parsed": 0, "reused": 0}
+    files = {}
+
+    def items(executor):
+        for relpath, key, data, sha1 in _entries(directory, relpaths, previous, oldOfl, executor, jobs * 4, stats):
+            stat = os.stat(os.path.join(directory, relpath))
+            files[relpath] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha1": sha1, "key": key}
+            yield key, data
+        yield "_manufacturers", json.dumps(manufacturers).encode("utf-8")
+
+    # The previous library is still read while writing, so the new one replaces it at the end
+    temporary = output + ".tmp"
+    with open(temporary, "wb") as outfile:
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                offsets = writeBulkRaw(items(executor), outfile)
+        else:
+            offsets = writeBulkRaw(items(None), outfile)
+    os.replace(temporary, output)
+    writeIndex(output, offsets)
+    library = OflLibrary(output, cacheSize=0)
+    writeSearchIndex(output, buildSearchIndex((key, library[key]) for key in library if key != "_manufacturers"))
+
+    for entry in files.values():
+        entry["offset"], entry["length"] = offsets[entry["key"]]
+    with open(manifestPath(output), "w", encoding="utf-8") as outfile:
+        stat = os.stat(output)
+        json.dump({"version": MANIFEST_VERSION, "size": stat.st_size, "mtime": stat.st_mtime_ns, "files": files}, outfile)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulking the open-fixture-library into a single ofl.json")
+    parser.add_argument("directory", help="fixtures directory of the open-fixture-library")
+    parser.add_argument("-o", "--output", default="ofl.json")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: cpu count)")
+    parser.add_argument("--full", action="store_true", help="parse every file again instead of only the changed ones")
+    args = parser.parse_args()
+
+    stats = build(args.directory, args.output, args.jobs, incremental=not args.full)
+    print(f"Wrote {args.output}: {stats['parsed']} fixtures parsed, {stats['reused']} reused")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Precompiled binary cache of the fixture library
+
+Converting a fixture dict into the FixtureSchema dataclasses is slow, so the whole library is validated and converted once
+and the resulting dataclass objects are pickled into a versioned cache file next to the ofl.json.
+Every fixture is pickled and compressed separately, so a lookup only unpickles the fixture it asks for.
+
+Cache structure (ofl.<schemaVersion>.cache):
+  MAGIC | header length (4 bytes, big endian) | pickled header | zlib compressed pickled fixtures...
+
+The header contains the cache format, the schema version, the size, mtime and hash of the source ofl.json
+(its sourceStamp, like the offset index), the offset and length of every pickled fixture and the errors of all
+fixtures which didn't fit the schema. If the format, the schema version or the source changed, the cache is rebuilt
+automatically, a touched but unchanged source keeps its cache.
+
+Build manually: python -m pydmx.openfixturelibrary.oflcache [path/to/ofl.json]
+"""
+
+import argparse
+import io
+import os
+import pickle
+import struct
+import zlib
+from functools import lru_cache
+from typing import Dict, Optional
+
+from pydmx.openfixturelibrary.fixtureSchema import FixtureSchema
+from pydmx.openfixturelibrary.ofldeserializer import fromDict
+from pydmx.openfixturelibrary.oflindex import OflLibrary, isCurrent, sourceStamp
+
+MAGIC = b"PYDMXOFL"
+CACHE_VERSION = 4
+
+_header = struct.Struct(">I")
+
+
+def cachePath(oflPath: str, schemaVersion: str) -> str:
+    """Path of the cache file belonging to a bulked library and schema version"""
+    root, _ = os.path.splitext(oflPath)
+    return f"{root}.{schemaVersion}.cache"
+
+
+def buildCache(oflPath: str, schemaVersion: str, path: Optional[str] = None) -> bytes:
+    """
+    Converting every fixture of the library and writing the cache file.
+    Returns the cache content, so it can still be used if the file couldn't be written.
+    """
+    library = OflLibrary(oflPath, cacheSize=0)
+    blobs = io.BytesIO()
+    fixtures = {}
+    errors = {}
+    for fixtureId in library:
+        if fixtureId.startswith("_"):
+            continue
+        try:
+            fixture = fromDict(library[fixtureId])
+        except Exception as error:
+            errors[fixtureId] = f"{type(error).__name__}: {error}"
+            continue
+        offset = blobs.tell()
+        blobs.write(zlib.compress(pickle.dumps(fixture, protocol=pickle.HIGHEST_PROTOCOL)))
+        fixtures[fixtureId] = (offset, blobs.tell() - offset)
+
+    header = pickle.dumps(
+        {
+            "version": CACHE_VERSION,
+            "schema": schemaVersion,
+            "source": sourceStamp(oflPath),
+            "fixtures": fixtures,
+            "errors": errors,
+        },
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    content = MAGIC + _header.pack(len(header)) + header + blobs.getvalue()
+    try:
+        with open(path or cachePath(oflPath, schemaVersion), "wb") as outfile:
+            outfile.write(content)
+    except OSError:
+        pass
+    return content
+
+
+def _readHeader(content: bytes) -> dict:
+    if content[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not a pydmx fixture cache.")
+    start = len(MAGIC) + _header.size
+    (length,) = _header.unpack_from(content, len(MAGIC))
+    header = pickle.loads(content[start : start + length])
+    header["start"] = start + length
+    return header
+
+
+class FixtureCache:
+    """
+    Read only mapping of fixture ids to FixtureSchema objects, backed by the binary cache.
+    The recently used fixtures are kept in a bounded LRU cache.
+    """
+
+    def __init__(self, oflPath: str, schemaVersion: str, cacheSize: int = 64):
+        self.schemaVersion = schemaVersion
+        path = cachePath(oflPath, schemaVersion)
+        try:
+            with open(path, "rb") as infile:
+                content = infile.read()
+            header = _readHeader(content)
+            if (
+                header["version"] != CACHE_VERSION
+                or header["schema"] != schemaVersion
+                or not isCurrent(header["source"], oflPath)
+            ):
+                header = None
+        except (OSError, ValueError, KeyError, TypeError, struct.error, pickle.UnpicklingError, EOFError, zlib.error):
+            # A missing, truncated or otherwise corrupt cache is rebuilt
+            header = None
+
+        if header is None:
+            content = buildCache(oflPath, schemaVersion, path)
+            header = _readHeader(content)
+
+        self._content = memoryview(content)
+        self._start = header["start"]
+        self._fixtures: Dict[str, tuple] = header["fixtures"]
+        self.errors: Dict[str, str] = header["errors"]
+        self._load = lru_cache(maxsize=cacheSize)(self._loadFixture)
+
+    def _loadFixture(self, fixtureId: str) -> FixtureSchema:
+        offset, length = self._fixtures[fixtureId]
+        offset += self._start
+        return pickle.loads(zlib.decompress(self._content[offset : offset + length]))
+
+    def __getitem__(self, fixtureId: str) -> FixtureSchema:
+        if fixtureId not in self._fixtures:
+            if fixtureId in self.errors:
+                raise ValueError(f"The fixture {fixtureId} didn't fit the Schema: {self.errors[fixtureId]}")
+            raise KeyError(fixtureId)
+        return self._load(fixtureId)
+
+    def __contains__(self, fixtureId: str) -> bool:
+        return fixtureId in self._fixtures
+
+    def __iter__(self):
+        return iter(self._fixtures)
+
+    def __len__(self) -> int:
+        return len(self._fixtures)
+
+
+def main():
+    from pydmx.fixture.fixture import Fixture
+
+    parser = argparse.ArgumentParser(description="Building the binary fixture cache")
+    parser.add_argument("ofl", nargs="?", default=os.path.join(os.path.dirname(__file__), "ofl.json"))
+    parser.add_argument("--schema", default=Fixture.getSchemaVersion(), help="schema version of the cache")
+    args = parser.parse_args()
+
+    content = buildCache(args.ofl, args.schema)
+    header = _readHeader(content)
+    print(f"Cached {len(header['fixtures'])} fixtures for schema {args.schema} in {cachePath(args.ofl, args.schema)}")
+    for fixtureId, error in header["errors"].items():
+        print(f"  skipped {fixtureId}: {error[:120]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Converting fixture dicts of the open-fixture-library into the schema dataclasses
+
+For every type hint of the schemas a converter function is compiled once and cached, so converting a fixture
+only calls the compiled functions instead of inspecting the type hints again for every value.
+Capabilities are dispatched on their "type" field to the matching dataclass (CAPABILITY_CLASSES) instead of trying
+every member of the Capabilities union in turn. Unions of other types are dispatched on the type of the value.
+Keys the schemas don't know (e.g. "$schema" or the keys added by the bulker) are ignored.
+"""
+
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from typing import Callable, Dict, Union, get_args, get_origin, get_type_hints
+
+from pydmx.openfixturelibrary.capabilitySchema import CAPABILITY_CLASSES, Capabilities
+from pydmx.openfixturelibrary.fixtureSchema import FixtureSchema
+
+Converter = Callable[[object], object]
+
+# type hint: compiled converter
+_converters: Dict[object, Converter] = {}
+
+# Types of the JSON values a converter of a plain type accepts
+_accepted = {str: (str,), int: (int,), float: (int, float), bool: (bool,), dict: (dict,), list: (list,)}
+
+
+def _typeName(value) -> str:
+    return type(value).__name__
+
+
+def _plain(hint: type) -> Converter:
+    accepted = _accepted[hint]
+
+    def convert(value):
+        if type(value) not in accepted:
+            raise TypeError(f"expected {hint.__name__}, got {_typeName(value)}")
+        return value
+
+    return convert
+
+
+def _enum(hint) -> Converter:
+    members = hint._value2member_map_
+
+    def convert(value):
+        try:
+            return members[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"{value!r} is not a valid {hint.__name__}") from None
+
+    return convert
+
+
+def _namedTuple(hint) -> Converter:
+    def convert(value):
+        if type(value) is not list:
+            raise TypeError(f"expected a list for {hint.__name__}, got {_typeName(value)}")
+        return hint(*value)
+
+    return convert
+
+
+def _list(hint) -> Converter:
+    (item,) = get_args(hint) or (object,)
+    convertItem = converter(item)
+
+    def convert(value):
+        if type(value) is not list:
+            raise TypeError(f"expected a list, got {_typeName(value)}")
+        return [convertItem(entry) for entry in value]
+
+    return convert
+
+
+def _dict(hint) -> Converter:
+    _, item = get_args(hint) or (str, object)
+    convertItem = converter(item)
+
+    def convert(value):
+        if type(value) is not dict:
+            raise TypeError(f"expected a dict, got {_typeName(value)}")
+        return {key: convertItem(entry) for key, entry in value.items()}
+
+    return convert
+
+
+def _dataclass(hint) -> Converter:
+    hints = get_type_hints(hint)
+    known = {field.name: converter(hints[field.name]) for field in fields(hint)}
+
+    def convert(value):
+        if type(value) is not dict:
+            raise TypeError(f"expected a dict for {hint.__name__}, got {_typeName(value)}")
+        kwargs = {}
+        for key, entry in value.items():
+            convertField = known.get(key)
+            if convertField is None:
+                continue
+            try:
+                kwargs[key] = convertField(entry)
+            except (TypeError, ValueError) as error:
+                raise ValueError(f"{hint.__name__}.{key}: {error}") from None
+        try:
+            return hint(**kwargs)
+        except TypeError as error:
+            raise ValueError(f"{hint.__name__}: {error}") from None
+
+    return convert
+
+
+def _capability() -> Converter:
+    classes = {capabilityType: converter(cls) for capabilityType, cls in CAPABILITY_CLASSES.items()}
+
+    def convert(value):
+        if type(value) is not dict:
+            raise TypeError(f"expected a capability dict, got {_typeName(value)}")
+        convertCapability = classes.get(value.get("type"))
+        if convertCapability is None:
+            raise ValueError(f"unknown capability type {value.get('type')!r}")
+        return convertCapability(value)
+
+    return convert
+
+
+def _accepts(hint) -> tuple:
+    """JSON value types a member of a union is converted from"""
+    origin = get_origin(hint)
+    if origin is list or (isinstance(hint, type) and issubclass(hint, tuple)):
+        return (list,)
+    if origin is dict or origin is Union or is_dataclass(hint):
+        return (dict,)
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        return tuple({type(member.value) for member in hint})
+    return _accepted.get(hint, ())
+
+
+def _union(hint) -> Converter:
+    members = get_args(hint)
+    if type(None) in members:
+        convertValue = converter(Union[tuple(member for member in members if member is not type(None))])
+        return lambda value: None if value is None else convertValue(value)
+
+    # JSON value type: converter of the first member accepting it
+    dispatch: Dict[type, Converter] = {}
+    for member in members:
+        for accepted in _accepts(member):
+            dispatch.setdefault(accepted, converter(member))
+    expected = " or ".join(getattr(member, "__name__", str(member)) for member in members)
+
+    def convert(value):
+        convertMember = dispatch.get(type(value))
+        if convertMember is None:
+            raise TypeError(f"expected {expected}, got {_typeName(value)}")
+        return convertMember(value)
+
+    return convert
+
+
+def converter(hint) -> Converter:
+    """Compiled converter of a type hint of the schemas"""
+    convert = _converters.get(hint)
+    if convert is not None:
+        return convert
+
+    origin = get_origin(hint)
+    if hint == Capabilities:
+        convert = _capability()
+    elif origin is Union:
+        convert = _union(hint)
+    elif origin is list:
+        convert = _list(hint)
+    elif origin is dict:
+        convert = _dict(hint)
+    elif hint is object:
+        convert = lambda value: value
+    elif hint in _accepted:
+        convert = _plain(hint)
+    elif isinstance(hint, type) and issubclass(hint, Enum):
+        convert = _enum(hint)
+    elif isinstance(hint, type) and issubclass(hint, tuple) and hasattr(hint, "_fields"):
+        convert = _namedTuple(hint)
+    elif is_dataclass(hint):
+        convert = _dataclass(hint)
+    else:
+        raise TypeError(f"No converter for the type {hint!r}")
+    _converters[hint] = convert
+    return convert
+
+
+def fromDict(fixture: dict) -> FixtureSchema:
+    """Validating and converting a fixture dict into the FixtureSchema dataclasses"""
+    return converter(FixtureSchema)(fixture)
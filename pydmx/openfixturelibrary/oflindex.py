@@ -0,0 +1,200 @@
+"""
+Byte offset index for the bulked ofl.json
+
+The index maps every key of ofl.json (manufacturer#fixture) to the byte offset and length of its JSON value.
+This way a single fixture can be read and parsed without loading the whole 4 MB library into memory.
+
+Index structure (ofl.index.json):
+{
+  "version": 2,
+  "size": <size of ofl.json in bytes>,
+  "mtime": <mtime of ofl.json in nanoseconds>,
+  "sha1": <hash of ofl.json>,
+  "fixtures": {
+    manufacturerX#fixtureX: [offset, length]
+  }
+}
+
+An index is current if size and mtime of ofl.json match. A checkout sets a new mtime, so with only the mtime
+differing the hash decides, which takes a few milliseconds instead of scanning the library.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Tuple
+
+INDEX_VERSION = 2
+
+_decoder = json.JSONDecoder()
+_whitespace = " \t\n\r"
+
+
+def indexPath(oflPath: str) -> str:
+    """Path of the index file belonging to a bulked library"""
+    root, _ = os.path.splitext(oflPath)
+    return root + ".index.json"
+
+
+def sourceStamp(oflPath: str) -> dict:
+    """Size, mtime and hash of a bulked library, stored in the files derived from it"""
+    stat = os.stat(oflPath)
+    with open(oflPath, "rb") as infile:
+        sha1 = hashlib.sha1(infile.read()).hexdigest()
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha1": sha1}
+
+
+def isCurrent(index: dict, oflPath: str) -> bool:
+    """Whether a file derived from a bulked library (index, search index) still matches its sourceStamp"""
+    stat = os.stat(oflPath)
+    if stat.st_size != index["size"]:
+        return False
+    if stat.st_mtime_ns == index["mtime"]:
+        return True
+    with open(oflPath, "rb") as infile:
+        return hashlib.sha1(infile.read()).hexdigest() == index["sha1"]
+
+
+def writeBulk(items: Iterable[Tuple[str, object]], outfile) -> Dict[str, Tuple[int, int]]:
+    """
+    Writing the library to a binary file object in the same format json.dump would produce.
+    Returns the byte offset and length of every written value.
+    """
+    return writeBulkRaw(((key, json.dumps(value).encode("utf-8")) for key, value in items), outfile)
+
+
+def writeBulkRaw(items: Iterable[Tuple[str, bytes]], outfile) -> Dict[str, Tuple[int, int]]:
+    """Same as writeBulk, but with the values already serialized to JSON"""
+    offsets = {}
+    position = outfile.write(b"{")
+    for num, (key, data) in enumerate(items):
+        prefix = (", " if num else "") + json.dumps(key) + ": "
+        position += outfile.write(prefix.encode("utf-8"))
+        offsets[key] = (position, len(data))
+        position += outfile.write(data)
+    outfile.write(b"}")
+    return offsets
+
+
+def scanBulk(oflPath: str) -> Dict[str, Tuple[int, int]]:
+    """Creating the offsets of an existing bulked library by scanning it once"""
+    with open(oflPath, "rb") as infile:
+        # latin-1 maps every byte to exactly one character, so string positions are byte offsets
+        text = infile.read().decode("latin-1")
+
+    offsets = {}
+    pos = _skip(text, 0)
+    if text[pos] != "{":
+        raise ValueError("The bulked library has to be a JSON object.")
+    pos = _skip(text, pos + 1)
+    while text[pos] != "}":
+        key, pos = _decoder.raw_decode(text, pos)
+        pos = _skip(text, pos)
+        if text[pos] != ":":
+            raise ValueError(f"Expected ':' at byte {pos}.")
+        start = _skip(text, pos + 1)
+        _, end = _decoder.raw_decode(text, start)
+        offsets[key] = (start, end - start)
+        pos = _skip(text, end)
+        if text[pos] == ",":
+            pos = _skip(text, pos + 1)
+    return offsets
+
+
+def _skip(text: str, pos: int) -> int:
+    while text[pos] in _whitespace:
+        pos += 1
+    return pos
+
+
+def writeIndex(oflPath: str, offsets: Dict[str, Tuple[int, int]]):
+    """Writing the index file next to the bulked library"""
+    index = {
+        "version": INDEX_VERSION,
+        **sourceStamp(oflPath),
+        "fixtures": offsets,
+    }
+    with open(indexPath(oflPath), "w", encoding="utf-8") as outfile:
+        json.dump(index, outfile)
+
+
+def loadIndex(oflPath: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Loading the index of a bulked library.
+    A missing or outdated index gets rebuilt by scanning the library.
+    """
+    try:
+        with open(indexPath(oflPath), encoding="utf-8") as infile:
+            index = json.load(infile)
+        if index["version"] == INDEX_VERSION and isCurrent(index, oflPath):
+            return index["fixtures"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    offsets = scanBulk(oflPath)
+    try:
+        writeIndex(oflPath, offsets)
+    except OSError:
+        # A read only installation just rebuilds the index on every start
+        pass
+    return offsets
+
+
+class OflLibrary:
+    """
+    Read only mapping over the bulked ofl.json.
+    Fixtures are only parsed when accessed and the most recently used ones are kept in a bounded LRU cache.
+    """
+
+    def __init__(self, oflPath: str, cacheSize: int = 64):
+        self.path = oflPath
+        self._offsets = loadIndex(oflPath)
+        self._parse = lru_cache(maxsize=cacheSize)(self._readFixture)
+
+    def _read(self, fixtureId: str) -> bytes:
+        offset, length = self._offsets[fixtureId]
+        with open(self.path, "rb") as infile:
+            infile.seek(offset)
+            return infile.read(length)
+
+    def _readFixture(self, fixtureId: str):
+        try:
+            return json.loads(self._read(fixtureId))
+        except ValueError:
+            # The library changed without changing its size, so the index has to be rebuilt
+            self._offsets = scanBulk(self.path)
+            try:
+                writeIndex(self.path, self._offsets)
+            except OSError:
+                pass
+            return json.loads(self._read(fixtureId))
+
+    def __getitem__(self, fixtureId: str):
+        if fixtureId not in self._offsets:
+            raise KeyError(fixtureId)
+        return self._parse(fixtureId)
+
+    def __contains__(self, fixtureId: str) -> bool:
+        return fixtureId in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def keys(self):
+        return self._offsets.keys()
+
+    def get(self, fixtureId: str, default=None):
+        if fixtureId in self._offsets:
+            return self._parse(fixtureId)
+        return default
+
+    def cacheInfo(self):
+        """Hits, misses and size of the parsed fixture cache"""
+        return self._parse.cache_info()
+
+    def clearCache(self):
+        self._parse.cache_clear()
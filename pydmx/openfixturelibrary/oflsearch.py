@@ -0,0 +1,259 @@
+"""
+Search index over the bulked ofl.json
+
+Answers typeahead queries by name, shortName, manufacturer and fixture key, filtered by category and channel count,
+without parsing the library. Every word of the searchable texts points to the fixtures containing it, a query
+word matches all indexed words starting with it (found by bisecting the sorted word list). If no fixture matches
+all query words, the query falls back to a fuzzy search: every query word also matches the indexed words (or their
+starts) within a typo per four letters, e.g. "spcia" finds spica, and failing that the shared trigrams are counted.
+Fixture sets are Python ints used as bitsets, so unions and intersections of postings are single operations.
+
+Index structure (ofl.search.json):
+{
+  "version": 2,
+  "size", "mtime", "sha1": <of ofl.json, like the offset index>,
+  "fixtures": [[key, name, shortName, manufacturerKey, [categories], [channel count per mode]], ...],
+  "words": {word: [fixture number, ...]},
+  "grams": {trigram: [fixture number, ...]}
+}
+"""
+
+import json
+import os
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydmx.openfixturelibrary.oflindex import isCurrent, sourceStamp
+
+SEARCH_VERSION = 2
+
+_separator = re.compile(r"[^0-9a-z]+")
+
+
+def searchPath(oflPath: str) -> str:
+    """Path of the search index belonging to a bulked library"""
+    root, _ = os.path.splitext(oflPath)
+    return root + ".search.json"
+
+
+def words(text: str) -> List[str]:
+    """Lower case alphanumeric words of a text"""
+    return [word for word in _separator.split(text.lower()) if word]
+
+
+def trigrams(text: str) -> set:
+    """Trigrams of the words of a text, padded so short words and word starts are represented as well"""
+    grams = set()
+    for word in words(text):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def editDistance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """
+    Insertions, deletions, substitutions and swaps of neighbouring letters turning a into b.
+    Once it certainly exceeds limit, limit + 1 is returned.
+    """
+    if limit is not None and abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = [], list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _bitset(numbers: Iterable[int]) -> int:
+    bits = 0
+    for number in numbers:
+        bits |= 1 << number
+    return bits
+
+
+def _members(bits: int) -> Iterable[int]:
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def buildSearchIndex(fixtures: Iterable[Tuple[str, dict]]) -> dict:
+    """Creating the search index of (key, fixture) pairs"""
+    records = []
+    postings: Dict[str, List[int]] = {}
+    grams: Dict[str, List[int]] = {}
+    for number, (key, fixture) in enumerate(fixtures):
+        manufacturer = fixture.get("manufacturerKey") or key.split("#")[0]
+        channelCounts = sorted({len(mode.get("channels", ())) for mode in fixture.get("modes", ())})
+        records.append([key, fixture.get("name", ""), fixture.get("shortName"), manufacturer, fixture.get("categories", []), channelCounts])
+
+        text = " ".join(filter(None, (fixture.get("name"), fixture.get("shortName"), manufacturer, key)))
+        for word in set(words(text)):
+            postings.setdefault(word, []).append(number)
+        for gram in trigrams(text):
+            grams.setdefault(gram, []).append(number)
+    return {"version": SEARCH_VERSION, "fixtures": records, "words": postings, "grams": grams}
+
+
+def writeSearchIndex(oflPath: str, index: dict):
+    """Writing the search index next to the bulked library"""
+    index = dict(index, **sourceStamp(oflPath))
+    with open(searchPath(oflPath), "w", encoding="utf-8") as outfile:
+        json.dump(index, outfile)
+
+
+def loadSearchIndex(oflPath: str, library=None) -> dict:
+    """
+    Loading the search index of a bulked library.
+    A missing or outdated index gets rebuilt from the library (an OflLibrary or any mapping of the fixtures).
+    """
+    try:
+        with open(searchPath(oflPath), encoding="utf-8") as infile:
+            index = json.load(infile)
+        if index["version"] == SEARCH_VERSION and isCurrent(index, oflPath):
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if library is None:
+        with open(oflPath, encoding="utf-8") as infile:
+            library = json.load(infile)
+    index = buildSearchIndex((key, library[key]) for key in library if key != "_manufacturers")
+    try:
+        writeSearchIndex(oflPath, index)
+    except OSError:
+        # A read only installation just rebuilds the index on every start
+        pass
+    return index
+
+
+class FixtureSearch:
+    """
+    Typeahead search over the fixtures of a bulked library
+    """
+
+    def __init__(self, index: dict):
+        self.fixtures = [tuple(record) for record in index["fixtures"]]
+        self.keys = [record[0] for record in self.fixtures]
+        self._words = sorted(index["words"])
+        self._postings = [_bitset(index["words"][word]) for word in self._words]
+        self._grams = index["grams"]
+        self._all = (1 << len(self.fixtures)) - 1
+        # category: fixtures, channel count: fixtures
+        self._categories: Dict[str, int] = {}
+        self._channels: Dict[int, int] = {}
+        for number, (_, _, _, _, categories, channelCounts) in enumerate(self.fixtures):
+            for category in categories:
+                self._categories[category] = self._categories.get(category, 0) | 1 << number
+            for count in channelCounts:
+                self._channels[count] = self._channels.get(count, 0) | 1 << number
+        # Normalized names for ranking the results
+        self._names = [" ".join(words(record[1] or "")) for record in self.fixtures]
+
+    @classmethod
+    def load(cls, oflPath: str, library=None) -> "FixtureSearch":
+        return cls(loadSearchIndex(oflPath, library))
+
+    def __len__(self) -> int:
+        return len(self.fixtures)
+
+    def _prefix(self, word: str) -> int:
+        """Fixtures with an indexed word starting with word"""
+        bits = 0
+        position = bisect_left(self._words, word)
+        while position < len(self._words) and self._words[position].startswith(word):
+            bits |= self._postings[position]
+            position += 1
+        return bits
+
+    def _typos(self, word: str) -> Dict[int, int]:
+        """Fixtures with a word or word start at most a typo per four letters away from word: fewest typos"""
+        tolerance = len(word) // 4
+        distances = {number: 0 for number in _members(self._prefix(word))}
+        if not tolerance:
+            return distances
+        for indexed, postings in zip(self._words, self._postings):
+            distance = editDistance(word, indexed, tolerance)
+            if distance and len(indexed) > len(word):
+                distance = min(distance, editDistance(word, indexed[: len(word)], tolerance))
+            if distance > tolerance:
+                continue
+            for number in _members(postings):
+                if distance < distances.get(number, tolerance + 1):
+                    distances[number] = distance
+        return distances
+
+    def _fuzzy(self, query: str, allowed: int, limit: int) -> List[int]:
+        """
+        Fixtures matching every query word with a few typos, fewest typos first. Without any,
+        the fixtures sharing the most trigrams with the query, at least a third of them.
+        """
+        distances = None
+        for word in words(query):
+            wordDistances = self._typos(word)
+            if distances is not None:
+                wordDistances = {number: distance + distances[number] for number, distance in wordDistances.items() if number in distances}
+            distances = wordDistances
+        if distances:
+            ranked = sorted(
+                (number for number in distances if allowed >> number & 1),
+                key=lambda number: (distances[number], self._names[number]),
+            )
+            if ranked:
+                return ranked[:limit]
+
+        grams = trigrams(query)
+        scores = Counter()
+        for gram in grams:
+            scores.update(self._grams.get(gram, ()))
+        minimum = max(1, len(grams) // 3)
+        ranked = sorted(
+            (number for number, score in scores.items() if score >= minimum and allowed >> number & 1),
+            key=lambda number: (-scores[number], self._names[number]),
+        )
+        return ranked[:limit]
+
+    def filter(self, category=None, channels: Optional[int] = None) -> int:
+        """Fixtures of a category (FixtureCategories or its value) with a mode of the given channel count"""
+        bits = self._all
+        if category is not None:
+            bits &= self._categories.get(getattr(category, "value", category), 0)
+        if channels is not None:
+            bits &= self._channels.get(channels, 0)
+        return bits
+
+    def search(self, query: str = "", category=None, channels: Optional[int] = None, limit: int = 20, fuzzy: bool = True) -> List[str]:
+        """
+        Keys of the fixtures matching every word of the query as a prefix, best matches first.
+        Without a prefix match the query is matched fuzzy, e.g. to tolerate typos.
+        """
+        allowed = self.filter(category, channels)
+        queryWords = words(query)
+        bits = allowed
+        for word in queryWords:
+            bits &= self._prefix(word)
+            if not bits:
+                break
+        if not bits:
+            if not queryWords or not fuzzy:
+                return []
+            return [self.keys[number] for number in self._fuzzy(query, allowed, limit)]
+
+        matches = list(_members(bits))
+        if queryWords:
+            # Exact name matches first, then names starting with the query, then the rest alphabetically
+            text = " ".join(queryWords)
+            names = self._names
+            matches.sort(key=lambda number: (names[number] != text, not names[number].startswith(text), names[number]))
+        else:
+            matches.sort(key=lambda number: self._names[number])
+        return [self.keys[number] for number in matches[:limit]]
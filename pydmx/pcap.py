@@ -0,0 +1,119 @@
+"""
+Reading and writing packet captures in the libpcap format
+
+Art-Net and sACN traffic recorded with tcpdump or Wireshark (e.g. "udp port 6454 or udp port 5568") can be
+replayed into a DMXReceiver. Only the UDP payloads over IPv4 and IPv6 are extracted, on Ethernet (also VLAN tagged),
+Linux cooked, raw IP and BSD loopback captures. Written captures use raw IPv4, so they open in Wireshark as well.
+"""
+
+import socket
+import struct
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Link layer types
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LINUX_SLL = 113
+
+_MAGIC_MICROSECONDS = 0xA1B2C3D4
+_MAGIC_NANOSECONDS = 0xA1B23C4D
+_IPV4 = 0x0800
+_IPV6 = 0x86DD
+_VLAN = 0x8100
+_UDP = 17
+
+Address = Tuple[str, int]
+
+
+def _network(frame: memoryview, linktype: int) -> Optional[memoryview]:
+    """IP packet inside a captured frame"""
+    if linktype == LINKTYPE_RAW:
+        return frame
+    if linktype == LINKTYPE_NULL:
+        return frame[4:]
+    if linktype == LINKTYPE_LINUX_SLL:
+        offset, etherType = 16, frame[14] << 8 | frame[15]
+    elif linktype == LINKTYPE_ETHERNET:
+        offset, etherType = 14, frame[12] << 8 | frame[13]
+        while etherType == _VLAN and len(frame) >= offset + 4:
+            etherType = frame[offset + 2] << 8 | frame[offset + 3]
+            offset += 4
+    else:
+        return None
+    return frame[offset:] if etherType in (_IPV4, _IPV6) else None
+
+
+def _udp(packet: memoryview) -> Optional[Tuple[Address, Address, memoryview]]:
+    """Source and destination address and payload of a UDP datagram in an IP packet"""
+    if len(packet) < 20:
+        return None
+    version = packet[0] >> 4
+    if version == 4:
+        if packet[9] != _UDP:
+            return None
+        header = (packet[0] & 0x0F) * 4
+        source = socket.inet_ntop(socket.AF_INET, packet[12:16])
+        destination = socket.inet_ntop(socket.AF_INET, packet[16:20])
+    elif version == 6 and len(packet) >= 40:
+        # Extension headers aren't followed
+        if packet[6] != _UDP:
+            return None
+        header = 40
+        source = socket.inet_ntop(socket.AF_INET6, packet[8:24])
+        destination = socket.inet_ntop(socket.AF_INET6, packet[24:40])
+    else:
+        return None
+    udp = packet[header:]
+    if len(udp) < 8:
+        return None
+    length = udp[4] << 8 | udp[5]
+    return (source, udp[0] << 8 | udp[1]), (destination, udp[2] << 8 | udp[3]), udp[8:length]
+
+
+def readCapture(path: str, port: Optional[int] = None) -> Iterator[Tuple[float, Address, memoryview]]:
+    """
+    UDP payloads of a capture file as (timestamp in seconds, source address, payload),
+    only the ones sent to port if given. The payloads are views into the loaded file.
+    """
+    with open(path, "rb") as infile:
+        content = memoryview(infile.read())
+    for order in "<>":
+        (magic,) = struct.unpack_from(order + "I", content)
+        if magic in (_MAGIC_MICROSECONDS, _MAGIC_NANOSECONDS):
+            break
+    else:
+        raise ValueError(f"{path} is not a pcap capture.")
+    resolution = 1e-9 if magic == _MAGIC_NANOSECONDS else 1e-6
+    (linktype,) = struct.unpack_from(order + "I", content, 20)
+    record = struct.Struct(order + "IIII")
+
+    offset = 24
+    while offset + record.size <= len(content):
+        seconds, fraction, captured, _ = record.unpack_from(content, offset)
+        offset += record.size
+        frame = content[offset : offset + captured]
+        offset += captured
+        packet = _network(frame, linktype)
+        datagram = _udp(packet) if packet is not None else None
+        if datagram is None:
+            continue
+        source, destination, payload = datagram
+        if port is None or destination[1] == port:
+            yield seconds + fraction * resolution, source, payload
+
+
+def writeCapture(path: str, packets: Iterable[Tuple[float, Address, Address, bytes]]):
+    """Writing (timestamp, source address, destination address, payload) UDP datagrams into a raw IPv4 capture"""
+    with open(path, "wb") as outfile:
+        outfile.write(struct.pack("<IHHiIII", _MAGIC_MICROSECONDS, 2, 4, 0, 0, 65535, LINKTYPE_RAW))
+        for timestamp, source, destination, payload in packets:
+            length = 28 + len(payload)
+            # IPv4 header without options, fragmentation and checksum
+            ip = struct.pack("!BBHHHBBH4s4s", 0x45, 0, length, 0, 0, 64, _UDP, 0, socket.inet_aton(source[0]), socket.inet_aton(destination[0]))
+            udp = struct.pack("!HHHH", source[1], destination[1], 8 + len(payload), 0)
+            seconds = int(timestamp)
+            outfile.write(struct.pack("<IIII", seconds, int((timestamp - seconds) * 1e6), length, length))
+            outfile.write(ip)
+            outfile.write(udp)
+            outfile.write(payload)
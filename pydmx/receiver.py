@@ -0,0 +1,380 @@
+"""
+Receiving DMX over Art-Net and sACN (E1.31)
+
+Incoming packets are received into one preallocated buffer and parsed in place: the header fields are read
+by index and the slots are copied with memoryview slices straight into the buffer of the source and the target
+frame, no packet objects are built. Every received universe writes into a target frame, which can be the back
+buffer of an output Universe (passing the input through), a MergeEngine layer (merging a second desk with the
+local programming) or a frame of its own for monitoring.
+
+Several sources can send the same universe: sACN sources of the highest priority are merged HTP, Art-Net sources
+(which have no priority) always are. Out of order packets are dropped by their sequence numbers per source,
+sources which stopped sending are removed after a timeout and the universe keeps its last look.
+"""
+
+import socket
+import struct
+from contextlib import nullcontext
+from select import select
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from pydmx.controller.artnet import ARTNET_ID, ARTNET_PORT, HEADER_LENGTH, OP_DMX
+from pydmx.controller.e131 import (
+    ACN_PACKET_IDENTIFIER,
+    DMP_HEADER_LENGTH,
+    E131_PORT,
+    OPTION_PREVIEW_DATA,
+    OPTION_STREAM_TERMINATED,
+    VECTOR_DMP_SET_PROPERTY,
+    VECTOR_E131_DATA_PACKET,
+    VECTOR_ROOT_E131_DATA,
+    multicastAddress,
+)
+from pydmx.frame import DMXFrame
+
+ARTNET = "artnet"
+E131 = "e131"
+
+# Sources which sent nothing for this many seconds are removed (E1.31 network data loss timeout)
+SOURCE_TIMEOUT = 2.5
+# Art-Net sources have no priority, they rank like sACN sources with the default priority
+DEFAULT_PRIORITY = 100
+
+_ROOT_VECTOR = VECTOR_ROOT_E131_DATA.to_bytes(4, "big")
+_FRAMING_VECTOR = VECTOR_E131_DATA_PACKET.to_bytes(4, "big")
+_OP_DMX = OP_DMX.to_bytes(2, "little")
+
+
+class Source:
+    """A console sending one of the received universes"""
+
+    __slots__ = ("key", "address", "name", "priority", "sequence", "lastSeen", "slots", "values", "packets", "outOfSequence")
+
+    def __init__(self, key, address, name: str, slots: int):
+        # CID for sACN, (ip, physical port) for Art-Net
+        self.key = key
+        self.address = address
+        self.name = name
+        self.priority = DEFAULT_PRIORITY
+        self.sequence: Optional[int] = None
+        self.lastSeen = 0.0
+        # Last received slots, as a memoryview for copying and as an array for merging
+        buffer = bytearray(slots)
+        self.slots = memoryview(buffer)
+        self.values = np.frombuffer(buffer, dtype=np.uint8)
+        self.packets = 0
+        self.outOfSequence = 0
+
+
+class InputUniverse:
+    """
+    A received universe, its sources and the frame it writes into
+    """
+
+    def __init__(self, protocol: str, universe: int, target=None, slots: int = 512):
+        self.protocol = protocol
+        self.universe = universe
+        # Universe, DMXFrame or anything else with a writable back buffer (e.g. a LayerFrame of a MergeEngine)
+        self.frame = getattr(target, "buffer", target) if target is not None else DMXFrame(slots)
+        self._back = self.frame.back
+        self.slots = min(slots, len(self._back))
+        # Same lock as DMXFrame.hold(), so a packet is never published half written. Taken directly, because
+        # entering the context manager costs more than copying the slots
+        self._guard = getattr(self.frame, "_holdLock", None) or nullcontext()
+        self._output = np.frombuffer(self._back, dtype=np.uint8)[: self.slots]
+        # source key: Source
+        self.sources: Dict[object, Source] = {}
+        # Sources of the highest priority, their values are merged into the frame
+        self._winners: List[Source] = []
+        self.packets = 0
+        self.outOfSequence = 0
+        self.timeouts = 0
+        self.lastReceived = 0.0
+
+    @property
+    def active(self) -> bool:
+        return bool(self.sources)
+
+    @property
+    def values(self) -> memoryview:
+        """Current slots written into the frame"""
+        return self._back[: self.slots]
+
+    def _rank(self):
+        priority = max((source.priority for source in self.sources.values()), default=DEFAULT_PRIORITY)
+        self._winners = [source for source in self.sources.values() if source.priority == priority]
+
+    def _merge(self):
+        winners = self._winners
+        if not winners:
+            return
+        with self._guard:
+            np.copyto(self._output, winners[0].values[: self.slots])
+            for source in winners[1:]:
+                np.maximum(self._output, source.values[: self.slots], out=self._output)
+
+    def receive(self, key, address, name: str, priority: int, sequence: Optional[int], data: memoryview, now: float) -> bool:
+        """Taking the slots of a source, returns False for out of order packets. A sequence of None isn't checked."""
+        source = self.sources.get(key)
+        if source is None:
+            source = self.sources[key] = Source(key, address, name, len(self._back))
+            source.priority = priority
+            self._rank()
+        elif sequence is not None and source.sequence is not None:
+            # Dropping packets up to 20 sequence numbers behind the last one (E1.31 6.7.2)
+            difference = (sequence - source.sequence) & 0xFF
+            if difference == 0 or difference > 0xEC:
+                source.outOfSequence += 1
+                self.outOfSequence += 1
+                return False
+        if sequence is not None:
+            source.sequence = sequence
+        source.lastSeen = now
+        source.packets += 1
+        self.packets += 1
+        self.lastReceived = now
+        ranked = priority != source.priority
+        if ranked:
+            source.priority = priority
+            self._rank()
+
+        length = min(len(data), self.slots)
+        source.slots[:length] = data[:length]
+        if ranked:
+            # The winners changed, e.g. the winning source lowered its priority below another one
+            self._merge()
+        elif len(self._winners) == 1 and self._winners[0] is source:
+            # Single source: the slots go straight into the frame
+            with self._guard:
+                self._back[:length] = data[:length]
+        elif source.priority == self._winners[0].priority:
+            self._merge()
+        return True
+
+    def remove(self, key):
+        """Removing a source, e.g. after it terminated its stream"""
+        if self.sources.pop(key, None) is not None:
+            self._rank()
+            self._merge()
+
+    def expire(self, now: float, timeout: float) -> int:
+        """Removing the sources which sent nothing for timeout seconds, the frame keeps the last look"""
+        expired = [key for key, source in self.sources.items() if now - source.lastSeen > timeout]
+        for key in expired:
+            del self.sources[key]
+        if expired:
+            self.timeouts += len(expired)
+            self._rank()
+            self._merge()
+        return len(expired)
+
+
+class DMXReceiver:
+    """
+    Receiving Art-Net and sACN universes into frames
+    """
+
+    """
+    Universes have to be added before their packets are taken, packets of other universes are only counted.
+    The receiver either runs its own thread (start) or is fed by hand, e.g. from a captured file (feed, replay).
+    """
+
+    def __init__(self, host: str = "0.0.0.0", artnet: bool = True, e131: bool = True, timeout: float = SOURCE_TIMEOUT):
+        self.host = host
+        self.timeout = timeout
+        self.protocols = {ARTNET: artnet, E131: e131}
+        # (protocol, universe): InputUniverse
+        self.universes: Dict[Tuple[str, int], InputUniverse] = {}
+        self.sockets: Dict[str, socket.socket] = {}
+        # Packets of universes which weren't added and packets which are neither Art-Net nor sACN data
+        self.ignoredPackets = 0
+        self.invalidPackets = 0
+        self._buffer = bytearray(1500)
+        self._view = memoryview(self._buffer)
+        self._lastExpiry = 0.0
+        self._lock = Lock()
+        self._stopped = Event()
+        self.thread: Optional[Thread] = None
+
+    def addUniverse(self, protocol: str, universe: int, target=None) -> InputUniverse:
+        """
+        Receiving a universe (Art-Net Port-Address or sACN universe) into a target:
+        a Universe, a DMXFrame, a MergeEngine layer frame or None for a frame of its own.
+        """
+        if protocol not in self.protocols:
+            raise ValueError(f"Unknown protocol {protocol}, use {ARTNET} or {E131}.")
+        key = (protocol, universe)
+        if key in self.universes:
+            raise KeyError(f"The {protocol} universe {universe} is already received.")
+        received = self.universes[key] = InputUniverse(protocol, universe, target)
+        if protocol == E131 and E131 in self.sockets:
+            self._join(universe)
+        return received
+
+    def removeUniverse(self, protocol: str, universe: int) -> InputUniverse:
+        received = self.universes.pop((protocol, universe))
+        if protocol == E131 and E131 in self.sockets:
+            self._join(universe, leave=True)
+        return received
+
+    def __getitem__(self, key: Tuple[str, int]) -> InputUniverse:
+        return self.universes[key]
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "universes": len(self.universes),
+            "sources": sum(len(received.sources) for received in self.universes.values()),
+            "packets": sum(received.packets for received in self.universes.values()),
+            "outOfSequence": sum(received.outOfSequence for received in self.universes.values()),
+            "timeouts": sum(received.timeouts for received in self.universes.values()),
+            "ignoredPackets": self.ignoredPackets,
+            "invalidPackets": self.invalidPackets,
+        }
+
+    # ~~~~~~~
+    # Parsing
+    # ~~~~~~~
+
+    def feed(self, packet, address=None, now: Optional[float] = None) -> Optional[InputUniverse]:
+        """Taking one UDP payload, returns the universe it was received into"""
+        packet = packet if isinstance(packet, memoryview) else memoryview(packet)
+        now = perf_counter() if now is None else now
+        with self._lock:
+            if packet[:8] == ARTNET_ID:
+                return self._artnet(packet, address, now)
+            if packet[4:16] == ACN_PACKET_IDENTIFIER:
+                return self._e131(packet, address, now)
+            self.invalidPackets += 1
+            return None
+
+    def _artnet(self, packet: memoryview, address, now: float) -> Optional[InputUniverse]:
+        if len(packet) < HEADER_LENGTH or packet[8:10] != _OP_DMX:
+            # ArtPoll, ArtSync, ... aren't DMX data
+            self.ignoredPackets += 1
+            return None
+        received = self.universes.get((ARTNET, packet[14] | (packet[15] & 0x7F) << 8))
+        if received is None or not self.protocols[ARTNET]:
+            self.ignoredPackets += 1
+            return None
+        length = packet[16] << 8 | packet[17]
+        ip = address[0] if address else None
+        # Sequence 0 disables the reordering check in Art-Net
+        sequence = packet[12] or None
+        received.receive((ip, packet[13]), address, ip, DEFAULT_PRIORITY, sequence, packet[HEADER_LENGTH : HEADER_LENGTH + length], now)
+        return received
+
+    def _e131(self, packet: memoryview, address, now: float) -> Optional[InputUniverse]:
+        if (
+            len(packet) < DMP_HEADER_LENGTH
+            or packet[18:22] != _ROOT_VECTOR
+            or packet[40:44] != _FRAMING_VECTOR
+            or packet[117] != VECTOR_DMP_SET_PROPERTY
+        ):
+            # Sync and discovery packets
+            self.ignoredPackets += 1
+            return None
+        received = self.universes.get((E131, packet[113] << 8 | packet[114]))
+        options = packet[112]
+        if received is None or not self.protocols[E131] or options & OPTION_PREVIEW_DATA or packet[125] != 0:
+            # Preview data and alternate start codes (e.g. 0xDD per address priority) aren't output
+            self.ignoredPackets += 1
+            return None
+        cid = packet[22:38].tobytes()
+        if options & OPTION_STREAM_TERMINATED:
+            received.remove(cid)
+            return received
+        count = (packet[123] << 8 | packet[124]) - 1
+        # The source name is only decoded for new sources
+        name = None if cid in received.sources else packet[44:108].tobytes().split(b"\x00", 1)[0].decode("utf-8", "replace")
+        received.receive(cid, address, name, packet[108], packet[111], packet[DMP_HEADER_LENGTH : DMP_HEADER_LENGTH + count], now)
+        return received
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Removing timed out sources of all universes"""
+        now = perf_counter() if now is None else now
+        with self._lock:
+            self._lastExpiry = now
+            return sum(received.expire(now, self.timeout) for received in self.universes.values())
+
+    def replay(self, packets: Iterable[Tuple[float, object, bytes]]) -> int:
+        """
+        Feeding captured packets (timestamp, source address, payload), e.g. from pydmx.pcap.readCapture.
+        Timeouts are evaluated on the captured timestamps. Returns the number of packets taken.
+        """
+        taken = 0
+        for timestamp, address, payload in packets:
+            if self.feed(payload, address, timestamp) is not None:
+                taken += 1
+            if timestamp - self._lastExpiry >= 0.1:
+                self.expire(timestamp)
+        return taken
+
+    # ~~~~~~~
+    # Network
+    # ~~~~~~~
+
+    def _join(self, universe: int, leave: bool = False):
+        membership = struct.pack("4s4s", socket.inet_aton(multicastAddress(universe)), socket.inet_aton(self.host))
+        option = socket.IP_DROP_MEMBERSHIP if leave else socket.IP_ADD_MEMBERSHIP
+        try:
+            self.sockets[E131].setsockopt(socket.IPPROTO_IP, option, membership)
+        except OSError as error:
+            print(f"Unable to {'leave' if leave else 'join'} the multicast group of the sACN universe {universe}: {error}")
+
+    def listen(self):
+        """Opening the sockets of the enabled protocols"""
+        for protocol, port in ((ARTNET, ARTNET_PORT), (E131, E131_PORT)):
+            if not self.protocols[protocol] or protocol in self.sockets:
+                continue
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((self.host, port))
+            sock.setblocking(False)
+            self.sockets[protocol] = sock
+            if protocol == E131:
+                for _, universe in (key for key in self.universes if key[0] == E131):
+                    self._join(universe)
+
+    def poll(self, timeout: float = 0.0) -> int:
+        """Receiving all pending packets, waiting up to timeout seconds for the first. Returns the number of packets."""
+        sockets = list(self.sockets.values())
+        readable, _, _ = select(sockets, (), (), timeout)
+        count = 0
+        for sock in readable:
+            while True:
+                try:
+                    length, address = sock.recvfrom_into(self._buffer)
+                except (BlockingIOError, InterruptedError):
+                    break
+                self.feed(self._view[:length], address)
+                count += 1
+        now = perf_counter()
+        if now - self._lastExpiry >= 0.1:
+            self.expire(now)
+        return count
+
+    def start(self):
+        """Receiving in a thread of its own"""
+        self.listen()
+        if self.thread is None:
+            self._stopped.clear()
+            self.thread = Thread(target=self._run, name="DMXReceiver", daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self.poll(0.1)
+
+    def close(self):
+        self._stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        for sock in self.sockets.values():
+            sock.close()
+        self.sockets.clear()
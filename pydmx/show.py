@@ -0,0 +1,397 @@
+"""
+Recording and playing back the output of universes
+
+A ShowRecorder is a monitor of a DMXController or Multiverse: after every frame was committed, the universes which
+changed since they were last recorded are appended to a show file. Only the changed slot range of a universe is
+written (a delta, as runs of changed slots), every keyframeInterval seconds the whole universe (a keyframe), so
+playback can start anywhere without replaying the file from its beginning. Closing the recorder appends an index of the keyframes. Files which
+weren't closed (e.g. after a crash) are complete up to their last flushed record, their index is rebuilt on opening.
+
+A ShowPlayer memory-maps a show file and is a renderer of a DMXController or Multiverse: on every frame it copies
+the records up to the playhead straight from the file into the back buffers of the universes. Every record is
+applied while holding its frame, so the output only ever shows recorded frames, bit-exact. Seeking bisects the keyframes
+of every universe and replays at most keyframeInterval seconds of deltas from there.
+
+File layout, little endian:
+    header   "PYDMXSHW", version u16, slots u16, wall clock time of the start f64
+    record   kind u8, universe u16, seconds since the start f64, length of the runs u16, runs
+    run      first slot u16, slot count u16, slots
+    index    keyframe count u64, (universe u16, seconds f64, record offset u64) * count
+    trailer  index offset u64, duration f64, "PYDMXIDX"
+"""
+
+import mmap
+import struct
+import time
+from bisect import bisect_right
+from functools import partial
+from threading import Lock
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from pydmx.frame import DMXFrame
+
+VERSION = 1
+KEYFRAME = 1
+DELTA = 2
+
+_MAGIC = b"PYDMXSHW"
+_INDEX_MAGIC = b"PYDMXIDX"
+_HEADER = struct.Struct("<8sHHd")
+_RECORD = struct.Struct("<BHdH")
+_RUN = struct.Struct("<HH")
+# Unchanged slots between two changed ones are written along instead of starting a new run up to this gap
+_GAP = _RUN.size
+_COUNT = struct.Struct("<Q")
+_ENTRY = struct.Struct("<HdQ")
+_TRAILER = struct.Struct("<Qd8s")
+
+
+class _Track:
+    """Recording state of a universe"""
+
+    __slots__ = ("frame", "row", "generation", "keyframe")
+
+    def __init__(self, frame: DMXFrame, row: int):
+        self.frame = frame
+        # Row of the universe in the slots last written to the file
+        self.row = row
+        self.generation = -1
+        self.keyframe = float("-inf")
+
+
+class ShowRecorder:
+    """
+    Appending the output of universes to a show file
+    """
+
+    """
+    The universes due on a capture are compared with their last written slots in one vectorized step,
+    only the runs of changed slots are assembled in Python.
+    """
+
+    def __init__(self, path: str, keyframeInterval: float = 1.0, slots: int = 512):
+        self.path = path
+        self.keyframeInterval = keyframeInterval
+        self.slots = slots
+        # universeId: recording state
+        self._tracks: Dict[int, _Track] = {}
+        # Slots last written to the file, a row per universe, shorter frames padded with zeros
+        self._last = np.zeros((0, slots), dtype=np.uint8)
+        # (universeId, seconds, record offset) of every keyframe
+        self._index: List[Tuple[int, float, int]] = []
+        self._lock = Lock()
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, VERSION, slots, time.time()))
+        self._offset = _HEADER.size
+        self._start = perf_counter()
+        self.duration = 0.0
+        self.records = 0
+
+    def addUniverse(self, universeId: int, target):
+        """Recording a Universe or DMXFrame, it is written on the next capture"""
+        frame: DMXFrame = getattr(target, "buffer", target)
+        if frame.slots > self.slots:
+            raise ValueError(f"The universe {universeId} has {frame.slots} slots, the recording only {self.slots}.")
+        with self._lock:
+            if universeId in self._tracks:
+                self._tracks[universeId].frame = frame
+                self._tracks[universeId].keyframe = float("-inf")
+                return
+            self._tracks[universeId] = _Track(frame, len(self._last))
+            self._last = np.vstack((self._last, np.zeros((1, self.slots), dtype=np.uint8)))
+
+    def attach(self, controller, universeId: int = 0):
+        """Recording every frame of a DMXController as universe universeId"""
+        self.addUniverse(universeId, controller.frame)
+        controller.monitors.append(partial(self.capture, universeId))
+
+    def attachMultiverse(self, multiverse):
+        """Recording every tick of the universes currently added to a Multiverse"""
+        for universeId, universe in multiverse.universes.items():
+            self.addUniverse(universeId, universe)
+        multiverse.monitors.append(self.capture)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "universes": len(self._tracks),
+            "records": self.records,
+            "keyframes": len(self._index),
+            "bytes": self._offset,
+            "duration": self.duration,
+        }
+
+    def capture(self, universeId: Optional[int] = None, now: Optional[float] = None):
+        """
+        Appending the published frame of a universe (of all universes if None) if it changed since it was last
+        recorded, or the whole frame if its keyframe is due. now is given in seconds since the recording started.
+        """
+        now = perf_counter() - self._start if now is None else now
+        slots = self.slots
+        with self._lock:
+            if self._file is None:
+                return
+            tracks = self._tracks.items() if universeId is None else ((universeId, self._tracks[universeId]),)
+            due = []
+            chunks = []
+            for universeId, track in tracks:
+                keyframe = now - track.keyframe >= self.keyframeInterval
+                frame = track.frame
+                if frame.generation == track.generation and not keyframe:
+                    continue
+                with frame.read() as front:
+                    track.generation = frame.generation
+                    chunks.append(front[1:].tobytes())
+                if frame.slots < slots:
+                    chunks.append(bytes(slots - frame.slots))
+                due.append((universeId, track, keyframe))
+            if not due:
+                return
+
+            data = b"".join(chunks)
+            current = np.frombuffer(data, dtype=np.uint8).reshape(len(due), slots)
+            rows = [track.row for _, track, _ in due]
+            changed = np.flatnonzero(current != self._last[rows])
+            self._last[rows] = current
+            # Splitting the changed slots into runs where more than _GAP unchanged slots lie between them
+            # or a new universe starts
+            splits = np.flatnonzero((np.diff(changed) > _GAP) | (np.diff(changed // slots) != 0))
+            firsts = changed[np.concatenate(((0,), splits + 1))].tolist() if len(changed) else []
+            ends = (changed[np.concatenate((splits, (-1,)))] + 1).tolist() if len(changed) else []
+
+            records = []
+            run = 0
+            for number, (universeId, track, keyframe) in enumerate(due):
+                base = number * slots
+                if keyframe:
+                    payload = _RUN.pack(0, track.frame.slots) + data[base : base + track.frame.slots]
+                    track.keyframe = now
+                    self._index.append((universeId, now, self._offset))
+                    while run < len(firsts) and firsts[run] < base + slots:
+                        run += 1
+                else:
+                    parts = []
+                    while run < len(firsts) and firsts[run] < base + slots:
+                        parts.append(_RUN.pack(firsts[run] - base, ends[run] - firsts[run]))
+                        parts.append(data[firsts[run] : ends[run]])
+                        run += 1
+                    if not parts:
+                        continue
+                    payload = b"".join(parts)
+                records.append(_RECORD.pack(KEYFRAME if keyframe else DELTA, universeId, now, len(payload)))
+                records.append(payload)
+                self._offset += _RECORD.size + len(payload)
+                self.records += 1
+            if not records:
+                return
+            self._file.write(b"".join(records))
+            self.duration = now
+            # A crash loses at most one keyframe interval
+            if any(keyframe for _, _, keyframe in due):
+                self._file.flush()
+
+    def close(self):
+        """Appending the keyframe index and closing the file, later captures are ignored"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_COUNT.pack(len(self._index)))
+            for entry in self._index:
+                self._file.write(_ENTRY.pack(*entry))
+            self._file.write(_TRAILER.pack(self._offset, self.duration, _INDEX_MAGIC))
+            self._file.close()
+            self._file = None
+
+
+class ShowPlayer:
+    """
+    Playing a show file back into universes
+    """
+
+    def __init__(self, path: str, targets: Optional[Dict[int, object]] = None, loop: bool = False):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if len(self._view) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a show file.")
+        magic, version, self.slots, self.startTime = _HEADER.unpack_from(self._view)
+        if magic != _MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} show file.")
+        # universeId: (keyframe seconds, keyframe record offsets)
+        self._keyframes: Dict[int, Tuple[List[float], List[int]]] = {}
+        self._end, self.duration = self._loadIndex()
+        # universeId: frame the universe is played into
+        self.frames: Dict[int, DMXFrame] = {}
+        for universeId, target in (targets or {}).items():
+            self.addUniverse(universeId, target)
+        self.loop = loop
+        self.speed = 1.0
+        self.playing = False
+        # Playhead in seconds since the start of the recording
+        self.time = 0.0
+        # Offset of the first record after the playhead
+        self._position = _HEADER.size
+        # perf_counter() at which the playhead was at 0 at the current speed
+        self._origin = 0.0
+        self._lock = Lock()
+
+    def _loadIndex(self) -> Tuple[int, float]:
+        """Reading the keyframe index, returns the end of the records and the duration"""
+        view = self._view
+        if len(view) >= _HEADER.size + _COUNT.size + _TRAILER.size:
+            indexOffset, duration, magic = _TRAILER.unpack_from(view, len(view) - _TRAILER.size)
+            if magic == _INDEX_MAGIC:
+                (count,) = _COUNT.unpack_from(view, indexOffset)
+                start = indexOffset + _COUNT.size
+                for universeId, seconds, offset in _ENTRY.iter_unpack(view[start : start + count * _ENTRY.size]):
+                    self._keyframe(universeId, seconds, offset)
+                return indexOffset, duration
+        return self._scan()
+
+    def _scan(self) -> Tuple[int, float]:
+        """Rebuilding the index of a file which wasn't closed, scanning up to the first incomplete or invalid record"""
+        view, offset, duration = self._view, _HEADER.size, 0.0
+        while offset + _RECORD.size <= len(view):
+            kind, universeId, seconds, length = _RECORD.unpack_from(view, offset)
+            if kind not in (KEYFRAME, DELTA) or offset + _RECORD.size + length > len(view):
+                break
+            if kind == KEYFRAME:
+                self._keyframe(universeId, seconds, offset)
+            duration = seconds
+            offset += _RECORD.size + length
+        return offset, duration
+
+    def _keyframe(self, universeId: int, seconds: float, offset: int):
+        times, offsets = self._keyframes.setdefault(universeId, ([], []))
+        times.append(seconds)
+        offsets.append(offset)
+
+    @property
+    def universes(self) -> List[int]:
+        """Recorded universes"""
+        return list(self._keyframes)
+
+    def addUniverse(self, universeId: int, target):
+        """Playing a recorded universe into a Universe or DMXFrame, it is set on the next seek"""
+        frame: DMXFrame = getattr(target, "buffer", target)
+        if universeId not in self._keyframes:
+            raise KeyError(f"The universe {universeId} isn't recorded in {self.path}.")
+        if frame.slots < self.slots:
+            raise ValueError(f"The universe {universeId} has {frame.slots} slots, the recording {self.slots}.")
+        self.frames[universeId] = frame
+
+    def attach(self, controller, universeId: int = 0):
+        """Playing universe universeId on the frame clock of a DMXController"""
+        self.addUniverse(universeId, controller.frame)
+        controller.renderers.append(self.render)
+
+    def attachMultiverse(self, multiverse):
+        """Playing all recorded universes which were added to a Multiverse on its frame clock"""
+        for universeId, universe in multiverse.universes.items():
+            if universeId in self._keyframes:
+                self.addUniverse(universeId, universe)
+        multiverse.renderers.append(self.render)
+
+    def play(self, speed: float = 1.0):
+        """Playing from the playhead, from the start if the end was reached"""
+        with self._lock:
+            if self.time >= self.duration:
+                self._seek(0.0)
+            self.speed = speed
+            self._origin = perf_counter() - self.time / speed
+            self.playing = True
+
+    def pause(self):
+        self.playing = False
+
+    def stop(self):
+        """Pausing and returning to the start"""
+        self.playing = False
+        self.seek(0.0)
+
+    def seek(self, seconds: float):
+        """Moving the playhead, the universes show the recorded output at that time"""
+        with self._lock:
+            self._seek(seconds)
+            self._origin = perf_counter() - self.time / self.speed
+
+    def _seek(self, seconds: float):
+        seconds = min(max(seconds, 0.0), self.duration)
+        # universeId: offset of the keyframe the universe is restored from
+        since: Dict[int, int] = {}
+        for universeId, frame in self.frames.items():
+            times, offsets = self._keyframes[universeId]
+            index = bisect_right(times, seconds) - 1
+            if index < 0:
+                # Not recorded yet at that time
+                frame.clear()
+                index = 0
+            since[universeId] = offsets[index]
+        self._position = min(since.values(), default=self._end)
+        self._apply(seconds, since)
+        self.time = seconds
+
+    def _apply(self, until: float, since: Optional[Dict[int, int]] = None):
+        """Copying the records up to until into the frames, when seeking only the ones from the keyframes on"""
+        view, frames, position, end = self._view, self.frames, self._position, self._end
+        unpackRecord, unpackRun = _RECORD.unpack_from, _RUN.unpack_from
+        while position < end:
+            _, universeId, seconds, length = unpackRecord(view, position)
+            if seconds > until:
+                break
+            run = position + _RECORD.size
+            position = run + length
+            frame = frames.get(universeId)
+            if frame is None or (since is not None and run < since[universeId]):
+                continue
+            back = frame.back
+            # Commits are skipped meanwhile, so a frame never shows half a record
+            with frame._holdLock:
+                while run < position:
+                    first, count = unpackRun(view, run)
+                    run += _RUN.size
+                    back[first : first + count] = view[run : run + count]
+                    run += count
+        self._position = position
+
+    def advance(self, seconds: float):
+        """
+        Moving the playhead forward to seconds, e.g. following an external clock like timecode,
+        only the records in between are copied
+        """
+        with self._lock:
+            if seconds < self.time:
+                self._seek(seconds)
+            else:
+                self._apply(seconds)
+                self.time = min(seconds, self.duration)
+
+    def render(self):
+        """Renderer advancing the playhead to the current time"""
+        if not self.playing:
+            return
+        with self._lock:
+            seconds = (perf_counter() - self._origin) * self.speed
+            if seconds < self.duration:
+                self._apply(seconds)
+                self.time = seconds
+                return
+            self._apply(self.duration)
+            self.time = self.duration
+            if not self.loop or self.duration <= 0:
+                self.playing = False
+                return
+            self._seek(seconds % self.duration)
+            self._origin = perf_counter() - self.time / self.speed
+
+    def close(self):
+        self.playing = False
+        self._view.release()
+        self._map.close()
+        self._file.close()
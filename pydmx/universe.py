@@ -1,15 +1,88 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional, Union
+
+from pydmx.controller.asynccontroller import AsyncDMXController
 from pydmx.controller.controller import DMXController
 from pydmx.fixture.fixture import Fixture
+from pydmx.fixture.slotmap import SlotMap
+from pydmx.frame import DMXFrame
 
 
 class Universe:
-    def __init__(self):
-        self.controller: DMXController = None
-        self.buffer = list((0,) * 512)
+    def __init__(self, controller: DMXController = None):
+        self._controller: DMXController = None
+        # The frame buffer is shared with the controller, so nothing has to be converted or copied per update
+        self.buffer = DMXFrame()
+        # alias: compiled slot map of the patched fixture
         self.fixtureRegistry = {}
+        # Serializes updateAsync blocks, created on first use inside the running event loop
+        self._asyncLock: Optional[asyncio.Lock] = None
+        if controller is not None:
+            self.controller = controller
+
+    @property
+    def controller(self) -> DMXController:
+        return self._controller
+
+    @controller.setter
+    def controller(self, controller: DMXController):
+        self._controller = controller
+        if controller is not None:
+            controller.frame = self.buffer
+
+    def update(self):
+        """
+        Grouping writes to the buffer, so they are sent in the same frame:
+        with universe.update(): ...
+        """
+        return self.buffer.hold()
+
+    @asynccontextmanager
+    async def updateAsync(self):
+        """
+        Same as update for controllers driven by an event loop (AsyncDMXController),
+        returns once the frame containing the writes was sent:
+        async with universe.updateAsync(): ...
+        Overlapping blocks wait for each other on an asyncio.Lock instead of blocking the loop on the frame's hold.
+        """
+        controller = self._controller
+        if not isinstance(controller, AsyncDMXController):
+            raise TypeError(f"updateAsync needs an AsyncDMXController, this universe has {type(controller).__name__}")
+        if self._asyncLock is None:
+            self._asyncLock = asyncio.Lock()
+        async with self._asyncLock:
+            with self.buffer.hold():
+                yield self.buffer
+            sent = controller.sent()
+        await sent
 
-    def addFixture(self, fixtureName: str, alias: str):
+    def commit(self) -> bool:
+        """Publishing the buffer to the controller, returns if the frame changed"""
+        return self.buffer.commit()
+
+    def addFixture(self, fixtureName: str, alias: str, mode: Union[str, int] = 0, address: int = 1) -> SlotMap:
+        """Patching a fixture in a mode at a start address (1-512)"""
+        if alias in self.fixtureRegistry:
+            return print(f"The alias {alias} is already used in this universe.")
         try:
             fixture = Fixture(fixtureName, alias)
-        except:
-            print("Sorry, PyDmx was unable to create this Fixture.")
+            slotmap = fixture.compile(mode, address, self.buffer)
+        except Exception as error:
+            return print(f"Sorry, PyDmx was unable to create this Fixture: {error}")
+
+        for other in self.fixtureRegistry.values():
+            if address < other.address + other.footprint and other.address < address + slotmap.footprint:
+                return print(f"The fixture overlaps with the fixture at address {other.address}.")
+        self.fixtureRegistry[alias] = slotmap
+        return slotmap
+
+    def removeFixture(self, alias: str):
+        try:
+            self.fixtureRegistry.pop(alias)
+        except KeyError:
+            print("Fixture alias doesn't exist")
+
+    def setAttribute(self, alias: str, attribute: str, value: int):
+        """Setting an attribute (e.g. "Red") of a patched fixture to a value in its patched resolution"""
+        self.fixtureRegistry[alias].set(attribute, value)
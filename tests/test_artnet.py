@@ -0,0 +1,116 @@
+import socket
+import time
+
+import pytest
+
+from pydmx.controller.artnet import HEADER_LENGTH, OP_DMX, OP_SYNC, SYNC_PACKET, ArtNetController
+from pydmx.frame import DMXFrame
+
+
+@pytest.fixture
+def receiver():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(0.5)
+    yield sock
+    sock.close()
+
+
+def receive(sock: socket.socket) -> bytes:
+    return sock.recv(1024)
+
+
+def nothingReceived(sock: socket.socket) -> bool:
+    sock.settimeout(0.05)
+    try:
+        sock.recv(1024)
+    except socket.timeout:
+        return True
+    return False
+
+
+def controller(receiver: socket.socket, universe: int = 0, **kwargs) -> ArtNetController:
+    return ArtNetController("127.0.0.1", universe, port=receiver.getsockname()[1], **kwargs)
+
+
+def test_artdmx_header(receiver):
+    artnet = controller(receiver, 0x1234 & 0x7FFF, physical=3)
+    artnet.frame[:3] = b"\x01\x02\x03"
+    artnet.frame.commit()
+    artnet.write()
+    packet = receive(receiver)
+    assert packet[:8] == b"Art-Net\x00"
+    assert int.from_bytes(packet[8:10], "little") == OP_DMX
+    assert int.from_bytes(packet[10:12], "big") == 14
+    assert packet[12] == 1
+    assert packet[13] == 3
+    assert packet[14] == 0x34 and packet[15] == 0x12
+    assert int.from_bytes(packet[16:18], "big") == 512
+    assert len(packet) == HEADER_LENGTH + 512
+    assert packet[HEADER_LENGTH : HEADER_LENGTH + 4] == b"\x01\x02\x03\x00"
+    artnet.close()
+
+
+def test_port_address_range(receiver):
+    with pytest.raises(ValueError):
+        controller(receiver, 0x8000)
+
+
+def test_sequence_wraps_without_zero(receiver):
+    artnet = controller(receiver)
+    sequences = [artnet.encode()[12] for _ in range(512)]
+    assert sequences[:255] == list(range(1, 256))
+    assert sequences[255:257] == [1, 2]
+    assert 0 not in sequences
+    artnet.close()
+
+
+def test_odd_frame_padded_to_even_length(receiver, monkeypatch):
+    monkeypatch.setattr("pydmx.controller.controller.DMXFrame", lambda: DMXFrame(5))
+    artnet = controller(receiver)
+    artnet.frame[:] = b"\x05\x04\x03\x02\x01"
+    artnet.frame.commit()
+    artnet.write()
+    packet = receive(receiver)
+    assert int.from_bytes(packet[16:18], "big") == 6
+    assert packet[HEADER_LENGTH:] == b"\x05\x04\x03\x02\x01\x00"
+    artnet.close()
+
+
+def test_artsync_follows_data(receiver):
+    artnet = controller(receiver, sync=True)
+    artnet.write()
+    assert int.from_bytes(receive(receiver)[8:10], "little") == OP_DMX
+    sync = receive(receiver)
+    assert sync == SYNC_PACKET
+    assert int.from_bytes(sync[8:10], "little") == OP_SYNC
+    artnet.close()
+
+
+def test_write_many_sends_one_artsync(receiver):
+    controllers = [controller(receiver, universe, sync=True) for universe in range(3)]
+    ArtNetController.writeMany(controllers)
+    packets = [receive(receiver) for _ in range(4)]
+    assert [packet[14] for packet in packets[:3]] == [0, 1, 2]
+    assert packets[3] == SYNC_PACKET
+    assert nothingReceived(receiver)
+    for artnet in controllers:
+        artnet.close()
+
+
+def test_keep_alive_skips_unchanged_frames(receiver):
+    artnet = controller(receiver, keepAlive=0.2)
+    artnet.frame[0] = 1
+    artnet._frame()
+    assert receive(receiver)[HEADER_LENGTH] == 1
+    artnet._frame()
+    assert nothingReceived(receiver)
+    assert artnet.framesUnchanged == 1
+    artnet.frame[0] = 2
+    artnet._frame()
+    assert receive(receiver)[HEADER_LENGTH] == 2
+    time.sleep(0.25)
+    artnet._frame()
+    assert receive(receiver)[HEADER_LENGTH] == 2
+    assert artnet.framesSent == 3
+    artnet.close()
@@ -0,0 +1,80 @@
+from pydmx.fixture.capabilities import CapabilityResolver
+from pydmx.openfixturelibrary.channelSchema import ChannelSchema
+from pydmx.openfixturelibrary.ofldeserializer import converter
+
+STROBE = converter(ChannelSchema)(
+    {
+        "capabilities": [
+            {"dmxRange": [0, 9], "type": "ShutterStrobe", "shutterEffect": "Closed"},
+            {"dmxRange": [10, 99], "type": "ShutterStrobe", "shutterEffect": "Strobe", "speedStart": "1Hz", "speedEnd": "19Hz"},
+            # 100 to 149 do nothing
+            {"dmxRange": [150, 249], "type": "ShutterStrobe", "shutterEffect": "Pulse", "speedStart": "slow", "speedEnd": "fast"},
+            {"dmxRange": [250, 255], "type": "ShutterStrobe", "shutterEffect": "Open"},
+        ]
+    }
+)
+
+
+def test_8bit_table():
+    resolver = CapabilityResolver(STROBE)
+    assert resolver._table is not None
+    assert [resolver.index(value) for value in (0, 9, 10, 99, 100, 149, 150, 255)] == [0, 0, 1, 1, -1, -1, 2, 3]
+    capability, fraction = resolver.resolve(10)
+    assert capability.shutterEffect.value == "Strobe"
+    assert fraction == 0.0
+    assert resolver.resolve(99)[1] == 1.0
+    assert resolver.resolve(120) is None
+    assert resolver.dmxRange == (0, 255)
+    assert resolver.range(2) == (150, 249)
+
+
+def test_16bit_bisect():
+    resolver = CapabilityResolver(STROBE, 2)
+    assert resolver._table is None
+    # The ends of the 8 bit ranges are filled with the fine byte, 9 covers 0x0900 to 0x09FF
+    assert resolver.range(0) == (0, 0x09FF)
+    assert resolver.range(1) == (0x0A00, 0x63FF)
+    assert resolver.range(3) == (0xFA00, 0xFFFF)
+    assert [resolver.index(value) for value in (0x09FF, 0x0A00, 0x63FF, 0x6400, 0x95FF, 0x9600, 0xFFFF)] == [0, 1, 1, -1, -1, 2, 3]
+    assert resolver.resolve(0x63FF)[1] == 1.0
+    assert resolver.resolve(0x6400) is None
+    # Both agree on the capability of every 8 bit value
+    eightBit = CapabilityResolver(STROBE)
+    assert all(resolver.index(value << 8 | 0x80) == eightBit.index(value) for value in range(256))
+
+
+def test_value_of_ranged_criteria():
+    resolver = CapabilityResolver(STROBE)
+    assert resolver.value("ShutterStrobe", shutterEffect="Open") == 252
+    assert resolver.value("ShutterStrobe", shutterEffect="Open", fraction=0.0) == 250
+    # Keywords match the start or end of the range
+    assert resolver.value("ShutterStrobe", shutterEffect="Pulse", speed="fast") == 249
+    assert resolver.value("ShutterStrobe", shutterEffect="Pulse", speed="slow") == 150
+    # Numbers in the range are interpolated, in the unit of the range
+    assert resolver.value("ShutterStrobe", speed="1Hz") == 10
+    assert resolver.value("ShutterStrobe", speed="5.5Hz") == 32
+    assert resolver.value("ShutterStrobe", speed="19Hz") == 99
+    assert resolver.value("ShutterStrobe", speed="25Hz") is None
+    assert resolver.value("ShutterStrobe", speed="10%") is None
+    assert resolver.value("ShutterStrobe", shutterEffect="Lightning") is None
+    assert resolver.value("Intensity") is None
+    assert CapabilityResolver(STROBE, 2).value("ShutterStrobe", speed="fast") == 0xF9FF
+    assert resolver.parameter(resolver.capabilities[1], "speed", 0.5) == "10hz"
+    assert resolver.parameter(resolver.capabilities[2], "speed", 0.75) == "fast"
+
+
+def test_value_requests_are_cached(monkeypatch):
+    resolver = CapabilityResolver(STROBE)
+    calls = []
+    match = resolver._match
+    monkeypatch.setattr(resolver, "_match", lambda capability, criteria: calls.append(capability) or match(capability, criteria))
+    assert resolver.value("ShutterStrobe", shutterEffect="Pulse", speed="fast") == 249
+    scanned = len(calls)
+    assert scanned == 3
+    # The same request with the criteria in another order or case
+    assert resolver.value("ShutterStrobe", speed="FAST", shutterEffect="Pulse") == 249
+    assert len(calls) == scanned
+    # Requests without a match are cached as well
+    assert resolver.value("ShutterStrobe", speed="25Hz") is None
+    assert resolver.value("ShutterStrobe", speed="25Hz") is None
+    assert len(calls) == scanned + 4
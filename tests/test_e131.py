@@ -0,0 +1,137 @@
+import socket
+import uuid
+
+import pytest
+
+from pydmx.controller.e131 import (
+    ACN_PACKET_IDENTIFIER,
+    DMP_HEADER_LENGTH,
+    E131_PORT,
+    OPTION_PREVIEW_DATA,
+    OPTION_STREAM_TERMINATED,
+    VECTOR_DMP_SET_PROPERTY,
+    VECTOR_E131_DATA_PACKET,
+    VECTOR_ROOT_E131_DATA,
+    E131Controller,
+    multicastAddress,
+)
+
+CID = uuid.UUID("12345678-9abc-def0-1234-56789abcdef0")
+
+
+@pytest.fixture
+def receiver():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(0.5)
+    yield sock
+    sock.close()
+
+
+def controller(receiver: socket.socket, universe: int = 1, **kwargs) -> E131Controller:
+    return E131Controller(universe, host="127.0.0.1", port=receiver.getsockname()[1], cid=CID, **kwargs)
+
+
+def flagsAndLength(packet: bytes, offset: int) -> int:
+    value = int.from_bytes(packet[offset : offset + 2], "big")
+    assert value >> 12 == 0x7
+    return value & 0x0FFF
+
+
+def test_layers(receiver):
+    e131 = controller(receiver, 7, sourceName="test source", priority=150)
+    e131.frame[:2] = b"\xff\x80"
+    e131.frame.commit()
+    e131.write()
+    packet = receiver.recv(1024)
+    assert len(packet) == DMP_HEADER_LENGTH + 512
+
+    # Root layer
+    assert packet[0:2] == b"\x00\x10"
+    assert packet[2:4] == b"\x00\x00"
+    assert packet[4:16] == ACN_PACKET_IDENTIFIER
+    assert flagsAndLength(packet, 16) == len(packet) - 16
+    assert int.from_bytes(packet[18:22], "big") == VECTOR_ROOT_E131_DATA
+    assert packet[22:38] == CID.bytes
+
+    # Framing layer
+    assert flagsAndLength(packet, 38) == len(packet) - 38
+    assert int.from_bytes(packet[40:44], "big") == VECTOR_E131_DATA_PACKET
+    assert packet[44:108].rstrip(b"\x00") == b"test source"
+    assert packet[108] == 150
+    assert packet[112] == 0
+    assert int.from_bytes(packet[113:115], "big") == 7
+
+    # DMP layer
+    assert flagsAndLength(packet, 115) == len(packet) - 115
+    assert packet[117] == VECTOR_DMP_SET_PROPERTY
+    assert packet[118] == 0xA1
+    assert packet[119:121] == b"\x00\x00"
+    assert packet[121:123] == b"\x00\x01"
+    assert int.from_bytes(packet[123:125], "big") == 513
+    assert packet[125] == 0
+    assert packet[126:129] == b"\xff\x80\x00"
+    e131.close()
+
+
+def test_priority(receiver):
+    e131 = controller(receiver)
+    assert e131.priority == 100
+    e131.priority = 200
+    e131.write()
+    assert receiver.recv(1024)[108] == 200
+    with pytest.raises(ValueError):
+        e131.priority = 201
+    with pytest.raises(ValueError):
+        controller(receiver, priority=-1)
+    e131.close()
+
+
+def test_universe_range(receiver):
+    for universe in (0, 64000):
+        with pytest.raises(ValueError):
+            controller(receiver, universe)
+
+
+def test_sequence_increments_and_wraps(receiver):
+    e131 = controller(receiver)
+    sequences = [e131.encode()[111] for _ in range(257)]
+    assert sequences[:3] == [1, 2, 3]
+    assert sequences[254:257] == [255, 0, 1]
+    e131.write()
+    assert receiver.recv(1024)[111] == 2
+    e131.close()
+
+
+def test_preview_option(receiver):
+    e131 = controller(receiver, preview=True)
+    e131.write()
+    assert receiver.recv(1024)[112] == OPTION_PREVIEW_DATA
+    e131.preview = False
+    e131.write()
+    assert receiver.recv(1024)[112] == 0
+    e131.close()
+
+
+def test_stream_terminated(receiver):
+    e131 = controller(receiver, preview=True)
+    e131.terminate()
+    packets = [receiver.recv(1024) for _ in range(3)]
+    assert all(packet[112] == OPTION_STREAM_TERMINATED | OPTION_PREVIEW_DATA for packet in packets)
+    assert [packet[111] for packet in packets] == [1, 2, 3]
+    e131.write()
+    assert receiver.recv(1024)[112] == OPTION_PREVIEW_DATA
+    e131.close()
+    assert all(receiver.recv(1024)[112] & OPTION_STREAM_TERMINATED for _ in range(3))
+
+
+def test_unicast_and_multicast_destination(receiver):
+    unicast = controller(receiver)
+    assert not unicast.multicast
+    assert unicast.address == ("127.0.0.1", receiver.getsockname()[1])
+    multicast = E131Controller(258)
+    assert multicast.multicast
+    assert multicast.address == ("239.255.1.2", E131_PORT)
+    assert multicastAddress(63999) == "239.255.249.255"
+    unicast.close()
+    multicast.close()
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pydmx.fade import CURVES, Chase, FadeEngine
+from pydmx.fixture.slotmap import SlotMap
+from pydmx.frame import DMXFrame
+
+
+def dimmer(frame: DMXFrame, address: int, resolution: int = 1) -> SlotMap:
+    """Slot map of a plain dimmer, built without the fixture library"""
+    names = ["Intensity", "Intensity fine"][:resolution]
+    channel = SimpleNamespace(fineChannelAliases=names[1:], dmxValueResolution=None, defaultValue=None)
+    mode = SimpleNamespace(name="dimmer", shortName=None, channels=names)
+    fixture = SimpleNamespace(name="Dimmer", modes=[mode], availableChannels={"Intensity": channel})
+    return SlotMap(fixture, 0, address, frame)
+
+
+def test_16bit_fade():
+    frame = DMXFrame()
+    slotmap = dimmer(frame, 1, 2)
+    engine = FadeEngine()
+    engine.fade(slotmap, "Intensity", 0xFFFF, 1.0, began=0.0)
+    engine.tick(0.5)
+    # Half way is 0x7FFF.8, the fine byte moves along instead of staying at 0
+    assert slotmap.get("Intensity") == 0x8000
+    assert bytes(frame.back[:2]) == bytes((0x80, 0x00))
+    engine.tick(0.25 / 0xFFFF + 0.25)
+    assert slotmap.get("Intensity") == 0x4000
+    engine.tick(2.0)
+    assert slotmap.get("Intensity") == 0xFFFF
+    # Finished fades are removed
+    assert len(engine) == 0
+
+
+def test_fade_replaces_running_fade():
+    frame = DMXFrame()
+    first, second = dimmer(frame, 1), dimmer(frame, 2)
+    engine = FadeEngine()
+    engine.fade(first, "Intensity", 200, 1.0, began=0.0)
+    engine.fade(second, "Intensity", 100, 1.0, began=0.0)
+    engine.tick(0.5)
+    assert bytes(frame.back[:2]) == bytes((100, 50))
+    # From the current value down to 0, the other fade goes on
+    engine.fade(first, "Intensity", 0, 1.0, began=0.5)
+    engine.tick(1.0)
+    assert len(engine) == 1
+    assert bytes(frame.back[:2]) == bytes((50, 100))
+    engine.tick(1.5)
+    assert bytes(frame.back[:2]) == bytes((0, 100))
+    assert len(engine) == 0
+
+
+@pytest.mark.parametrize("curve", list(CURVES))
+def test_curve_endpoints(curve):
+    table = CURVES[curve]
+    assert table[0] == 0.0
+    assert table[-1] == 1.0
+    assert np.all(np.diff(table) >= 0)
+
+    frame = DMXFrame()
+    slotmap = dimmer(frame, 1)
+    engine = FadeEngine()
+    engine.fade(slotmap, "Intensity", 255, 1.0, curve, start=0, began=0.0)
+    engine.tick(0.0)
+    assert frame.back[0] == 0
+    engine.tick(1.0)
+    assert frame.back[0] == 255
+
+
+def test_chase_steps():
+    frame = DMXFrame()
+    slotmaps = [dimmer(frame, address) for address in (1, 2, 3)]
+    steps = [[(slotmap, "Intensity", 255)] + [(other, "Intensity", 0) for other in slotmaps if other is not slotmap] for slotmap in slotmaps]
+    engine = FadeEngine()
+    chase = engine.addChase(Chase(steps, stepTime=1.0))
+    engine.tick(10.0)
+    assert bytes(frame.back[:3]) == bytes((255, 0, 0))
+    engine.tick(11.5)
+    assert bytes(frame.back[:3]) == bytes((0, 255, 0))
+    # Missed steps are skipped, looping back to the first step
+    engine.tick(13.2)
+    assert chase.step == 3
+    assert bytes(frame.back[:3]) == bytes((255, 0, 0))
+    assert engine.chases == [chase]
+
+
+def test_finished_chase_is_removed():
+    frame = DMXFrame()
+    slotmap = dimmer(frame, 1)
+    engine = FadeEngine()
+    chase = engine.addChase(Chase([[(slotmap, "Intensity", 100)], [(slotmap, "Intensity", 200)]], 1.0, fadeTime=1.0, loop=False))
+    engine.tick(0.0)
+    engine.tick(1.0)
+    assert chase.finished
+    assert engine.chases == []
+    # The fade of the last step still runs to its end, from the value the step started at
+    engine.tick(1.5)
+    assert frame.back[0] == 100
+    engine.tick(5.0)
+    assert frame.back[0] == 200
+    assert len(engine) == 0
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+import pydmx.fixtureIndex.fixtureIndex as fixtureIndex
+from pydmx.fixtureIndex.fixtureIndex import FixtureIndex
+
+
+def test_import_of_invalid_json_is_reported(tmp_path, capsys):
+    path = tmp_path / "broken.json"
+    path.write_text('{"custom": ', encoding="utf-8")
+    assert FixtureIndex.getInstance().importCustomFixtures(str(path)) is None
+    assert str(path) in capsys.readouterr().out
+
+
+# A cut down OFL fixture schema, referencing its definitions like the real one
+FIXTURE_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "$id": "https://example.org/schemas/fixture.json",
+    "version": "12.2.1",
+    "type": "object",
+    "required": ["name", "categories"],
+    "properties": {
+        "name": {"$ref": "definitions.json#/definitions/nonEmptyString"},
+        "categories": {"type": "array", "items": {"type": "string"}},
+    },
+}
+DEFINITIONS_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "$id": "https://example.org/schemas/definitions.json",
+    "definitions": {"nonEmptyString": {"type": "string", "minLength": 1}},
+}
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    for name, schema in (("fixture.json", FIXTURE_SCHEMA), ("definitions.json", DEFINITIONS_SCHEMA)):
+        (tmp_path / name).write_text(json.dumps(schema), encoding="utf-8")
+    monkeypatch.setattr(fixtureIndex, "schemadir", str(tmp_path))
+    monkeypatch.setattr(FixtureIndex, "_FixtureIndex__validators", {})
+    index = FixtureIndex.getInstance()
+    monkeypatch.setattr(index, "customfixtures", {})
+    monkeypatch.setattr(index, "_schemaVersion", None)
+    return index
+
+
+def test_valid_fixture_is_created(index):
+    assert index.createCustomFixtures({"custom#par": {"name": "Par", "categories": ["Color Changer"]}}) == {}
+    assert index.customfixtures["custom#par"]["name"] == "Par"
+    assert index._schemaVersion == "12.2.1"
+
+
+def test_errors_are_collected_per_fixture(index):
+    errors = index.createCustomFixtures(
+        {
+            "custom#par": '{"name": "Par", "categories": []}',
+            "custom#empty": {"name": "", "categories": "Dimmer"},
+            "custom#broken": '{"name": ',
+            "custom#list": ["Par"],
+        }
+    )
+    assert list(index.customfixtures) == ["custom#par"]
+    assert sorted(errors) == ["custom#broken", "custom#empty", "custom#list"]
+    # Every schema error of a fixture is reported, with the path to the offending value
+    assert len(errors["custom#empty"]) == 2
+    assert any(error.startswith("name: ") for error in errors["custom#empty"])
+    assert any(error.startswith("categories: ") for error in errors["custom#empty"])
+    assert errors["custom#list"] == ["A fixture has to be a JSON string or a dictionary."]
+    assert index.createCustomFixtures({"custom#par": {"name": "Par", "categories": []}}) == {
+        "custom#par": ["This ID already exists"]
+    }
+
+
+def test_validator_is_built_once(index, monkeypatch):
+    built = []
+    validatorFor = fixtureIndex.validator_for
+    monkeypatch.setattr(fixtureIndex, "validator_for", lambda schema: built.append(schema) or validatorFor(schema))
+    index.createCustomFixtures({"custom#a": {"name": "A", "categories": []}})
+    index.createCustomFixtures({"custom#b": {"name": "B", "categories": []}})
+    index.createCustomFixture("custom#c", {"name": "", "categories": []})
+    assert len(built) == 1
+    assert sorted(index.customfixtures) == ["custom#a", "custom#b"]
+
+
+def test_missing_schemas_are_reported(index, tmp_path, monkeypatch):
+    monkeypatch.setattr(fixtureIndex, "schemadir", str(tmp_path / "missing"))
+    with pytest.raises(FileNotFoundError, match="schemas"):
+        index.createCustomFixtures({"custom#par": {"name": "Par", "categories": []}})
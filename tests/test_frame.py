@@ -0,0 +1,75 @@
+from threading import Event, Thread
+
+from pydmx.frame import DMXFrame
+
+
+def published(frame: DMXFrame) -> bytes:
+    with frame.read() as data:
+        return bytes(data)
+
+
+def test_commit_publishes_the_back_buffer():
+    frame = DMXFrame(4, startCode=0xCC)
+    frame[0] = 1
+    frame.set(1, 2)
+    frame.setRange(2, b"\x03\x04")
+    # Writes stay in the back buffer until they are committed
+    assert published(frame) == bytes((0xCC, 0, 0, 0, 0))
+    assert frame.commit()
+    assert published(frame) == bytes((0xCC, 1, 2, 3, 4))
+    assert bytes(frame.payload) == bytes((1, 2, 3, 4))
+    # The buffers are separate, later writes don't show up before the next commit
+    frame[0] = 9
+    assert published(frame)[1] == 1
+    frame.clear()
+    frame.commit()
+    assert published(frame) == bytes((0xCC, 0, 0, 0, 0))
+
+
+def test_generation_advances_only_on_changes():
+    frame = DMXFrame()
+    assert frame.generation == 0
+    assert not frame.commit()
+    assert frame.generation == 0
+    frame[10] = 255
+    assert frame.commit()
+    assert frame.generation == 1
+    assert not frame.commit()
+    # Writing the published value again isn't a change
+    frame[10] = 255
+    assert not frame.commit()
+    frame[10] = 0
+    frame.commit()
+    assert frame.generation == 2
+
+
+def test_hold_blocks_commits():
+    frame = DMXFrame()
+    with frame.hold():
+        frame[0] = 1
+        assert not frame.commit()
+        frame[1] = 2
+    assert published(frame)[1:3] == bytes(2)
+    assert frame.commit()
+    assert published(frame)[1:3] == bytes((1, 2))
+    assert frame.generation == 1
+
+
+def test_commit_from_another_thread_skips_held_frame():
+    frame = DMXFrame()
+    holding, committed = Event(), []
+
+    def commit():
+        holding.wait()
+        committed.append(frame.commit())
+
+    thread = Thread(target=commit)
+    thread.start()
+    with frame.hold():
+        frame[0] = 1
+        holding.set()
+        thread.join()
+    # The frame clock doesn't wait for the group of writes, the previous frame stays published
+    assert committed == [False]
+    assert frame.generation == 0
+    assert frame.commit()
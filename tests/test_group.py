@@ -0,0 +1,86 @@
+import numpy as np
+
+from pydmx.fixture.group import FixtureGroup
+from pydmx.fixture.slotmap import SlotMap
+from pydmx.frame import DMXFrame
+from pydmx.openfixturelibrary.ofldeserializer import fromDict
+
+META = {"authors": ["Tester"], "createDate": "2020-01-01", "lastModifyDate": "2020-01-01"}
+
+# Dimmer in 8 bit mode, only dimming from 10 to 200, and in 16 bit mode over the whole range, plus a shutter
+DIMMER = fromDict(
+    {
+        "name": "Dimmer",
+        "categories": ["Dimmer"],
+        "meta": META,
+        "availableChannels": {
+            "Dimmer": {"fineChannelAliases": ["Dimmer fine"], "capability": {"type": "Intensity"}},
+            "Limited": {"capabilities": [{"dmxRange": [10, 200], "type": "Intensity"}]},
+            "Shutter": {"capability": {"type": "ShutterStrobe", "shutterEffect": "Open"}},
+        },
+        "modes": [
+            {"name": "8bit", "channels": ["Limited", "Shutter"]},
+            {"name": "16bit", "channels": ["Dimmer", "Dimmer fine"]},
+            {"name": "coarse", "channels": ["Dimmer"]},
+        ],
+    }
+)
+
+
+def test_values_are_clamped_to_the_dmx_range():
+    frame = DMXFrame()
+    members = [SlotMap(DIMMER, "8bit", address, frame) for address in (1, 3, 5)]
+    group = FixtureGroup(members)
+    group.set("Limited", np.array([0, 100, 255]))
+    assert bytes(frame.back[:6:2]) == bytes((10, 100, 200))
+    group.set("Limited", -5)
+    assert bytes(frame.back[:6:2]) == bytes((10, 10, 10))
+    group.setNormalized("Limited", np.array([0.0, 0.5, 1.0]))
+    assert bytes(frame.back[:6:2]) == bytes((10, 128, 200))
+    # The other attribute is left alone
+    assert bytes(frame.back[1:6:2]) == bytes(3)
+
+
+def test_mixed_resolutions_and_frames():
+    first, second = DMXFrame(), DMXFrame()
+    eightBit = SlotMap(DIMMER, "8bit", 1, first)
+    sixteenBit = SlotMap(DIMMER, "16bit", 11, first)
+    other = SlotMap(DIMMER, "16bit", 1, second)
+    group = FixtureGroup([eightBit, sixteenBit, other])
+    # The 8 bit members don't have Dimmer, the 16 bit ones don't have Limited
+    group.set("Dimmer", np.array([0xFFFF, 0x1234, 0xABCD]))
+    assert bytes(first.back[10:12]) == bytes((0x12, 0x34))
+    assert bytes(second.back[:2]) == bytes((0xAB, 0xCD))
+    assert bytes(first.back[:2]) == bytes(2)
+    group.setNormalized("Dimmer", 0.5)
+    assert sixteenBit.get("Dimmer") == other.get("Dimmer") == 0x8000
+
+    # Dimmer patched without its fine channel next to 16 bit ones, every value is given in the member's resolution
+    coarse = SlotMap(DIMMER, "coarse", 21, first)
+    assert coarse.resolution("Dimmer") == 1
+    mixed = FixtureGroup([coarse, sixteenBit, other])
+    mixed.set("Dimmer", np.array([0x80, 0x0102, 0x0304]))
+    assert first.back[20] == 0x80
+    assert bytes(first.back[10:12]) == bytes((1, 2))
+    assert bytes(second.back[:2]) == bytes((3, 4))
+    # Clamped to the maximum of each member
+    mixed.set("Dimmer", 0x1234)
+    assert first.back[20] == 0xFF
+    assert sixteenBit.get("Dimmer") == 0x1234
+    mixed.setNormalized("Dimmer", np.array([0.5, 0.25, 1.0]))
+    assert first.back[20] == 128
+    assert sixteenBit.get("Dimmer") == 0x4000
+    assert other.get("Dimmer") == 0xFFFF
+    assert first.back[21] == 0
+
+
+def test_invalidate_after_repatching():
+    frame = DMXFrame()
+    slotmap = SlotMap(DIMMER, "16bit", 1, frame)
+    group = FixtureGroup([slotmap])
+    group.set("Dimmer", 0x0102)
+    group.members[0] = SlotMap(DIMMER, "16bit", 101, frame)
+    group.invalidate()
+    group.set("Dimmer", 0x0304)
+    assert bytes(frame.back[:2]) == bytes((1, 2))
+    assert bytes(frame.back[100:102]) == bytes((3, 4))
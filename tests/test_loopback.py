@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from pydmx.controller.controller import SLOT_TIME
+from pydmx.controller.loopback import LoopbackController
+
+
+@pytest.fixture
+def controller():
+    controller = LoopbackController()
+    yield controller
+    controller.close()
+
+
+def test_frame_occupies_the_line(controller):
+    assert controller.frameTime == pytest.approx(controller.breakTime + controller.markTime + 513 * SLOT_TIME)
+    # A full universe takes about 22.7 ms at 250 kbaud
+    assert 0.022 < controller.frameTime < 0.0235
+    controller.write()
+    controller.write()
+    assert controller.framesWritten == 1
+    assert controller.skippedFrames == 1
+    time.sleep(controller.frameTime)
+    controller.write()
+    assert controller.framesWritten == 2
+    assert controller.lineTime == pytest.approx(2 * controller.frameTime)
+    timestamps, _ = controller.captured()
+    assert timestamps[1] - timestamps[0] >= controller.frameTime
+
+
+def test_clear_capture_frees_the_line(controller):
+    controller.write()
+    controller.clearCapture()
+    assert controller.captured()[0].size == 0
+    controller.write()
+    assert controller.framesWritten == 1
+    assert controller.skippedFrames == 0
+
+
+def test_without_line_simulation_every_frame_is_captured():
+    controller = LoopbackController(simulateLine=False)
+    for _ in range(10):
+        controller.write()
+    assert controller.framesWritten == 10
+    assert controller.skippedFrames == 0
+    controller.close()
+
+
+def test_ring_buffer_wraps_around():
+    controller = LoopbackController(capacity=4, simulateLine=False)
+    for value in range(10):
+        controller.frame.set(0, value)
+        controller.frame.commit()
+        controller.write()
+    assert controller.lastFrame[0] == 9
+    timestamps, frames = controller.captured()
+    # The last capacity frames, oldest first, with their start code
+    assert frames[:, 1].tolist() == [6, 7, 8, 9]
+    assert frames[:, 0].tolist() == [0, 0, 0, 0]
+    assert list(timestamps) == sorted(timestamps)
+    assert controller.captured(2)[1][:, 1].tolist() == [8, 9]
+    assert controller.captured(10)[1].shape == (4, 513)
+    # Captures are copies, later frames don't change them
+    controller.frame.set(0, 100)
+    controller.frame.commit()
+    controller.write()
+    assert frames[:, 1].tolist() == [6, 7, 8, 9]
+    assert controller.generations[(controller.framesWritten - 1) % 4] == controller.frame.generation
+    controller.close()
@@ -0,0 +1,69 @@
+from pydmx.merge import MergeEngine
+from pydmx.universe import Universe
+
+
+def engine():
+    universe = Universe()
+    return universe, MergeEngine([universe], layers=4)
+
+
+def test_ltp_write_of_zero_takes_control():
+    universe, merge = engine()
+    a, b = merge.addLayer("a"), merge.addLayer("b")
+    a.frame(0)[5] = 100
+    merge.merge()
+    assert universe.buffer.back[5] == 100
+    b.frame(0)[5] = 0
+    merge.merge()
+    assert universe.buffer.back[5] == 0
+
+
+def test_ltp_rewrite_of_same_value_takes_control():
+    universe, merge = engine()
+    a, b = merge.addLayer("a"), merge.addLayer("b")
+    b.frame(0)[7] = 50
+    merge.merge()
+    a.frame(0)[7] = 200
+    merge.merge()
+    assert universe.buffer.back[7] == 200
+    b.frame(0)[7] = 50
+    merge.merge()
+    assert universe.buffer.back[7] == 50
+
+
+def test_unwritten_layer_keeps_no_control():
+    universe, merge = engine()
+    a = merge.addLayer("a")
+    a.frame(0)[3] = 30
+    merge.merge()
+    merge.addLayer("b")
+    merge.merge()
+    assert universe.buffer.back[3] == 30
+    assert merge.merge() is not None and merge.skippedMerges == 1
+
+
+def test_direct_value_changes_are_detected():
+    universe, merge = engine()
+    a, b = merge.addLayer("a"), merge.addLayer("b")
+    a.frame(0)[1] = 10
+    merge.merge()
+    b.values[0, 1] = 20
+    merge.merge()
+    assert universe.buffer.back[1] == 20
+    b.clear()
+    merge.merge()
+    assert universe.buffer.back[1] == 10
+
+
+def test_slot_map_writes_take_control():
+    universe, merge = engine()
+    universe.addFixture("5star-systems#spica-250m", "spot", 0, 1)
+    merge.updatePrecedence()
+    a = merge.addLayer("a").fixture(0, "spot")
+    b = merge.addLayer("b").fixture(0, "spot")
+    attribute = next(name for name in a.names if not merge.htp[0, a.slots(name)].any())
+    a.set(attribute, 100)
+    merge.merge()
+    b.set(attribute, 0)
+    merge.merge()
+    assert universe.buffer.back[a.slots(attribute)[0]] == 0
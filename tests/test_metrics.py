@@ -0,0 +1,80 @@
+from time import perf_counter
+
+import pytest
+
+from pydmx.metrics import ENCODE, FrameMetrics, Histogram
+
+
+def test_histogram_quantiles():
+    histogram = Histogram((1.0, 2.0, 3.0))
+    for value in (0.5, 1.5, 1.5, 2.5):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 1, 0]
+    assert histogram.mean == 1.5
+    assert histogram.quantile(0.25) == 1.0
+    assert histogram.quantile(0.5) == 2.0
+    # The last bucket holding it is capped by the largest observation
+    assert histogram.quantile(1.0) == 2.5
+    histogram.observe(10.0)
+    assert histogram.counts[-1] == 1
+    assert histogram.quantile(1.0) == 10.0
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_window_callback():
+    calls = []
+    start = perf_counter()
+    metrics = FrameMetrics(callback=calls.append, window=1.0)
+    metrics.begin(0.5, now=start + 0.5)
+    assert calls == []
+    metrics.sent("1", 512)
+    metrics.begin(0.5, now=start + 2.0)
+    assert calls == [metrics]
+    assert metrics.framesPerSecond == pytest.approx(1.0, rel=0.01)
+    assert metrics.bytesPerSecond == pytest.approx(256.0, rel=0.01)
+    # The next window starts at the frame which ended the last one
+    metrics.begin(0.5, now=start + 2.5)
+    assert len(calls) == 1
+
+
+def test_interval_jitter_and_drops():
+    metrics = FrameMetrics()
+    for now in (0.0, 0.025, 0.051, 0.125):
+        metrics.begin(0.025, now=now)
+    assert metrics.interval.count == 3
+    assert metrics.lastJitter == pytest.approx(0.049)
+    assert metrics.maxJitter == pytest.approx(0.049)
+    # 74 ms are three periods, two slots passed without a frame
+    assert metrics.droppedFrames == 2
+
+
+def test_intervals_per_clock():
+    metrics = FrameMetrics()
+    first, second = object(), object()
+    # Two controllers with their own frame threads, 40 Hz each but started 10 ms apart
+    for frame in range(4):
+        metrics.begin(0.025, now=frame * 0.025, clock=first)
+        metrics.begin(0.025, now=frame * 0.025 + 0.01, clock=second)
+    assert metrics.frames == 8
+    assert metrics.interval.count == 6
+    assert metrics.maxJitter == pytest.approx(0.0, abs=1e-9)
+    assert metrics.droppedFrames == 0
+
+
+def test_prometheus():
+    metrics = FrameMetrics(stageBounds=(1e-6, 1e-3))
+    metrics.observe(ENCODE, 5e-4)
+    metrics.observe(ENCODE, 0.5)
+    metrics.sent("1", 530)
+    metrics.unchanged("1")
+    lines = metrics.prometheus().splitlines()
+    assert "# TYPE pydmx_stage_seconds histogram" in lines
+    assert 'pydmx_stage_seconds_bucket{stage="encode",le="1e-06"} 0' in lines
+    assert 'pydmx_stage_seconds_bucket{stage="encode",le="0.001"} 1' in lines
+    assert 'pydmx_stage_seconds_bucket{stage="encode",le="+Inf"} 2' in lines
+    assert 'pydmx_stage_seconds_count{stage="encode"} 2' in lines
+    assert "pydmx_frame_interval_seconds_count 0" in lines
+    assert "pydmx_sent_bytes_total 530" in lines
+    assert 'pydmx_universe_frames_total{universe="1"} 1' in lines
+    assert 'pydmx_universe_unchanged_total{universe="1"} 1' in lines
+    assert metrics.prometheus("show").startswith("# HELP show_stage_seconds ")
@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+from pydmx.controller.loopback import LoopbackController
+from pydmx.multiverse import Multiverse
+from pydmx.universe import Universe
+
+
+class KeptAlive(LoopbackController):
+    """Loopback output leaving the keep-alive to the Multiverse"""
+
+    keepAlive = None
+
+
+class Batched(LoopbackController):
+    """Loopback output recording the batches it is written in"""
+
+    batches = []
+
+    @classmethod
+    def writeMany(cls, controllers):
+        cls.batches.append(list(controllers))
+        super().writeMany(controllers)
+
+
+@pytest.fixture
+def multiverse():
+    multiverse = Multiverse(keepAlive=0.2)
+    yield multiverse
+    multiverse.close()
+    for universe in multiverse.universes.values():
+        universe.controller.close()
+
+
+def test_unchanged_universes_are_resent_after_keep_alive(multiverse):
+    controllers = [KeptAlive(simulateLine=False) for _ in range(2)]
+    for universeId, controller in enumerate(controllers, start=1):
+        multiverse.addUniverse(universeId, Universe(controller))
+    multiverse.tick()
+    assert [controller.framesWritten for controller in controllers] == [1, 1]
+
+    # Only the changed universe is sent within the keep-alive time
+    multiverse[1].buffer.set(0, 255)
+    multiverse.tick()
+    multiverse.tick()
+    assert [controller.framesWritten for controller in controllers] == [2, 1]
+    assert multiverse.stats["framesUnchanged"] == 3
+    assert controllers[0].lastFrame[0] == 255
+
+    time.sleep(0.25)
+    multiverse.tick()
+    assert [controller.framesWritten for controller in controllers] == [3, 2]
+    assert multiverse.framesSent == 5
+
+
+def test_controller_keep_alive_overrides_the_multiverse(multiverse):
+    # Loopback outputs are refreshed continuously, like a DMX512 line
+    controller = LoopbackController(simulateLine=False)
+    multiverse.addUniverse(1, Universe(controller))
+    for _ in range(3):
+        multiverse.tick()
+    assert controller.framesWritten == 3
+    assert multiverse.framesUnchanged == 0
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_controllers_of_a_class_are_written_together(workers):
+    Batched.batches = []
+    multiverse = Multiverse(workers=workers)
+    batched = [Batched(simulateLine=False) for _ in range(4)]
+    other = LoopbackController(simulateLine=False)
+    for universeId, controller in enumerate(batched + [other], start=1):
+        multiverse.addUniverse(universeId, Universe(controller))
+        multiverse[universeId].buffer.set(0, universeId)
+    multiverse.tick()
+    multiverse.close()
+
+    # One batch per class, split into a chunk per output worker
+    assert sorted(len(batch) for batch in Batched.batches) == ([4] if workers == 0 else [2, 2])
+    assert sorted(id(controller) for batch in Batched.batches for controller in batch) == sorted(map(id, batched))
+    assert [controller.lastFrame[0] for controller in batched + [other]] == [1, 2, 3, 4, 5]
+    for controller in batched + [other]:
+        controller.close()
@@ -0,0 +1,83 @@
+import json
+import os
+
+from pydmx.openfixturelibrary import oflbulker
+from pydmx.openfixturelibrary.oflindex import OflLibrary
+
+
+def writeFixture(directory, relpath: str, name: str):
+    path = directory / relpath
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"name": name, "categories": ["Dimmer"]}), encoding="utf-8")
+
+
+def library(path: str) -> dict:
+    with open(path, encoding="utf-8") as infile:
+        return json.load(infile)
+
+
+def touch(path, seconds: int = 1):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+def test_incremental_build(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    writeFixture(fixtures, "acme/one.json", "One")
+    writeFixture(fixtures, "acme/two.json", "Two")
+    writeFixture(fixtures, "other/three.json", "Three")
+    output = str(tmp_path / "ofl.json")
+    assert oflbulker.build(str(fixtures), output, jobs=1) == {"parsed": 3, "reused": 0}
+    first = library(output)
+    assert first["_manufacturers"] == ["acme", "other"]
+    assert first["acme#two"] == {"name": "Two", "categories": ["Dimmer"], "manufacturerKey": "acme", "fixtureKey": "two"}
+
+    # Nothing changed, a touched file is compared by its hash
+    touch(fixtures / "acme" / "one.json")
+    assert oflbulker.build(str(fixtures), output, jobs=1) == {"parsed": 0, "reused": 3}
+    assert library(output) == first
+
+    # Only the changed files are parsed again: another size, the same size, a new file
+    writeFixture(fixtures, "acme/two.json", "Two (v2)")
+    writeFixture(fixtures, "other/three.json", "Thre3")
+    touch(fixtures / "other" / "three.json")
+    writeFixture(fixtures, "other/four.json", "Four")
+    os.remove(fixtures / "acme" / "one.json")
+    assert oflbulker.build(str(fixtures), output, jobs=1) == {"parsed": 3, "reused": 0}
+    second = library(output)
+    assert sorted(second) == ["_manufacturers", "acme#two", "other#four", "other#three"]
+    assert second["acme#two"]["name"] == "Two (v2)"
+    assert second["other#three"]["name"] == "Thre3"
+    # The offset index and the manifest follow the new library
+    assert OflLibrary(output, cacheSize=0)["other#four"]["name"] == "Four"
+    assert oflbulker.build(str(fixtures), output, jobs=1) == {"parsed": 0, "reused": 3}
+    assert library(output) == second
+
+
+def test_full_or_foreign_output_parses_everything(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    writeFixture(fixtures, "acme/one.json", "One")
+    writeFixture(fixtures, "acme/two.json", "Two")
+    output = str(tmp_path / "ofl.json")
+    oflbulker.build(str(fixtures), output, jobs=1)
+    assert oflbulker.build(str(fixtures), output, jobs=1, incremental=False) == {"parsed": 2, "reused": 0}
+
+    # An ofl.json which wasn't written by the last build can't be copied from
+    touch(output)
+    assert oflbulker.build(str(fixtures), output, jobs=1) == {"parsed": 2, "reused": 0}
+    os.remove(oflbulker.manifestPath(output))
+    assert oflbulker.build(str(fixtures), output, jobs=1) == {"parsed": 2, "reused": 0}
+
+
+def test_parallel_build(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    for number in range(6):
+        writeFixture(fixtures, f"acme/fixture-{number}.json", f"Fixture {number}")
+    output = str(tmp_path / "ofl.json")
+    assert oflbulker.build(str(fixtures), output, jobs=2) == {"parsed": 6, "reused": 0}
+    writeFixture(fixtures, "acme/fixture-3.json", "Fixture three")
+    assert oflbulker.build(str(fixtures), output, jobs=2) == {"parsed": 1, "reused": 5}
+    built = library(output)
+    # Source order is kept, whichever worker finishes first
+    assert list(built) == [f"acme#fixture-{number}" for number in range(6)] + ["_manufacturers"]
+    assert built["acme#fixture-3"]["name"] == "Fixture three"
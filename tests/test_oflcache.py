@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from pydmx.openfixturelibrary import oflcache, oflindex
+from pydmx.openfixturelibrary.oflcache import FixtureCache, cachePath
+
+META = {"authors": ["Tester"], "createDate": "2020-01-01", "lastModifyDate": "2020-01-01"}
+
+
+def fixture(name: str) -> dict:
+    return {
+        "name": name,
+        "categories": ["Dimmer"],
+        "meta": META,
+        "availableChannels": {"Dimmer": {}},
+        "modes": [{"name": "1ch", "channels": ["Dimmer"]}],
+    }
+
+
+def bulk(path: str, names):
+    with open(path, "wb") as outfile:
+        oflindex.writeBulk(((f"test#{name.lower()}", fixture(name)) for name in names), outfile)
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Paths of the libraries the cache was built from"""
+    built = []
+    buildCache = oflcache.buildCache
+
+    def build(oflPath, schemaVersion, path=None):
+        built.append(oflPath)
+        return buildCache(oflPath, schemaVersion, path)
+
+    monkeypatch.setattr(oflcache, "buildCache", build)
+    return built
+
+
+def test_cache_is_reused(tmp_path, builds):
+    path = str(tmp_path / "ofl.json")
+    bulk(path, ["One", "Two"])
+    assert sorted(FixtureCache(path, "12.2.1")) == ["test#one", "test#two"]
+    assert os.path.isfile(cachePath(path, "12.2.1"))
+    cache = FixtureCache(path, "12.2.1")
+    assert cache["test#two"].name == "Two"
+    assert len(builds) == 1
+    # Another schema version has its own cache
+    FixtureCache(path, "12.3.0")
+    assert len(builds) == 2
+
+
+def test_changed_source_is_rebuilt(tmp_path, builds):
+    path = str(tmp_path / "ofl.json")
+    bulk(path, ["One"])
+    FixtureCache(path, "12.2.1")
+    stat = os.stat(path)
+
+    # Touched, but unchanged
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    FixtureCache(path, "12.2.1")
+    assert len(builds) == 1
+
+    # Same size and other content
+    bulk(path, ["Uno"])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert list(FixtureCache(path, "12.2.1")) == ["test#uno"]
+    assert len(builds) == 2
+
+    # Other size, the mtime the cache was built with
+    bulk(path, ["One", "Two"])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert len(FixtureCache(path, "12.2.1")) == 2
+    assert len(builds) == 3
+
+
+def test_cache_version_change_is_rebuilt(tmp_path, builds, monkeypatch):
+    path = str(tmp_path / "ofl.json")
+    bulk(path, ["One"])
+    FixtureCache(path, "12.2.1")
+    monkeypatch.setattr(oflcache, "CACHE_VERSION", oflcache.CACHE_VERSION + 1)
+    FixtureCache(path, "12.2.1")
+    FixtureCache(path, "12.2.1")
+    assert len(builds) == 2
+
+
+# Empty, foreign, a broken header and one cut off in its length
+@pytest.mark.parametrize("content", [b"", b"garbage", oflcache.MAGIC + b"\x00\x00\x00\x10broken", oflcache.MAGIC + b"\xff"])
+def test_corrupt_cache_is_rebuilt(tmp_path, builds, content):
+    path = str(tmp_path / "ofl.json")
+    bulk(path, ["One"])
+    with open(cachePath(path, "12.2.1"), "wb") as cachefile:
+        cachefile.write(content)
+    assert FixtureCache(path, "12.2.1")["test#one"].name == "One"
+    assert len(builds) == 1
+    FixtureCache(path, "12.2.1")
+    assert len(builds) == 1
+
+
+def test_invalid_fixtures_are_reported(tmp_path):
+    path = str(tmp_path / "ofl.json")
+    with open(path, "wb") as outfile:
+        oflindex.writeBulk([("test#one", fixture("One")), ("test#broken", {"name": "Broken"})], outfile)
+    cache = FixtureCache(path, "12.2.1")
+    assert "test#broken" not in cache
+    with pytest.raises(ValueError, match="test#broken"):
+        cache["test#broken"]
+    with pytest.raises(KeyError):
+        cache["test#missing"]
@@ -0,0 +1,96 @@
+import pytest
+
+from pydmx.openfixturelibrary.capabilitySchema import Maintenance, NoFunction, ShutterEffect, ShutterStrobe
+from pydmx.openfixturelibrary.channelSchema import ChannelSchema, DmxResolution, Precedence
+from pydmx.openfixturelibrary.definitionsSchema import MinMax
+from pydmx.openfixturelibrary.fixtureSchema import FixtureCategories, FixtureSchema, MetaSchema
+from pydmx.openfixturelibrary.ofldeserializer import converter, fromDict
+
+FIXTURE = {
+    "$schema": "https://example.org/schemas/fixture.json",
+    "name": "Strobe",
+    "categories": ["Strobe", "Dimmer"],
+    "meta": {"authors": ["Tester"], "createDate": "2020-01-01", "lastModifyDate": "2020-01-02"},
+    "availableChannels": {
+        "Shutter": {
+            "defaultValue": "50%",
+            "fineChannelAliases": ["Shutter fine"],
+            "dmxValueResolution": "16bit",
+            "precedence": "HTP",
+            "capabilities": [
+                {"type": "NoFunction", "dmxRange": [0, 9]},
+                {"type": "ShutterStrobe", "dmxRange": [10, 255], "shutterEffect": "Strobe", "speedStart": "slow", "speedEnd": "fast"},
+            ],
+        },
+        "Reset": {"defaultValue": 0, "capability": {"type": "Maintenance", "parameter": 1, "hold": "3s"}},
+    },
+    "modes": [{"name": "2ch", "channels": ["Shutter", "Reset"]}],
+}
+
+
+def test_nested_conversion():
+    fixture = fromDict(FIXTURE)
+    assert isinstance(fixture, FixtureSchema)
+    assert fixture.categories == [FixtureCategories("Strobe"), FixtureCategories("Dimmer")]
+    assert isinstance(fixture.meta, MetaSchema)
+    shutter = fixture.availableChannels["Shutter"]
+    assert isinstance(shutter, ChannelSchema)
+    assert shutter.dmxValueResolution is DmxResolution.SIXTEENBIT
+    assert shutter.precedence is Precedence.HTP
+    # Capabilities are dispatched on their type
+    noFunction, strobe = shutter.capabilities
+    assert type(noFunction) is NoFunction
+    assert type(strobe) is ShutterStrobe
+    assert strobe.shutterEffect is ShutterEffect.STROBE
+    assert strobe.dmxRange == MinMax(10, 255)
+    assert (strobe.speedStart, strobe.speedEnd) == ("slow", "fast")
+    assert type(fixture.availableChannels["Reset"].capability) is Maintenance
+
+
+def test_union_dispatch_on_value_type():
+    convert = converter(ChannelSchema)
+    assert convert({"defaultValue": 128}).defaultValue == 128
+    assert convert({"defaultValue": "50%"}).defaultValue == "50%"
+    assert convert({"defaultValue": None}).defaultValue is None
+    # Union[str, float] takes ints as numbers
+    assert converter(Maintenance)({"type": "Maintenance", "parameterStart": "slow", "parameterEnd": 2}).parameterEnd == 2
+    with pytest.raises(ValueError, match="defaultValue: expected int or str, got list"):
+        convert({"defaultValue": [1]})
+
+
+def test_kw_only_defaults():
+    capability = converter(Maintenance)({"type": "Maintenance"})
+    assert capability.dmxRange is None
+    assert capability.comment is None
+    assert capability.parameter is None
+    assert capability.hold is None
+    channel = converter(ChannelSchema)({})
+    assert channel.capabilities is None
+    assert channel.precedence is None
+
+
+def test_unknown_keys_are_ignored():
+    channel = converter(ChannelSchema)({"defaultValue": 1, "pydmxOffset": 12})
+    assert channel.defaultValue == 1
+    assert fromDict(dict(FIXTURE, fixtureKey="test#strobe")).name == "Strobe"
+
+
+def test_errors():
+    convert = converter(ChannelSchema)
+    with pytest.raises(ValueError, match="precedence: 'FTP' is not a valid Precedence"):
+        convert({"precedence": "FTP"})
+    with pytest.raises(ValueError, match="unknown capability type 'Laser'"):
+        convert({"capability": {"type": "Laser"}})
+    with pytest.raises(ValueError, match="unknown capability type None"):
+        convert({"capability": {"dmxRange": [0, 255]}})
+    with pytest.raises(ValueError, match="ShutterStrobe: .*shutterEffect"):
+        convert({"capability": {"type": "ShutterStrobe"}})
+    with pytest.raises(ValueError, match="fineChannelAliases: expected a list, got str"):
+        convert({"fineChannelAliases": "Pan fine"})
+    # Missing required fields of the fixture
+    fixture = dict(FIXTURE)
+    del fixture["modes"]
+    with pytest.raises(ValueError, match="FixtureSchema: .*modes"):
+        fromDict(fixture)
+    with pytest.raises(TypeError, match="expected a dict for FixtureSchema, got list"):
+        fromDict([])
@@ -0,0 +1,33 @@
+import os
+
+from pydmx.openfixturelibrary import oflindex
+
+
+def bulk(path, items):
+    with open(path, "wb") as outfile:
+        return oflindex.writeBulk(items, outfile)
+
+
+def test_index_of_same_size_but_changed_library_is_rebuilt(tmp_path):
+    path = str(tmp_path / "ofl.json")
+    oflindex.writeIndex(path, bulk(path, [("a#one", {"name": "One"}), ("b#two", {"name": "Two"})]))
+    assert set(oflindex.loadIndex(path)) == {"a#one", "b#two"}
+
+    # Same size, other keys, mtime moved on
+    bulk(path, [("c#one", {"name": "One"}), ("d#two", {"name": "Two"})])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert set(oflindex.loadIndex(path)) == {"c#one", "d#two"}
+
+
+def test_touched_library_keeps_its_index(tmp_path, monkeypatch):
+    path = str(tmp_path / "ofl.json")
+    oflindex.writeIndex(path, bulk(path, [("a#one", {"name": "One"})]))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def scan(oflPath):
+        raise AssertionError("the index should have been used")
+
+    monkeypatch.setattr(oflindex, "scanBulk", scan)
+    assert list(oflindex.loadIndex(path)) == ["a#one"]
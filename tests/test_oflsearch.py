@@ -0,0 +1,80 @@
+import json
+import os
+
+from pydmx.openfixturelibrary import oflsearch
+from pydmx.openfixturelibrary.oflsearch import FixtureSearch, buildSearchIndex, editDistance, loadSearchIndex, searchPath
+
+LIBRARY = {
+    "5star-systems#spica-250m": {
+        "name": "Spica 250M",
+        "categories": ["Moving Head", "Color Changer"],
+        "modes": [{"channels": ["a"] * 16}, {"channels": ["a"] * 22}],
+    },
+    "robe#robin-600e-spot": {"name": "Robin 600E Spot", "categories": ["Moving Head"], "modes": [{"channels": ["a"] * 29}]},
+    "robe#spot-160-xt": {"name": "Spot 160 XT", "categories": ["Moving Head"], "modes": [{"channels": ["a"] * 16}]},
+    "eurolite#led-par-56": {"name": "LED PAR-56", "shortName": "Par56", "categories": ["Color Changer"], "modes": [{"channels": ["a"] * 5}]},
+    "martin#mac-aura": {"name": "MAC Aura", "categories": ["Moving Head"], "modes": [{"channels": ["a"] * 14}]},
+}
+
+
+def search():
+    return FixtureSearch(buildSearchIndex(LIBRARY.items()))
+
+
+def test_prefix():
+    fixtures = search()
+    assert fixtures.search("spot") == ["robe#spot-160-xt", "robe#robin-600e-spot"]
+    assert fixtures.search("ro sp") == ["robe#robin-600e-spot", "robe#spot-160-xt"]
+    # shortName and the fixture key are searched as well
+    assert fixtures.search("par56") == ["eurolite#led-par-56"]
+    assert fixtures.search("5star") == ["5star-systems#spica-250m"]
+    assert fixtures.search("spot", limit=1) == ["robe#spot-160-xt"]
+    assert len(fixtures.search("")) == len(LIBRARY)
+
+
+def test_filters():
+    fixtures = search()
+    assert fixtures.search(category="Color Changer") == ["eurolite#led-par-56", "5star-systems#spica-250m"]
+    assert fixtures.search(channels=16) == ["5star-systems#spica-250m", "robe#spot-160-xt"]
+    assert fixtures.search("robe", category="Moving Head", channels=29) == ["robe#robin-600e-spot"]
+    assert fixtures.search("robe", category="Dimmer") == []
+    assert fixtures.search("martin", channels=16) == []
+
+
+def test_fuzzy():
+    fixtures = search()
+    assert editDistance("spcia", "spica") == 1
+    assert editDistance("spcia", "spot", limit=1) == 2
+    assert fixtures.search("spcia") == ["5star-systems#spica-250m"]
+    assert fixtures.search("5star spcia") == ["5star-systems#spica-250m"]
+    # A typo in the word being typed
+    assert fixtures.search("mac aua") == ["martin#mac-aura"]
+    assert fixtures.search("spcia", fuzzy=False) == []
+    assert fixtures.search("spcia", category="Dimmer") == []
+    assert fixtures.search("robn 600") == ["robe#robin-600e-spot"]
+    # Short words don't tolerate typos, the shared trigrams still find them
+    assert fixtures.search("rbe")[:2] == ["robe#robin-600e-spot", "robe#spot-160-xt"]
+
+
+def test_stale_index_is_rebuilt(tmp_path, monkeypatch):
+    path = str(tmp_path / "ofl.json")
+    with open(path, "w", encoding="utf-8") as outfile:
+        json.dump({"a#one": {"name": "One"}}, outfile)
+    assert [record[0] for record in loadSearchIndex(path)["fixtures"]] == ["a#one"]
+    assert os.path.isfile(searchPath(path))
+
+    # Same size, other content, mtime moved on
+    with open(path, "w", encoding="utf-8") as outfile:
+        json.dump({"b#two": {"name": "Two"}}, outfile)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert [record[0] for record in loadSearchIndex(path)["fixtures"]] == ["b#two"]
+
+    # A touched but unchanged library keeps its index
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+
+    def build(fixtures):
+        raise AssertionError("the index should have been used")
+
+    monkeypatch.setattr(oflsearch, "buildSearchIndex", build)
+    assert [record[0] for record in loadSearchIndex(path)["fixtures"]] == ["b#two"]
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from pydmx.fixture.matrix import Matrix, expandMode
+from pydmx.fixture.pixelmap import PixelMapper
+from pydmx.fixture.slotmap import SlotMap, findMode
+from pydmx.frame import DMXFrame
+from pydmx.openfixturelibrary.ofldeserializer import fromDict
+
+
+def color(name: str) -> dict:
+    return {"capability": {"type": "ColorIntensity", "color": name}}
+
+
+def insert(repeatFor, channelOrder: str, templateChannels: list) -> dict:
+    return {"insert": "matrixChannels", "repeatFor": repeatFor, "channelOrder": channelOrder, "templateChannels": templateChannels}
+
+
+RGB = ["Red $pixelKey", "Green $pixelKey", "Blue $pixelKey"]
+
+# A bar of four RGB pixels, the left and right half are groups with a dimmer each
+BAR = fromDict(
+    {
+        "name": "Pixel Bar",
+        "categories": ["Pixel Bar"],
+        "meta": {"authors": ["Tester"], "createDate": "2020-01-01", "lastModifyDate": "2020-01-01"},
+        "matrix": {"pixelCount": [4, 1, 1], "pixelGroups": {"Left": {"x": ["<=2"]}, "Right": ["3", "4"]}},
+        "availableChannels": {"Master Dimmer": {"capability": {"type": "Intensity"}}},
+        "templateChannels": {
+            "Red $pixelKey": dict(color("Red"), fineChannelAliases=["Red fine $pixelKey"]),
+            "Green $pixelKey": color("Green"),
+            "Blue $pixelKey": color("Blue"),
+            "Dimmer $pixelKey": {"capability": {"type": "Intensity"}},
+        },
+        "modes": [
+            {"name": "perPixel", "channels": ["Master Dimmer", insert("eachPixelABC", "perPixel", RGB)]},
+            {"name": "perChannel", "channels": [insert("eachPixelABC", "perChannel", RGB)]},
+            {"name": "16bit", "channels": [insert("eachPixelXYZ", "perPixel", ["Red $pixelKey", "Red fine $pixelKey", None])]},
+            {"name": "groups", "channels": [insert("eachPixelGroup", "perPixel", ["Dimmer $pixelKey"]), "Red 1"]},
+        ],
+    }
+)
+
+
+def expand(mode: str):
+    return expandMode(BAR, findMode(BAR, mode), Matrix(BAR.matrix))
+
+
+def test_expand_per_pixel():
+    channels, flat, pixelChannels = expand("perPixel")
+    assert flat == ["Master Dimmer"] + [f"{component} {pixel}" for pixel in "1234" for component in ("Red", "Green", "Blue")]
+    assert pixelChannels["Green 3"] == ("3", "Green")
+    assert "Master Dimmer" not in pixelChannels
+    # The definitions are copied from the template with the key filled in
+    assert channels["Red 2"].fineChannelAliases == ["Red fine 2"]
+    assert channels["Blue 4"].capability.color.value == "Blue"
+
+
+def test_expand_per_channel():
+    _, flat, _ = expand("perChannel")
+    assert flat == [f"{component} {pixel}" for component in ("Red", "Green", "Blue") for pixel in "1234"]
+
+
+def test_expand_template_fine_channels():
+    channels, flat, pixelChannels = expand("16bit")
+    assert flat[:3] == ["Red 1", "Red fine 1", None]
+    assert len(flat) == 12
+    # Fine channels belong to their coarse channel
+    assert "Red fine 1" not in channels
+    assert "Red 1" in pixelChannels
+    slotmap = SlotMap(BAR, "16bit", 1, DMXFrame())
+    assert slotmap.slots("Red 2") == [3, 4]
+
+
+def test_expand_groups_and_references():
+    channels, flat, pixelChannels = expand("groups")
+    assert flat == ["Dimmer Left", "Dimmer Right", "Red 1"]
+    assert pixelChannels["Dimmer Right"] == ("Right", "Dimmer")
+    assert channels["Red 1"].fineChannelAliases == ["Red fine 1"]
+    assert Matrix(BAR.matrix).groups["Left"] == ["1", "2"]
+
+
+def test_expand_without_templates():
+    mode = findMode(BAR, "perPixel")
+    plain = fromDict(
+        {
+            "name": "Dimmer",
+            "categories": ["Dimmer"],
+            "meta": {"authors": ["Tester"], "createDate": "2020-01-01", "lastModifyDate": "2020-01-01"},
+            "availableChannels": {"Dimmer": {}},
+            "modes": [{"name": "1ch", "channels": ["Dimmer"]}],
+        }
+    )
+    assert expandMode(plain, plain.modes[0])[1] == ["Dimmer"]
+    with pytest.raises(ValueError, match="no template channels"):
+        expandMode(plain, mode)
+
+
+def test_render():
+    frame = DMXFrame()
+    first, second = SlotMap(BAR, "perPixel", 1, frame), SlotMap(BAR, "perChannel", 101, frame)
+    mapper = PixelMapper(4, 2)
+    assert mapper.addFixture(first) == 4
+    # The second bar upside down in the lower row
+    assert mapper.addFixture(second, 0, 1, positions={key: (3 - int(key) + 1, 0) for key in "1234"}) == 4
+    image = np.arange(4 * 2 * 3, dtype=np.uint8).reshape(2, 4, 3)
+    mapper.render(image)
+    assert frame.back[0] == 0
+    assert bytes(frame.back[1:13]) == image[0].tobytes()
+    lower = image[1, ::-1]
+    assert bytes(frame.back[100:112]) == lower.T.tobytes()
+
+    # Float images and images with more channels than components
+    mapper.render(np.ones((2, 4, 4)))
+    assert bytes(frame.back[1:13]) == bytes([255] * 12)
+    with pytest.raises(ValueError):
+        mapper.render(np.zeros((1, 4, 3), dtype=np.uint8))
+
+
+def test_render_16bit_components():
+    frame = DMXFrame()
+    mapper = PixelMapper(4, 1, components=("Red",))
+    mapper.addFixture(SlotMap(BAR, "16bit", 1, frame))
+    mapper.render(np.array([[0x12, 0xAB, 0, 0xFF]], dtype=np.uint8))
+    assert bytes(frame.back[:12]) == bytes((0x12, 0x12, 0, 0xAB, 0xAB, 0, 0, 0, 0, 0xFF, 0xFF, 0))
@@ -0,0 +1,168 @@
+import uuid
+
+import pytest
+
+from pydmx.controller.artnet import ArtNetController
+from pydmx.controller.e131 import OPTION_STREAM_TERMINATED, E131Controller
+from pydmx.pcap import readCapture, writeCapture
+from pydmx.receiver import ARTNET, E131, SOURCE_TIMEOUT, DMXReceiver
+
+CONSOLE = ("10.0.0.1", 5568)
+BACKUP = ("10.0.0.2", 5568)
+NODE = ("10.0.0.100", 5568)
+
+
+class Sender:
+    """Builds the packets of one source"""
+
+    def __init__(self, controller, address):
+        self.controller = controller
+        self.address = address
+
+    def packet(self, values: bytes, sequence=None) -> bytes:
+        frame = self.controller.frame
+        frame[: len(values)] = values
+        frame.commit()
+        if sequence is not None:
+            self.controller._sequence = sequence - 1
+        return bytes(self.controller.encode())
+
+
+def sacn(address, universe: int = 1, priority: int = 100) -> Sender:
+    return Sender(E131Controller(universe, host="127.0.0.1", cid=uuid.uuid4(), priority=priority), address)
+
+
+def artnet(address, universe: int = 0) -> Sender:
+    return Sender(ArtNetController("127.0.0.1", universe), address)
+
+
+@pytest.fixture
+def replay(tmp_path):
+    """Writes the packets into a capture and replays it into a receiver"""
+
+    def run(receiver: DMXReceiver, packets) -> int:
+        path = str(tmp_path / "capture.pcap")
+        writeCapture(path, [(timestamp, source, NODE, payload) for timestamp, source, payload in packets])
+        return receiver.replay(readCapture(path))
+
+    return run
+
+
+def test_capture_round_trip(replay):
+    receiver = DMXReceiver()
+    universe = receiver.addUniverse(E131, 1)
+    console = sacn(CONSOLE)
+    assert replay(receiver, [(1.0, CONSOLE, console.packet(b"\x01\x02\x03"))]) == 1
+    assert bytes(universe.values[:4]) == b"\x01\x02\x03\x00"
+    source = next(iter(universe.sources.values()))
+    assert source.address == CONSOLE
+    assert source.name == "pydmx"
+
+
+def test_out_of_sequence_packets_are_dropped(replay):
+    receiver = DMXReceiver()
+    universe = receiver.addUniverse(E131, 1)
+    console = sacn(CONSOLE)
+    replay(
+        receiver,
+        [
+            (1.00, CONSOLE, console.packet(b"\x0a", sequence=100)),
+            # Duplicate and late packets
+            (1.01, CONSOLE, console.packet(b"\x0b", sequence=100)),
+            (1.02, CONSOLE, console.packet(b"\x0c", sequence=90)),
+            (1.03, CONSOLE, console.packet(b"\x0d", sequence=101)),
+            # More than 20 behind counts as a restarted source
+            (1.04, CONSOLE, console.packet(b"\x0e", sequence=50)),
+            # Wrapping around
+            (1.05, CONSOLE, console.packet(b"\x0f", sequence=255)),
+            (1.06, CONSOLE, console.packet(b"\x10", sequence=0)),
+        ],
+    )
+    assert universe.outOfSequence == 2
+    assert universe.packets == 5
+    assert universe.values[0] == 0x10
+    assert receiver.stats["outOfSequence"] == 2
+
+
+def test_source_timeout_keeps_last_look(replay):
+    receiver = DMXReceiver()
+    universe = receiver.addUniverse(E131, 1)
+    console, backup = sacn(CONSOLE), sacn(BACKUP)
+    replay(
+        receiver,
+        [(1.0, CONSOLE, console.packet(b"\x40")), (1.0, BACKUP, backup.packet(b"\x20"))]
+        + [(1.0 + step * 0.5, BACKUP, backup.packet(b"\x20")) for step in range(1, 8)],
+    )
+    assert len(universe.sources) == 1
+    assert universe.timeouts == 1
+    assert universe.values[0] == 0x20
+    receiver.expire(4.5 + SOURCE_TIMEOUT + 0.1)
+    assert not universe.active
+    assert universe.values[0] == 0x20
+
+
+def test_htp_merge_of_equal_priority(replay):
+    receiver = DMXReceiver()
+    universe = receiver.addUniverse(E131, 1)
+    console, backup = sacn(CONSOLE), sacn(BACKUP)
+    replay(
+        receiver,
+        [
+            (1.00, CONSOLE, console.packet(b"\x10\xf0\x00")),
+            (1.01, BACKUP, backup.packet(b"\x80\x08\x00")),
+        ],
+    )
+    assert bytes(universe.values[:3]) == b"\x80\xf0\x00"
+
+
+def test_artnet_sources_merge_htp(replay):
+    receiver = DMXReceiver()
+    universe = receiver.addUniverse(ARTNET, 3)
+    first, second = artnet(CONSOLE, 3), artnet(BACKUP, 3)
+    replay(receiver, [(1.0, CONSOLE, first.packet(b"\x05\x50")), (1.0, BACKUP, second.packet(b"\x50\x05"))])
+    assert bytes(universe.values[:2]) == b"\x50\x50"
+
+
+def test_priority_overrides(replay):
+    receiver = DMXReceiver()
+    universe = receiver.addUniverse(E131, 1)
+    console, backup = sacn(CONSOLE, priority=150), sacn(BACKUP)
+    replay(
+        receiver,
+        [
+            (1.00, BACKUP, backup.packet(b"\xff")),
+            (1.01, CONSOLE, console.packet(b"\x10")),
+            (1.02, BACKUP, backup.packet(b"\xff")),
+        ],
+    )
+    assert universe.values[0] == 0x10
+
+
+def test_winner_lowering_its_priority_is_remerged(replay):
+    receiver = DMXReceiver()
+    universe = receiver.addUniverse(E131, 1)
+    console, backup = sacn(CONSOLE, priority=150), sacn(BACKUP)
+    packets = [(1.00, BACKUP, backup.packet(b"\x20")), (1.01, CONSOLE, console.packet(b"\x10"))]
+    console.controller.priority = 50
+    packets.append((1.02, CONSOLE, console.packet(b"\x10")))
+    replay(receiver, packets)
+    assert universe.values[0] == 0x20
+
+
+def test_stream_termination_removes_source(replay):
+    receiver = DMXReceiver()
+    universe = receiver.addUniverse(E131, 1)
+    console, backup = sacn(CONSOLE, priority=150), sacn(BACKUP)
+    packets = [(1.00, BACKUP, backup.packet(b"\x20")), (1.01, CONSOLE, console.packet(b"\x10"))]
+    console.controller._packet[112] |= OPTION_STREAM_TERMINATED
+    packets.append((1.02, CONSOLE, console.packet(b"\x10")))
+    replay(receiver, packets)
+    assert len(universe.sources) == 1
+    assert universe.values[0] == 0x20
+
+
+def test_other_universes_are_ignored(replay):
+    receiver = DMXReceiver()
+    receiver.addUniverse(E131, 1)
+    assert replay(receiver, [(1.0, CONSOLE, sacn(CONSOLE, universe=2).packet(b"\x01"))]) == 0
+    assert receiver.ignoredPackets == 1
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from pydmx.controller.asynccontroller import AsyncFrameClock
+from pydmx.controller.scheduler import FrameScheduler
+
+
+class Failing:
+    """Callback raising on its first calls"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OSError("device unplugged")
+
+
+def test_callback_exception_keeps_clock_running(capsys):
+    callback = Failing(3)
+    scheduler = FrameScheduler(callback, framerate=200, name="test")
+    scheduler.start()
+    scheduler.resume()
+    time.sleep(0.1)
+    scheduler.stop()
+    assert scheduler.thread is not None and not scheduler.thread.is_alive()
+    assert callback.calls > 3
+    assert scheduler.errors == 3
+    assert scheduler.stats()["errors"] == 3
+    assert isinstance(scheduler.lastError, OSError)
+    # Repeats of the same exception are printed once
+    assert capsys.readouterr().out.count("device unplugged") == 1
+
+
+def test_async_clock_survives_callback_exception():
+    callback = Failing(2)
+
+    async def main():
+        clock = AsyncFrameClock(callback, framerate=200)
+        clock.start()
+        clock.resume()
+        await asyncio.sleep(0.1)
+        clock.stop()
+        await clock.wait()
+        return clock
+
+    clock = asyncio.run(main())
+    assert callback.calls > 2
+    assert clock.errors == 2
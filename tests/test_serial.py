@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from pydmx.controller import serial as serialModule
+from pydmx.controller.controller import OS
+from pydmx.controller.serial import SerialController
+
+
+@pytest.fixture
+def pty():
+    master, slave = os.openpty()
+    controller = SerialController(os.ttyname(slave), breakTime=0, markTime=0)
+    controller.enableMetrics()
+    yield master, controller
+    controller.close()
+    os.close(master)
+    os.close(slave)
+
+
+@pytest.mark.skipif(serialModule.operatingsystem != OS.LINUX, reason="writes to the descriptor on Linux only")
+def test_full_frame_is_written(pty):
+    master, controller = pty
+    controller.frame[:2] = b"\x11\x22"
+    controller.frame.commit()
+    controller.write()
+    assert controller.framesWritten == 1
+    assert os.read(master, 1024)[:3] == b"\x00\x11\x22"
+    assert controller.metrics.universes[controller.metricsLabel].bytes == 513
+
+
+@pytest.mark.skipif(serialModule.operatingsystem != OS.LINUX, reason="writes to the descriptor on Linux only")
+def test_short_write_counts_as_skipped(pty, monkeypatch):
+    master, controller = pty
+    monkeypatch.setattr(serialModule.os, "write", lambda fd, data: 100)
+    controller.write()
+    assert controller.framesWritten == 0
+    assert controller.skippedFrames == 1
+    counters = controller.metrics.universes[controller.metricsLabel]
+    assert counters.dropped == 1 and counters.frames == 0
+    assert controller._lineFree > 0
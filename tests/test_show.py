@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from pydmx.frame import DMXFrame
+from pydmx.show import ShowPlayer, ShowRecorder
+
+SLOTS = 16
+
+
+def frameAt(step: int) -> bytes:
+    """Output of the recorded universe at a step, changing a few slots per step"""
+    values = bytearray(SLOTS)
+    values[step % SLOTS] = 255
+    values[0] = step
+    values[-1] = 100 if step >= 6 else 0
+    return bytes(values)
+
+
+def record(path: str, steps: int = 13, close: bool = True) -> ShowRecorder:
+    """Recording frameAt every 0.25 s, keyframes once a second"""
+    frame = DMXFrame(SLOTS)
+    recorder = ShowRecorder(path, keyframeInterval=1.0, slots=SLOTS)
+    recorder.addUniverse(1, frame)
+    for step in range(steps):
+        frame.back[:] = frameAt(step)
+        frame.commit()
+        recorder.capture(now=step * 0.25)
+    if close:
+        recorder.close()
+    return recorder
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "show.pydmx")
+    recorder = record(path)
+    assert recorder.stats["keyframes"] == 4
+    assert recorder.stats["records"] == 13
+
+    played = DMXFrame(SLOTS)
+    player = ShowPlayer(path, {1: played})
+    assert player.universes == [1]
+    assert player.duration == 3.0
+    for step in range(13):
+        player.advance(step * 0.25)
+        assert bytes(played.back) == frameAt(step)
+    player.close()
+
+
+def test_seek_between_keyframes(tmp_path):
+    path = str(tmp_path / "show.pydmx")
+    record(path)
+    played = DMXFrame(SLOTS)
+    player = ShowPlayer(path, {1: played})
+    for seconds, step in ((1.6, 6), (0.1, 0), (2.99, 11), (1.0, 4), (5.0, 12), (-1.0, 0)):
+        player.seek(seconds)
+        assert bytes(played.back) == frameAt(step), seconds
+        assert player.time == min(max(seconds, 0.0), 3.0)
+    # Deltas after the sought time aren't applied yet
+    player.seek(1.6)
+    player.advance(1.7)
+    assert bytes(played.back) == frameAt(6)
+    player.advance(1.75)
+    assert bytes(played.back) == frameAt(7)
+    player.close()
+
+
+def test_unclosed_file_is_rescanned(tmp_path):
+    path = str(tmp_path / "show.pydmx")
+    # Keyframes are flushed, a recorder which is still open (or crashed) leaves a readable file
+    recorder = record(path, steps=9, close=False)
+    player = ShowPlayer(path, {1: DMXFrame(SLOTS)})
+    assert player.duration == 2.0
+    player.seek(2.0)
+    assert bytes(player.frames[1].back) == frameAt(8)
+    player.close()
+    recorder.close()
+
+    # A closed file cut off in the middle of its last record, its index lost
+    record(path)
+    size = os.path.getsize(path)
+    with open(path, "r+b") as showfile:
+        # Trailer, 4 keyframe entries and their count, 3 bytes of the last record
+        showfile.truncate(size - 24 - 4 * 18 - 8 - 3)
+    played = DMXFrame(SLOTS)
+    player = ShowPlayer(path, {1: played})
+    assert player.duration == 2.75
+    player.seek(3.0)
+    assert bytes(played.back) == frameAt(11)
+    player.seek(0.5)
+    assert bytes(played.back) == frameAt(2)
+    player.close()
+
+
+def test_not_a_show_file(tmp_path):
+    path = tmp_path / "show.pydmx"
+    path.write_bytes(b"PYDMXIDX" + bytes(32))
+    with pytest.raises(ValueError):
+        ShowPlayer(str(path))
@@ -0,0 +1,25 @@
+from types import SimpleNamespace
+
+from pydmx.fixture.slotmap import _defaultValue
+
+
+def channel(defaultValue, dmxValueResolution=None, fineChannelAliases=None):
+    return SimpleNamespace(defaultValue=defaultValue, dmxValueResolution=dmxValueResolution, fineChannelAliases=fineChannelAliases)
+
+
+def test_8bit_default_is_widened_by_shifting():
+    assert _defaultValue(channel(0x7F, "8bit", ["Pan fine"]), 2) == 0x7F00
+    assert _defaultValue(channel(0x7F, "8bit", ["Pan fine", "Pan finer"]), 3) == 0x7F0000
+    assert _defaultValue(channel(0xFF), 2) == 0xFF00
+
+
+def test_default_in_the_channel_resolution():
+    # Without dmxValueResolution the values are given in the highest resolution of the channel
+    assert _defaultValue(channel(0x7F80, None, ["Pan fine"]), 2) == 0x7F80
+    assert _defaultValue(channel(0x7F80, None, ["Pan fine"]), 1) == 0x7F
+
+
+def test_percentage_default():
+    assert _defaultValue(channel("50%"), 1) == 128
+    assert _defaultValue(channel("100%"), 2) == 0xFFFF
+    assert _defaultValue(None, 2) == 0
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from pydmx.controller.asynccontroller import AsyncDMXController
+from pydmx.controller.loopback import LoopbackController
+from pydmx.universe import Universe
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 5))
+
+
+def test_update_async_overlapping_blocks():
+    async def main():
+        async with AsyncDMXController(LoopbackController(simulateLine=False), framerate=200) as controller:
+            universe = Universe(controller)
+
+            async def write(slot: int, value: int):
+                async with universe.updateAsync() as frame:
+                    frame[slot] = value
+                    await asyncio.sleep(0.01)
+                    frame[slot + 1] = value
+
+            await asyncio.gather(write(0, 10), write(10, 20))
+            return controller.controller.lastFrame
+
+    frame = run(main())
+    assert frame[:2] == bytes([10, 10])
+    assert frame[10:12] == bytes([20, 20])
+
+
+def test_update_async_needs_async_controller():
+    async def main():
+        universe = Universe(LoopbackController())
+        try:
+            async with universe.updateAsync():
+                pass
+        finally:
+            universe.controller.close()
+
+    with pytest.raises(TypeError):
+        run(main())
+
+
+def test_deactivate_cancels_waiters():
+    async def main():
+        controller = AsyncDMXController(LoopbackController())
+        sent = controller.sent()
+        controller.deactivate()
+        await controller.close()
+        return sent
+
+    assert run(main()).cancelled()